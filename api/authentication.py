@@ -0,0 +1,91 @@
+"""
+Token authentication that caches each token's user.
+
+The id and the flags of a token's user, which are all that authentication
+and the API's permissions need, are cached in the default cache, which is
+shared by every process. The user's other fields, e.g. its password hash,
+are not cached, and are only read from the database if they are used. The
+entry of a token is removed when it is deleted, e.g. when its key is rotated
+or its user is deleted, and when its user is saved, e.g. when the user is
+deactivated, so that every process sees the change at once.
+"""
+from hashlib import sha256
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+# the fields of a token's user that are cached
+CACHED_USER_FIELDS = ['id', 'is_active', 'is_staff', 'is_superuser']
+
+
+def get_token_cache_key(key):
+    """Hashes the key, so that the cache does not hold valid keys."""
+    return 'api_token:' + sha256(key.encode('utf-8')).hexdigest()
+
+
+def get_cached_token(key):
+    """
+    Returns the cached token of key, with a user whose fields other than
+    CACHED_USER_FIELDS are loaded when they are used, or None.
+    """
+    user_values = cache.get(get_token_cache_key(key))
+    if user_values is None:
+        return None
+    user_model = get_user_model()
+    # from_db() takes the values in the order of the model's fields
+    field_names = [field.attname for field in user_model._meta.concrete_fields
+                   if field.attname in user_values]
+    user = user_model.from_db(
+        DEFAULT_DB_ALIAS, field_names,
+        [user_values[field_name] for field_name in field_names])
+    token = Token.from_db(DEFAULT_DB_ALIAS, ['key', 'user_id'], [key, user.pk])
+    token.user = user
+    return token
+
+
+def set_cached_token(token):
+    cache.set(get_token_cache_key(token.key), {
+        field: getattr(token.user, field) for field in CACHED_USER_FIELDS},
+        settings.API_TOKEN_CACHE_TIMEOUT)
+
+
+def delete_cached_tokens(*keys):
+    """
+    Removes the cached tokens of the given keys. They are removed again once
+    the current transaction commits, in case a concurrent request cached the
+    old row in the meantime.
+    """
+    cache_keys = [get_token_cache_key(key) for key in keys]
+    if not cache_keys:
+        return
+    cache.delete_many(cache_keys)
+    transaction.on_commit(lambda: cache.delete_many(cache_keys))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that only reads the token and its user from the
+    database when they are not cached.
+    """
+
+    def authenticate_credentials(self, key):
+        token = get_cached_token(key)
+        if token is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related('user').get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            set_cached_token(token)
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.'))
+
+        return (token.user, token)
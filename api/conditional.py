@@ -0,0 +1,44 @@
+from calendar import timegm
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def get_etag(data_hash, updated_at):
+    """
+    Returns a strong ETag for a jsonstore. data_hash changes with its data,
+    and updated_at changes whenever any of its other fields are saved.
+    """
+    updated_at_us = \
+        timegm(updated_at.utctimetuple()) * 10 ** 6 + updated_at.microsecond
+    return f'"{data_hash}-{updated_at_us:x}"'
+
+
+def get_last_modified(updated_at):
+    """Returns updated_at as a timestamp, in whole seconds."""
+    return timegm(updated_at.utctimetuple())
+
+
+def is_conditional_request(request):
+    return any(header in request.META for header in [
+        'HTTP_IF_MATCH', 'HTTP_IF_NONE_MATCH',
+        'HTTP_IF_MODIFIED_SINCE', 'HTTP_IF_UNMODIFIED_SINCE'])
+
+
+def get_not_modified_response(request, data_hash, updated_at):
+    """
+    Returns a 304 (or 412) response if the request's conditional headers
+    match the given jsonstore values. Otherwise, returns None.
+    """
+    response = get_conditional_response(
+        request,
+        etag=get_etag(data_hash, updated_at),
+        last_modified=get_last_modified(updated_at))
+    if response is not None:
+        set_validator_headers(response, data_hash, updated_at)
+    return response
+
+
+def set_validator_headers(response, data_hash, updated_at):
+    response['ETag'] = get_etag(data_hash, updated_at)
+    response['Last-Modified'] = http_date(get_last_modified(updated_at))
@@ -0,0 +1,57 @@
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from django_jsonsaver import constants as c
+from stores import pagination
+
+
+class JsonStoreKeysetPagination(BasePagination):
+    """
+    Paginates jsonstores by (updated_at, id), newest first. See
+    stores.pagination.
+    """
+    cursor_query_param = 'cursor'
+    page_size = c.JSONSTORE_LIST_PAGINATE_BY
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        try:
+            self.page = pagination.get_page(
+                queryset, request.query_params.get(self.cursor_query_param),
+                self.page_size)
+        except pagination.InvalidCursor:
+            raise NotFound(self.invalid_cursor_message)
+        return self.page.object_list
+
+    def get_next_link(self):
+        if not self.page.has_next():
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param,
+            self.page.next_cursor)
+
+    def get_first_link(self):
+        if not self.page.has_previous():
+            return None
+        return remove_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'first': self.get_first_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'first': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,35 @@
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils import json
+
+from django_jsonsaver import json_codec
+
+
+class OrjsonParser(JSONParser):
+    """A JSONParser that decodes UTF-8 request bodies with orjson."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return json_codec.loads(
+                stream.read(),
+                parse_constant=json.strict_constant if self.strict else None)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class JSONPatchParser(OrjsonParser):
+    """Parses JSON Patch (RFC 6902) documents."""
+    media_type = 'application/json-patch+json'
+
+
+class MergePatchParser(OrjsonParser):
+    """Parses JSON Merge Patch (RFC 7396) documents."""
+    media_type = 'application/merge-patch+json'
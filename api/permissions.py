@@ -10,4 +10,4 @@ class HasJsonStorePermissions(permissions.BasePermission):
                 "This permission can only be used with a JsonStore object.")
         if request.user.is_staff:
             return True
-        return request.user == obj.user
+        return obj.user_id == request.user.id
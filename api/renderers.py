@@ -0,0 +1,38 @@
+from rest_framework.renderers import JSONRenderer
+
+from django_jsonsaver import json_codec
+
+
+def encode_json_text(text):
+    """
+    Encodes JSON text as bytes. Line and paragraph separators are escaped
+    for the same reason as in JSONRenderer.render().
+    """
+    return text \
+        .replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
+
+
+def encode_json_text_chunks(text, chunk_size):
+    """
+    Encodes JSON text as an iterator of bytes chunks of up to chunk_size
+    characters each, so that only one chunk is encoded at a time.
+    """
+    for start in range(0, len(text), chunk_size):
+        yield encode_json_text(text[start:start + chunk_size])
+
+
+class OrjsonRenderer(JSONRenderer):
+    """A JSONRenderer that renders compact JSON with orjson."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        # orjson cannot escape non-ASCII characters or add whitespace
+        if data is None or self.ensure_ascii or not self.compact or \
+                self.get_indent(accepted_media_type, renderer_context):
+            return super().render(
+                data, accepted_media_type, renderer_context)
+
+        # escaped for the same reason as in JSONRenderer.render()
+        return json_codec.dumps(data, default=self.encoder_class().default) \
+            .replace('\u2028'.encode(), b'\\u2028') \
+            .replace('\u2029'.encode(), b'\\u2029')
@@ -0,0 +1,14 @@
+from rest_framework.response import Response
+
+
+class PrerenderedJSONResponse(Response):
+    """A Response whose JSON content has already been rendered to bytes."""
+
+    def __init__(self, content, **kwargs):
+        super().__init__(**kwargs)
+        self.prerendered_content = content
+
+    @property
+    def rendered_content(self):
+        self['Content-Type'] = self.content_type or 'application/json'
+        return self.prerendered_content
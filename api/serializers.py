@@ -1,8 +1,9 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.utils.text import slugify
 from rest_framework import serializers
 
-from django_jsonsaver import constants as c, helpers as h
-from stores import invalidators
+from django_jsonsaver import constants as c
+from stores import bulk, validation
 from stores.models import JsonStore
 
 
@@ -16,89 +17,94 @@ class JsonStoreSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         user = self.context['request'].user
-        jsonstore = JsonStore.objects.create(user=user, **validated_data)
+        jsonstore = JsonStore(user=user, **validated_data)
+        self.save_jsonstore(jsonstore)
         return jsonstore
 
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        self.save_jsonstore(instance)
+        return instance
+
+    def save_jsonstore(self, jsonstore):
+        try:
+            validation.save_jsonstore(jsonstore)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(
+                serializers.as_serializer_error(e))
+
     def validate_name(self, value):
         return slugify(value)
 
     def validate(self, data):
-        jsonstore_data = data.get('data', {})
-        name = slugify(data.get('name', ''))
-        is_public = data.get('is_public', False)
-
-        user = self.context['request'].user
         obj = self.instance
+        jsonstore_data = data.get('data', obj.data if obj else {})
+        name = slugify(data.get('name', obj.name if obj else '') or '')
+        is_public = data.get('is_public', obj.is_public if obj else False)
 
-        # name cannot be numbers only
-        if invalidators.jsonstore_name_cannot_be_numbers_only(name):
-            raise serializers.ValidationError(
-                {'name': c.FORM_ERROR_JSONSTORE_NAME_CANNOT_BE_NUMBERS_ONLY},
-                code='jsonstore_name_cannot_be_numbers_only')
-
-        # public jsonstore name cannot be blank
-        if invalidators.jsonstore_public_name_cannot_be_blank(name, is_public):
-            raise serializers.ValidationError(
-                {'name': c.FORM_ERROR_JSONSTORE_PUBLIC_NAME_BLANK},
-                code='jsonstore_public_name_cannot_be_blank')
-
-        # forbidden jsonstore name not allowed
-        if invalidators.jsonstore_forbidden_name_not_allowed(name):
-            raise serializers.ValidationError(
-                {'name':
-                    c.FORM_ERROR_JSONSTORE_FORBIDDEN_NAME_NOT_ALLOWED(name)},
-                code='jsonstore_forbidden_name_not_allowed')
-
-        # user jsonstore count over max
-        user_max_jsonstore_count = user.profile.get_max_jsonstore_count()
-        if invalidators.jsonstore_user_jsonstore_count_over_max(
-                user, user_max_jsonstore_count):
-            raise serializers.ValidationError(
-                c.FORM_ERROR_JSONSTORE_USER_JSONSTORE_COUNT_OVER_MAX(
-                    user, user_max_jsonstore_count),
-                code='jsonstore_user_jsonstore_count_over_max')
-
-        stores_with_same_name = JsonStore.objects.filter(name=name)
+        user = self.context['request'].user
 
-        # jsonstore_name_duplicate_same_user_create
-        if invalidators.jsonstore_name_duplicate_same_user_create(
-                name, user, obj, stores_with_same_name):
-            raise serializers.ValidationError(
-                {'name': c.FORM_ERROR_JSONSTORE_NAME_DUPLICATE},
-                code='jsonstore_name_duplicate_same_user_create')
+        errors = validation.get_jsonstore_validation_errors(
+            user, obj, name, is_public, jsonstore_data)
+        if errors:
+            field, error = errors[0]
+            # the total storage allowance error concerns all of the user's
+            # stores, so the API reports it as a non-field error
+            if field and error.code != \
+                    'jsonstore_all_jsonstores_data_size_over_max':
+                raise serializers.ValidationError(
+                    {field: error.message}, code=error.code)
+            raise serializers.ValidationError(error.message, code=error.code)
 
-        # jsonstore_name_duplicate_same_user_update
-        if invalidators.jsonstore_name_duplicate_same_user_update(
-                name, user, obj, stores_with_same_name):
-            raise serializers.ValidationError(
-                {'name': c.FORM_ERROR_JSONSTORE_NAME_DUPLICATE},
-                code='jsonstore_name_duplicate_same_user_update')
+        return data
 
-        # jsonstore_public_name_duplicate
-        if invalidators.jsonstore_public_name_duplicate(
-                name, is_public, user, stores_with_same_name):
-            raise serializers.ValidationError(
-                {'name': c.FORM_ERROR_JSONSTORE_PUBLIC_NAME_DUPLICATE},
-                code='jsonstore_public_name_duplicate')
 
-        jsonstore_data_size = h.get_obj_size(jsonstore_data)
+class JsonStoreListSerializer(serializers.ModelSerializer):
+    """Summarizes a jsonstore's data, so that lists do not need to load it."""
+    class Meta:
+        model = JsonStore
+        fields = ['id', 'user', 'name', 'is_public', 'data_size',
+                  'data_key_count', 'data_preview', 'updated_at']
+        read_only_fields = fields
+
+
+class JsonStoreFieldsSerializer(JsonStoreSerializer):
+    """A JsonStoreSerializer that only includes the given fields."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+
+class JsonStoreBulkOperationSerializer(serializers.Serializer):
+    """
+    An operation in a batch. Operations are only checked here one at a time;
+    see stores.bulk for the checks that concern the whole batch.
+    """
+    op = serializers.ChoiceField(choices=bulk.BULK_OPERATIONS)
+    id = serializers.IntegerField(required=False)
+    name = serializers.CharField(
+        max_length=c.JSONSTORE_NAME_MAX_LENGTH, required=False,
+        allow_blank=True, allow_null=True)
+    data = serializers.JSONField(required=False)
+    is_public = serializers.BooleanField(required=False)
 
-        # jsonstore data size over max
-        if invalidators.jsonstore_data_size_over_max(
-                jsonstore_data, user, jsonstore_data_size):
-            raise serializers.ValidationError(
-                {'data': c.FORM_ERROR_JSONSTORE_DATA_SIZE_OVER_MAX(
-                    user, jsonstore_data_size)},
-                code='jsonstore_data_size_over_max')
+    def validate_name(self, value):
+        return slugify(value or '')
 
-        # jsonstore size will exceed user's total storage allowance
-        if invalidators.jsonstore_all_jsonstores_data_size_over_max(
-                user, jsonstore_data_size):
+    def validate(self, data):
+        if data['op'] == bulk.CREATE:
+            if 'id' in data:
+                raise serializers.ValidationError(
+                    {'id': c.API_ERROR_JSONSTORE_BULK_CREATE_ID},
+                    code='invalid')
+        elif 'id' not in data:
             raise serializers.ValidationError(
-                c.FORM_ERROR_ALL_JSONSTORES_DATA_SIZE_OVER_MAX(
-                    user, jsonstore_data_size),
-                code='jsonstore_all_jsonstores_data_size_over_max')
-
+                {'id': serializers.Field.default_error_messages['required']},
+                code='required')
         return data
 
 
@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+
+from . import authentication
+from django_jsonsaver import constants as c, factories as f
+
+UserModel = get_user_model()
+
+
+class CachedTokenAuthenticationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+
+    def setUp(self):
+        cache.clear()
+        self.test_token = f.TokenFactory(
+            user=self.test_user, key=Token.generate_key())
+
+    # METHODS #
+    def authenticate(self, key=None):
+        request = APIRequestFactory().get(
+            '/', HTTP_AUTHORIZATION=f'Token {key or self.test_token.key}')
+        return authentication.CachedTokenAuthentication().authenticate(
+            request)
+
+    def assert_token_is_invalid(self, key=None):
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(key)
+
+    # TESTS #
+    def test_is_a_default_authentication_class(self):
+        self.assertIn(
+            'api.authentication.CachedTokenAuthentication',
+            settings.REST_FRAMEWORK['DEFAULT_AUTHENTICATION_CLASSES'])
+
+    def test_get_token_cache_key_does_not_contain_key(self):
+        cache_key = authentication.get_token_cache_key(self.test_token.key)
+        self.assertNotIn(self.test_token.key, cache_key)
+
+    def test_authenticate_returns_user_and_token(self):
+        user, token = self.authenticate()
+        self.assertEqual(user, self.test_user)
+        self.assertEqual(token, self.test_token)
+
+    def test_authenticate_caches_token(self):
+        with self.assertNumQueries(1):
+            self.authenticate()
+        with self.assertNumQueries(0):
+            user, token = self.authenticate()
+        self.assertEqual(user, self.test_user)
+
+    def test_authenticate_returns_a_new_user_every_time(self):
+        first_user, _ = self.authenticate()
+        second_user, _ = self.authenticate()
+        self.assertIsNot(first_user, second_user)
+
+    def test_invalid_token(self):
+        self.assert_token_is_invalid(Token.generate_key())
+
+    def test_inactive_user(self):
+        self.test_user.is_active = False
+        self.test_user.save()
+        self.assert_token_is_invalid()
+        self.test_user.is_active = True
+        self.test_user.save()
+
+    def test_user_deactivation_deletes_cached_token(self):
+        self.authenticate()
+        user = UserModel.objects.get(pk=self.test_user.pk)
+        user.is_active = False
+        user.save()
+        self.assert_token_is_invalid()
+
+    def test_user_delete_deletes_cached_token(self):
+        user = f.UserFactory()
+        token = f.TokenFactory(user=user, key=Token.generate_key())
+        self.authenticate(token.key)
+        user.delete()
+        self.assert_token_is_invalid(token.key)
+
+    def test_api_key_rotation_deletes_cached_token(self):
+        self.authenticate()
+        self.assertTrue(self.client.login(
+            username=self.test_user.username, password=c.TEST_USER_PASSWORD))
+        self.client.post(reverse('users:user_update_api_key'))
+        self.assert_token_is_invalid()
+        new_token = Token.objects.get(user=self.test_user)
+        self.assertEqual(self.authenticate(new_token.key)[0], self.test_user)
+
+    def test_login_keeps_cached_token(self):
+        self.authenticate()
+        self.assertTrue(self.client.login(
+            username=self.test_user.username, password=c.TEST_USER_PASSWORD))
+        with self.assertNumQueries(0):
+            self.authenticate()
+
+    def test_cache_holds_only_the_user_id_and_flags(self):
+        self.authenticate()
+        cached = cache.get(
+            authentication.get_token_cache_key(self.test_token.key))
+        self.assertEqual(
+            set(cached), set(authentication.CACHED_USER_FIELDS))
+        self.assertNotIn(self.test_user.password, str(cached))
+
+    def test_cached_user_loads_other_fields_when_used(self):
+        self.authenticate()
+        user, token = self.authenticate()
+        self.assertEqual(token.key, self.test_token.key)
+        self.assertEqual(user.pk, self.test_user.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.username, self.test_user.username)
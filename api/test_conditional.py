@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+
+from django.test import SimpleTestCase
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from . import conditional
+
+
+class ConditionalTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.factory = APIRequestFactory()
+        cls.test_data_hash = 'a' * 64
+        cls.test_updated_at = \
+            datetime(2021, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+    def get_etag(self, updated_at=None):
+        return conditional.get_etag(
+            self.test_data_hash, updated_at or self.test_updated_at)
+
+    def test_get_etag_is_strong(self):
+        etag = self.get_etag()
+        self.assertTrue(etag.startswith('"'))
+        self.assertTrue(etag.endswith('"'))
+        self.assertIn(self.test_data_hash, etag)
+
+    def test_get_etag_changes_with_updated_at_microseconds(self):
+        self.assertNotEqual(
+            self.get_etag(),
+            self.get_etag(self.test_updated_at.replace(microsecond=0)))
+
+    def test_get_last_modified(self):
+        self.assertEqual(
+            conditional.get_last_modified(self.test_updated_at),
+            int(self.test_updated_at.timestamp()))
+
+    def test_is_conditional_request(self):
+        self.assertFalse(
+            conditional.is_conditional_request(self.factory.get('/')))
+        self.assertTrue(conditional.is_conditional_request(
+            self.factory.get('/', HTTP_IF_NONE_MATCH='*')))
+        self.assertTrue(conditional.is_conditional_request(
+            self.factory.get('/', HTTP_IF_MODIFIED_SINCE='x')))
+
+    def test_get_not_modified_response_with_matching_etag(self):
+        request = self.factory.get('/', HTTP_IF_NONE_MATCH=self.get_etag())
+        response = conditional.get_not_modified_response(
+            request, self.test_data_hash, self.test_updated_at)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], self.get_etag())
+
+    def test_get_not_modified_response_with_stale_etag(self):
+        request = self.factory.get(
+            '/', HTTP_IF_NONE_MATCH=self.get_etag(
+                self.test_updated_at.replace(microsecond=0)))
+        self.assertIsNone(conditional.get_not_modified_response(
+            request, self.test_data_hash, self.test_updated_at))
+
+    def test_get_not_modified_response_with_if_modified_since(self):
+        request = self.factory.get(
+            '/', HTTP_IF_MODIFIED_SINCE='Mon, 01 Mar 2021 12:30:15 GMT')
+        response = conditional.get_not_modified_response(
+            request, self.test_data_hash, self.test_updated_at)
+        self.assertEqual(response.status_code, 304)
+
+        request = self.factory.get(
+            '/', HTTP_IF_MODIFIED_SINCE='Mon, 01 Mar 2021 12:30:14 GMT')
+        self.assertIsNone(conditional.get_not_modified_response(
+            request, self.test_data_hash, self.test_updated_at))
+
+    def test_set_validator_headers(self):
+        response = Response()
+        conditional.set_validator_headers(
+            response, self.test_data_hash, self.test_updated_at)
+        self.assertEqual(response['ETag'], self.get_etag())
+        self.assertEqual(
+            response['Last-Modified'], 'Mon, 01 Mar 2021 12:30:15 GMT')
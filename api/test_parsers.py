@@ -0,0 +1,41 @@
+from io import BytesIO
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from .parsers import OrjsonParser
+
+
+@override_settings(JSON_CODEC='orjson')
+class OrjsonParserTest(SimpleTestCase):
+    def setUp(self):
+        self.parser = OrjsonParser()
+
+    def parse(self, content, encoding='utf-8'):
+        return self.parser.parse(
+            BytesIO(content), parser_context={'encoding': encoding})
+
+    # ATTRIBUTES #
+    def test_parser_parent_class(self):
+        self.assertEqual(OrjsonParser.__bases__[-1].__name__, 'JSONParser')
+
+    # METHODS #
+    def test_method_parse_matches_json_parser(self):
+        content = '{"a": [1, 1.5, null, "é"], "b": {}}'.encode()
+        self.assertEqual(
+            self.parse(content),
+            JSONParser().parse(
+                BytesIO(content), parser_context={'encoding': 'utf-8'}))
+
+    def test_method_parse_other_encodings(self):
+        self.assertEqual(
+            self.parse('["é"]'.encode('latin-1'), 'latin-1'), ['é'])
+
+    def test_method_parse_invalid_json_raises_parse_error(self):
+        with self.assertRaises(ParseError):
+            self.parse(b'{"a": ')
+
+    def test_method_parse_constants_raises_parse_error(self):
+        with self.assertRaises(ParseError):
+            self.parse(b'[NaN]')
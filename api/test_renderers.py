@@ -0,0 +1,47 @@
+from datetime import datetime
+from django.test import SimpleTestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+
+from .renderers import OrjsonRenderer, encode_json_text_chunks
+from django_jsonsaver import constants as c
+
+
+@override_settings(JSON_CODEC='orjson')
+class OrjsonRendererTest(SimpleTestCase):
+    def setUp(self):
+        self.renderer = OrjsonRenderer()
+        self.test_data = {
+            'name': c.TEST_JSONSTORE_NAME,
+            'updated_at': datetime(2021, 3, 1, 12, 30, 15, 123456),
+            'data': {'text': 'h\u00e9llo \u2028', 'items': [1, 1.5, None]}}
+
+    # ATTRIBUTES #
+    def test_renderer_parent_class(self):
+        self.assertEqual(
+            OrjsonRenderer.__bases__[-1].__name__, 'JSONRenderer')
+
+    # METHODS #
+    def test_method_render_matches_json_renderer(self):
+        self.assertEqual(
+            self.renderer.render(self.test_data),
+            JSONRenderer().render(self.test_data))
+
+    def test_method_render_with_indent_matches_json_renderer(self):
+        self.assertEqual(
+            self.renderer.render(
+                self.test_data, 'application/json; indent=4'),
+            JSONRenderer().render(
+                self.test_data, 'application/json; indent=4'))
+
+    def test_method_render_none(self):
+        self.assertEqual(self.renderer.render(None), b'')
+
+
+class EncodeJsonTextChunksTest(SimpleTestCase):
+    def test_chunks_are_bounded_and_escaped(self):
+        chunks = list(encode_json_text_chunks('["\u2028é", "abc"]', 4))
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(b''.join(chunks), '["\\u2028é", "abc"]'.encode())
+
+    def test_empty_text_has_no_chunks(self):
+        self.assertEqual(list(encode_json_text_chunks('', 4)), [])
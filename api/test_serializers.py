@@ -1,5 +1,6 @@
 from django.urls import reverse
 from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework.exceptions import ValidationError
 from unittest.mock import Mock
 
 from . import serializers
@@ -144,12 +145,13 @@ class JsonStoreSerializerTest(APITestCase):
         serializer = \
             self.test_serializer(data=data, context={'request': request})
 
-        self.assertFalse(serializer.is_valid())
-        self.assertEqual(len(serializer.errors), 1)
-        self.assertTrue('name' in serializer.errors)
+        # duplicate names are found by the database when saving
+        self.assertTrue(serializer.is_valid())
+        with self.assertRaises(ValidationError) as cm:
+            serializer.save()
 
         self.assertEqual(
-            serializer.errors['name'][0].__str__(),
+            cm.exception.detail['name'][0].__str__(),
             c.FORM_ERROR_JSONSTORE_NAME_DUPLICATE)
 
     def test_validation_jsonstore_name_duplicate_same_user_update(self):
@@ -162,15 +164,17 @@ class JsonStoreSerializerTest(APITestCase):
         data = {'name': other_jsonstore.name}
         request = self.factory.patch(test_url, data)
         request.user = self.test_user
-        serializer = \
-            self.test_serializer(data=data, context={'request': request})
+        serializer = self.test_serializer(
+            self.test_jsonstore, data=data, partial=True,
+            context={'request': request})
 
-        self.assertFalse(serializer.is_valid())
-        self.assertEqual(len(serializer.errors), 1)
-        self.assertTrue('name' in serializer.errors)
+        # duplicate names are found by the database when saving
+        self.assertTrue(serializer.is_valid())
+        with self.assertRaises(ValidationError) as cm:
+            serializer.save()
 
         self.assertEqual(
-            serializer.errors['name'][0].__str__(),
+            cm.exception.detail['name'][0].__str__(),
             c.FORM_ERROR_JSONSTORE_NAME_DUPLICATE)
 
     def test_validation_jsonstore_public_name_duplicate(self):
@@ -187,11 +191,12 @@ class JsonStoreSerializerTest(APITestCase):
         serializer = \
             self.test_serializer(data=data, context={'request': request})
 
-        self.assertFalse(serializer.is_valid())
-        self.assertEqual(len(serializer.errors), 1)
+        self.assertTrue(serializer.is_valid())
+        with self.assertRaises(ValidationError) as cm:
+            serializer.save()
 
         self.assertEqual(
-            serializer.errors['name'][0].__str__(),
+            cm.exception.detail['name'][0].__str__(),
             c.FORM_ERROR_JSONSTORE_PUBLIC_NAME_DUPLICATE)
 
     def test_validation_jsonstore_data_size_over_max(self):
@@ -213,12 +218,14 @@ class JsonStoreSerializerTest(APITestCase):
         self.assertEqual(
             serializer.errors['data'][0].__str__(),
             c.FORM_ERROR_JSONSTORE_DATA_SIZE_OVER_MAX(
-                self.test_user, h.get_obj_size(large_jsonstore_data)))
+                self.test_user, h.get_json_size(large_jsonstore_data)))
 
     def test_validation_all_jsonstores_data_size_over_max(self):
         large_jsonstore_data = \
             'a' * int((sc.MAX_JSONSTORE_DATA_SIZE_USER_FREE / 2))
-        f.JsonStoreFactory(user=self.test_user, data=large_jsonstore_data)
+        f.JsonStoreFactory(
+            user=self.test_user,
+            data='a' * sc.MAX_JSONSTORE_ALL_JSONSTORES_DATA_SIZE_USER_FREE)
 
         test_url = reverse('api:jsonstore-list')
         data = {'data': large_jsonstore_data,
@@ -236,7 +243,7 @@ class JsonStoreSerializerTest(APITestCase):
         self.assertEqual(
             serializer.errors['non_field_errors'][0].__str__(),
             c.FORM_ERROR_ALL_JSONSTORES_DATA_SIZE_OVER_MAX(
-                self.test_user, h.get_obj_size(large_jsonstore_data)))
+                self.test_user, h.get_json_size(large_jsonstore_data)))
 
 
 class JsonStoreNameSerializerTest(APITestCase):
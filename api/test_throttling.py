@@ -0,0 +1,117 @@
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory
+
+from . import throttling, views
+from django_jsonsaver import factories as f
+
+
+class TestRateThrottle(throttling.UserRateThrottle):
+    rate = '3/minute'
+    now = 600.0
+
+    def timer(self):
+        return self.now
+
+
+class SlidingWindowRateThrottleTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+
+    def setUp(self):
+        cache.clear()
+        self.request = APIRequestFactory().get('/')
+        self.request.user = self.test_user
+
+    # METHODS #
+    def allow_requests(self, count, now=600.0):
+        TestRateThrottle.now = now
+        throttles = [TestRateThrottle() for i in range(count)]
+        return [throttle.allow_request(self.request, None)
+                for throttle in throttles], throttles[-1]
+
+    # TESTS #
+    def test_default_throttle_classes(self):
+        self.assertEqual(
+            settings.REST_FRAMEWORK['DEFAULT_THROTTLE_CLASSES'], [
+                'api.throttling.AnonRateThrottle',
+                'api.throttling.UserRateThrottle',
+                'api.throttling.ScopedRateThrottle'])
+
+    def test_requests_over_rate_are_denied(self):
+        allowed, throttle = self.allow_requests(4)
+        self.assertEqual(allowed, [True, True, True, False])
+        # the window's requests are still all in the sliding window at the
+        # start of the next one, and a third of them must fall out of it
+        self.assertEqual(throttle.wait(), 80)
+
+    def test_state_is_one_counter_per_window(self):
+        _, throttle = self.allow_requests(3)
+        self.assertEqual(
+            cache.get(throttle.get_window_cache_key(10)), 3)
+
+    def test_denied_requests_are_not_counted(self):
+        _, throttle = self.allow_requests(5)
+        self.assertEqual(
+            cache.get(throttle.get_window_cache_key(10)), 3)
+
+    def test_previous_window_is_weighted(self):
+        self.allow_requests(3)
+        # a third of the previous window is still in the sliding window
+        allowed, throttle = self.allow_requests(3, now=660.0 + 40)
+        self.assertEqual(allowed, [True, True, False])
+        # until the previous window's request falls out of it
+        self.assertEqual(throttle.wait(), 20)
+
+        allowed, _ = self.allow_requests(1, now=720.0)
+        self.assertEqual(allowed, [True])
+
+    def test_full_previous_window_delays_next_window(self):
+        self.allow_requests(3)
+        allowed, throttle = self.allow_requests(1, now=660.0 + 10)
+        self.assertEqual(allowed, [False])
+        self.assertAlmostEqual(throttle.wait(), 10)
+
+        allowed, _ = self.allow_requests(2, now=660.0 + 20)
+        self.assertEqual(allowed, [True, False])
+
+    def test_users_are_limited_separately(self):
+        self.allow_requests(3)
+        self.request.user = f.UserFactory()
+        allowed, _ = self.allow_requests(1)
+        self.assertEqual(allowed, [True])
+
+    def test_scopes(self):
+        self.assertEqual(
+            views.JsonStorePublicDetail.throttle_scope, 'jsonstore_public')
+        self.assertIsNone(views.JsonStoreViewSet.throttle_scope)
+        self.assertEqual(
+            views.JsonStoreViewSet.bulk.kwargs['throttle_scope'],
+            'jsonstore_bulk')
+        for scope in ['jsonstore_bulk', 'jsonstore_public']:
+            self.assertIn(
+                scope, settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'])
+
+    def test_scoped_rate_limits_view(self):
+        view = views.JsonStorePublicDetail()
+        throttle = throttling.ScopedRateThrottle()
+        self.assertTrue(throttle.allow_request(self.request, view))
+        self.assertEqual(throttle.scope, 'jsonstore_public')
+        self.assertIn('jsonstore_public', throttle.key)
+
+    @mock.patch.object(
+        views.JsonStorePublicDetail, 'throttle_classes', [TestRateThrottle])
+    def test_api_responds_429_when_throttled(self):
+        self.client.force_login(self.test_user)
+        url = reverse('api:jsonstore_detail_public',
+                      kwargs={'jsonstore_name': 'test-name'})
+        for i in range(3):
+            self.assertEqual(self.client.get(url).status_code, 404)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '80')
@@ -1,12 +1,17 @@
 import json
 
 from django.contrib.auth.models import AnonymousUser
+from django.db import connection, models
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIRequestFactory, APITestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from . import views
-from django_jsonsaver import factories as f, helpers_testing as ht
+from django_jsonsaver import \
+    constants as c, factories as f, helpers_testing as ht
+from stores import cache
 from stores.models import JsonStore
 
 
@@ -85,10 +90,46 @@ class JsonStoreViewSetTest(APITestCase):
         response = self.view.as_view({'get': 'list'})(request)
         response.render()
         content = response.content
-        content_pks = [jsonstore['id'] for jsonstore in json.loads(content)]
+        content_pks = [
+            jsonstore['id'] for jsonstore in json.loads(content)['results']]
         qs = JsonStore.objects.filter(pk__in=content_pks)
         self.assertEqual(repr(self.test_user.jsonstore_set.all()), repr(qs))
 
+    def test_method_list_returns_data_summary_without_loading_data(self):
+        self.client.force_authenticate(self.test_user)
+        with patch.object(
+                models.JSONField, 'from_db_value',
+                side_effect=AssertionError) as from_db_value:
+            response = self.client.get(reverse('api:jsonstore-list'))
+        from_db_value.assert_not_called()
+        item = json.loads(response.content)['results'][0]
+        self.assertNotIn('data', item)
+        self.assertEqual(item['data_size'], self.test_jsonstore.data_size)
+        self.assertEqual(
+            item['data_key_count'], len(self.test_jsonstore.data))
+        self.assertEqual(
+            item['data_preview'], self.test_jsonstore.data_preview)
+
+    def test_method_list_is_paginated_by_keyset(self):
+        for i in range(c.JSONSTORE_LIST_PAGINATE_BY):
+            f.JsonStoreFactory(user=self.test_user)
+        self.client.force_authenticate(self.test_user)
+        response = self.client.get(reverse('api:jsonstore-list'))
+        self.assertEqual(
+            len(response.data['results']), c.JSONSTORE_LIST_PAGINATE_BY)
+        self.assertIsNone(response.data['first'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
+        self.assertIsNotNone(response.data['first'])
+
+    def test_method_list_with_invalid_cursor_returns_404(self):
+        self.client.force_authenticate(self.test_user)
+        response = self.client.get(
+            reverse('api:jsonstore-list'), {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, 404)
+
 
 class JsonStoreNameDetailTest(APITestCase):
     @classmethod
@@ -190,3 +231,532 @@ class JsonStorePublicDetailTest(APITestCase):
         obj_id = parsed_content['name']
         obj = JsonStore.objects.get(name=obj_id, is_public=True)
         self.assertEqual(obj, self.test_jsonstore)
+
+    # retrieve()
+    def get_response(self):
+        test_kwargs = {'jsonstore_name': self.test_jsonstore.name}
+        test_url = reverse('api:jsonstore_detail_public', kwargs=test_kwargs)
+        request = self.factory.get(test_url)
+        request.user = AnonymousUser()
+        response = self.view.as_view()(request, **test_kwargs)
+        response.render()
+        return response
+
+    def test_method_retrieve_caches_rendered_response(self):
+        cache.get_public_jsonstore_cache().clear()
+        response = self.get_response()
+        with self.assertNumQueries(0):
+            cached_response = self.get_response()
+        self.assertEqual(cached_response.status_code, 200)
+        self.assertEqual(cached_response['Content-Type'], 'application/json')
+        self.assertEqual(cached_response.content, response.content)
+
+    def test_method_retrieve_returns_updated_jsonstore(self):
+        self.get_response()
+        self.test_jsonstore.data = {'message': 'updated'}
+        self.test_jsonstore.save()
+        parsed_content = json.loads(self.get_response().content)
+        self.assertEqual(parsed_content['data'], {'message': 'updated'})
+
+    def test_method_retrieve_returns_404_after_jsonstore_made_private(self):
+        self.get_response()
+        self.test_jsonstore.is_public = False
+        self.test_jsonstore.save()
+        self.assertEqual(self.get_response().status_code, 404)
+
+
+class JsonStoreRetrieveMixinTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+        cls.test_jsonstore = f.JsonStoreFactory(
+            user=cls.test_user, is_public=True)
+        cls.test_urls = [
+            reverse('api:jsonstore-detail',
+                    kwargs={'pk': cls.test_jsonstore.pk}),
+            reverse('api:jsonstore_detail_name',
+                    kwargs={'jsonstore_name': cls.test_jsonstore.name}),
+            reverse('api:jsonstore_detail_public',
+                    kwargs={'jsonstore_name': cls.test_jsonstore.name})]
+
+    def setUp(self):
+        cache.get_public_jsonstore_cache().clear()
+        self.client.force_authenticate(self.test_user)
+
+    def test_retrieve_sets_validator_headers(self):
+        for test_url in self.test_urls:
+            response = self.client.get(test_url)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(self.test_jsonstore.data_hash, response['ETag'])
+            self.assertIn('Last-Modified', response)
+
+    def test_retrieve_with_matching_etag_returns_304_without_loading_data(
+            self):
+        for test_url in self.test_urls:
+            etag = self.client.get(test_url)['ETag']
+            cache.get_public_jsonstore_cache().clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(test_url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response['ETag'], etag)
+            self.assertEqual(response.content, b'')
+            self.assertEqual(len(queries), 1)
+            self.assertNotIn('."data"', queries[0]['sql'])
+
+    def test_retrieve_with_matching_last_modified_returns_304(self):
+        for test_url in self.test_urls:
+            last_modified = self.client.get(test_url)['Last-Modified']
+            response = self.client.get(
+                test_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            self.assertEqual(response.status_code, 304)
+
+    def test_retrieve_with_stale_etag_returns_200(self):
+        etags = [self.client.get(url)['ETag'] for url in self.test_urls]
+        JsonStore.objects.get(pk=self.test_jsonstore.pk).save()
+        for test_url, etag in zip(self.test_urls, etags):
+            response = self.client.get(test_url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+
+    def test_retrieve_of_cached_public_jsonstore_returns_304_without_queries(
+            self):
+        self.client.force_authenticate(None)
+        etag = self.client.get(self.test_urls[2])['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.test_urls[2], HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_retrieve_with_matching_etag_of_other_user_jsonstore(self):
+        etag = self.client.get(self.test_urls[0])['ETag']
+        self.client.force_authenticate(f.UserFactory())
+        response = self.client.get(self.test_urls[0], HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 403)
+        response = self.client.get(self.test_urls[1], HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(JSONSTORE_STREAMING_MIN_DATA_SIZE=0)
+    def test_retrieve_of_large_jsonstore_streams_response(self):
+        for test_url in self.test_urls:
+            response = self.client.get(test_url)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.streaming)
+            self.assertEqual(response['Content-Type'], 'application/json')
+            self.assertIn('ETag', response)
+            parsed_content = json.loads(b''.join(response.streaming_content))
+            self.assertEqual(parsed_content['data'], self.test_jsonstore.data)
+
+    @override_settings(
+        JSONSTORE_STREAMING_MIN_DATA_SIZE=0, JSONSTORE_STREAMING_CHUNK_SIZE=8)
+    def test_retrieve_of_large_jsonstore_streams_data_in_chunks(self):
+        data_text = json.dumps(self.test_jsonstore.data).encode()
+        response = self.client.get(self.test_urls[0])
+        chunks = list(response.streaming_content)
+        # the other fields, the data in chunks and the closing brace
+        self.assertGreater(len(chunks), 3)
+        self.assertGreater(len(data_text), 8)
+        for chunk in chunks[1:-1]:
+            self.assertLessEqual(len(chunk), 8 * 4)
+        self.assertEqual(
+            json.loads(b''.join(chunks))['data'], self.test_jsonstore.data)
+
+    @override_settings(JSONSTORE_STREAMING_MIN_DATA_SIZE=0)
+    def test_retrieve_of_large_public_jsonstore_is_not_cached(self):
+        self.client.get(self.test_urls[2])
+        self.assertIsNone(
+            cache.get_cached_public_jsonstore(self.test_jsonstore.name))
+
+    def test_retrieve_does_not_decode_data(self):
+        with patch.object(
+                models.JSONField, 'from_db_value', side_effect=AssertionError):
+            for test_url in self.test_urls:
+                response = self.client.get(test_url)
+                parsed_content = json.loads(response.content)
+                self.assertEqual(
+                    parsed_content['data'], self.test_jsonstore.data)
+
+    def test_retrieve_returns_fields_around_raw_data(self):
+        response = self.client.get(self.test_urls[0])
+        self.assertEqual(json.loads(response.content), {
+            'id': self.test_jsonstore.pk,
+            'user': self.test_user.pk,
+            'data': self.test_jsonstore.data,
+            'name': self.test_jsonstore.name,
+            'is_public': True})
+
+    def test_retrieve_returns_raw_data_with_escaped_line_separators(self):
+        test_data = {'text': 'h\u00e9llo \u2028 \u2713', 'list': [1.5, None]}
+        jsonstore = f.JsonStoreFactory(user=self.test_user, data=test_data)
+        response = self.client.get(reverse(
+            'api:jsonstore-detail', kwargs={'pk': jsonstore.pk}))
+        self.assertNotIn('\u2028'.encode(), response.content)
+        self.assertEqual(json.loads(response.content)['data'], test_data)
+
+
+class JsonStoreViewSetPatchDataTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+
+    def setUp(self):
+        self.test_jsonstore = f.JsonStoreFactory(
+            user=self.test_user, data={'a': 1, 'b': [1, 2]})
+        self.test_url = reverse(
+            'api:jsonstore-patch-data', kwargs={'pk': self.test_jsonstore.pk})
+        self.client.force_authenticate(self.test_user)
+
+    def patch(self, data, content_type='application/json-patch+json',
+              **extra):
+        return self.client.patch(
+            self.test_url, json.dumps(data), content_type=content_type,
+            **extra)
+
+    def test_json_patch(self):
+        response = self.patch([{'op': 'add', 'path': '/b/-', 'value': 3}])
+        self.assertEqual(response.status_code, 204)
+        self.test_jsonstore.refresh_from_db()
+        self.assertEqual(self.test_jsonstore.data, {'a': 1, 'b': [1, 2, 3]})
+        self.assertIn(self.test_jsonstore.data_hash, response['ETag'])
+
+    def test_merge_patch(self):
+        response = self.patch(
+            {'a': None}, content_type='application/merge-patch+json')
+        self.assertEqual(response.status_code, 204)
+        self.test_jsonstore.refresh_from_db()
+        self.assertEqual(self.test_jsonstore.data, {'b': [1, 2]})
+
+    def test_unsupported_content_type_returns_415(self):
+        response = self.patch({'a': 2}, content_type='application/json')
+        self.assertEqual(response.status_code, 415)
+
+    def test_invalid_patch_returns_400(self):
+        response = self.patch([{'op': 'remove', 'path': '/missing'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0].code, 'invalid_patch')
+
+    def test_patch_over_max_data_size_returns_400(self):
+        max_jsonstore_data_size = \
+            self.test_user.profile.get_max_jsonstore_data_size()
+        response = self.patch(
+            {'c': 'x' * max_jsonstore_data_size},
+            content_type='application/merge-patch+json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0].code, 'jsonstore_data_size_over_max')
+
+    def test_patch_with_matching_if_match_returns_204(self):
+        etag = self.client.get(reverse(
+            'api:jsonstore-detail',
+            kwargs={'pk': self.test_jsonstore.pk}))['ETag']
+        response = self.patch(
+            [{'op': 'remove', 'path': '/a'}], HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 204)
+
+        # the etag is now stale
+        response = self.patch(
+            [{'op': 'remove', 'path': '/b'}], HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.test_jsonstore.refresh_from_db()
+        self.assertEqual(self.test_jsonstore.data, {'b': [1, 2]})
+
+    def test_patch_of_other_user_jsonstore_returns_403(self):
+        self.client.force_authenticate(f.UserFactory())
+        response = self.patch([{'op': 'remove', 'path': '/a'}])
+        self.assertEqual(response.status_code, 403)
+
+    def test_patch_of_missing_jsonstore_returns_404(self):
+        self.test_url = reverse('api:jsonstore-patch-data', kwargs={'pk': 0})
+        response = self.patch([{'op': 'remove', 'path': '/a'}])
+        self.assertEqual(response.status_code, 404)
+
+
+class JsonStoreRetrieveDataTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+        cls.test_jsonstore = f.JsonStoreFactory(
+            user=cls.test_user, name='test-name', is_public=True,
+            data={'items': [{'name': 'first'}, {'a/b': None}], 'n': 1})
+
+    def setUp(self):
+        self.test_jsonstore.refresh_from_db()
+        cache.get_public_jsonstore_cache().clear()
+        self.client.force_authenticate(self.test_user)
+
+    def get_url(self, data_path, view='api:jsonstore-data-path', **kwargs):
+        if not kwargs:
+            kwargs = {'pk': self.test_jsonstore.pk}
+        return reverse(view, kwargs={**kwargs, 'data_path': data_path})
+
+    def test_json_pointer(self):
+        response = self.client.get(self.get_url('/items/0'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), {'name': 'first'})
+
+        response = self.client.get(self.get_url('items/1/a~1b'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'null')
+
+    def test_dotted_path(self):
+        response = self.client.get(self.get_url('items.0.name'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), 'first')
+
+    def test_missing_path_returns_404(self):
+        for data_path in ['missing', 'items.2', 'items.name', 'n.0',
+                          # not array indexes, on every database
+                          'items.-1', 'items.00', 'items.+1']:
+            response = self.client.get(self.get_url(data_path))
+            self.assertEqual(response.status_code, 404, data_path)
+
+    def test_response_has_validators(self):
+        response = self.client.get(self.get_url('n'))
+        self.assertIn(self.test_jsonstore.data_hash, response['ETag'])
+
+        response = self.client.get(
+            self.get_url('n'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_other_user_jsonstore_returns_403(self):
+        self.client.force_authenticate(f.UserFactory())
+        response = self.client.get(self.get_url('n'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_missing_jsonstore_returns_404(self):
+        response = self.client.get(self.get_url('n', pk=0))
+        self.assertEqual(response.status_code, 404)
+
+    def test_name_data_detail(self):
+        response = self.client.get(self.get_url(
+            'n', 'api:jsonstore_data_name', jsonstore_name='test-name'))
+        self.assertEqual(json.loads(response.content), 1)
+
+        self.client.force_authenticate(f.UserFactory())
+        response = self.client.get(self.get_url(
+            'n', 'api:jsonstore_data_name', jsonstore_name='test-name'))
+        self.assertEqual(response.status_code, 404)
+
+    def test_public_data_detail(self):
+        self.client.force_authenticate(None)
+        url = self.get_url(
+            'items.0', 'api:jsonstore_data_public', jsonstore_name='test-name')
+        response = self.client.get(url)
+        self.assertEqual(json.loads(response.content), {'name': 'first'})
+
+        JsonStore.objects.filter(pk=self.test_jsonstore.pk) \
+            .update(is_public=False)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_data_detail_is_read_only(self):
+        response = self.client.delete(self.get_url(
+            'n', 'api:jsonstore_data_name', jsonstore_name='test-name'))
+        self.assertEqual(response.status_code, 405)
+
+
+class JsonStoreViewSetBulkTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+        cls.test_url = reverse('api:jsonstore-bulk')
+
+    def setUp(self):
+        self.test_jsonstore = f.JsonStoreFactory(
+            user=self.test_user, name='test-name')
+        self.client.force_authenticate(self.test_user)
+
+    def post(self, operations):
+        return self.client.post(self.test_url, operations, format='json')
+
+    def test_bulk_returns_results_per_operation(self):
+        response = self.post([
+            {'op': 'create', 'name': 'New Name', 'data': {'a': 1}},
+            {'op': 'update', 'id': self.test_jsonstore.pk, 'is_public': True},
+            {'op': 'delete', 'id': self.test_jsonstore.pk + 1000}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[:2], [{}, {}])
+        self.assertEqual(
+            response.data[2]['non_field_errors'][0].code,
+            'jsonstore_bulk_not_found')
+
+        response = self.post([
+            {'op': 'create', 'name': 'New Name', 'data': {'a': 1}},
+            {'op': 'update', 'id': self.test_jsonstore.pk, 'is_public': True}])
+        self.assertEqual(response.status_code, 200)
+        new_jsonstore = JsonStore.objects.get(name='new-name')
+        self.assertEqual(response.data, [
+            {'op': 'create', 'id': new_jsonstore.pk, 'name': 'new-name',
+             'is_public': False},
+            {'op': 'update', 'id': self.test_jsonstore.pk,
+             'name': 'test-name', 'is_public': True}])
+        self.assertEqual(new_jsonstore.data, {'a': 1})
+
+    def test_delete_result(self):
+        response = self.post([{'op': 'delete', 'id': self.test_jsonstore.pk}])
+        self.assertEqual(
+            response.data, [{'op': 'delete', 'id': self.test_jsonstore.pk}])
+
+    def test_malformed_operations_return_400(self):
+        response = self.post([
+            {'op': 'create', 'id': self.test_jsonstore.pk},
+            {'op': 'update'},
+            {'op': 'rename'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [list(errors) for errors in response.data],
+            [['id'], ['id'], ['op']])
+
+    def test_operation_count_over_max_returns_400(self):
+        response = self.post(
+            [{'op': 'create'}] * (c.JSONSTORE_BULK_MAX_OPERATION_COUNT + 1))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data[0].code, 'jsonstore_bulk_operation_count_over_max')
+
+    def test_unauthenticated_user_cannot_bulk(self):
+        self.client.force_authenticate(None)
+        response = self.post([{'op': 'create'}])
+        self.assertIn(response.status_code, [401, 403])
+
+
+class JsonStoreViewSetMultiGetTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+        cls.test_jsonstores = [
+            f.JsonStoreFactory(user=cls.test_user, name=f'name-{i}')
+            for i in range(3)]
+        cls.other_jsonstore = f.JsonStoreFactory(name='name-0')
+        cls.test_url = reverse('api:jsonstore-multi-get')
+
+    def setUp(self):
+        self.client.force_authenticate(self.test_user)
+
+    def get(self, **params):
+        return self.client.get(self.test_url, params)
+
+    def test_get_by_ids_in_given_order(self):
+        pks = [self.test_jsonstores[2].pk, self.test_jsonstores[0].pk]
+        response = self.get(ids=','.join(map(str, pks)))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['id'] for item in response.data], pks)
+        self.assertEqual(
+            response.data[0]['data'], self.test_jsonstores[2].data)
+
+    def test_get_by_names(self):
+        response = self.get(names='name-1,name-0,missing')
+        self.assertEqual(
+            [item['id'] for item in response.data],
+            [self.test_jsonstores[1].pk, self.test_jsonstores[0].pk])
+
+    def test_other_user_jsonstores_are_left_out(self):
+        response = self.get(ids=f'{self.other_jsonstore.pk}')
+        self.assertEqual(response.data, [])
+
+    def test_uses_one_query(self):
+        pks = [jsonstore.pk for jsonstore in self.test_jsonstores]
+        with CaptureQueriesContext(connection) as queries:
+            self.get(ids=','.join(map(str, pks)))
+        jsonstore_queries = [
+            query for query in queries
+            if JsonStore._meta.db_table in query['sql']]
+        self.assertEqual(len(jsonstore_queries), 1)
+
+    def test_fields_selector_does_not_load_data(self):
+        with patch.object(
+                models.JSONField, 'from_db_value',
+                side_effect=AssertionError) as from_db_value:
+            response = self.get(
+                names='name-0', fields='id,name,is_public')
+        from_db_value.assert_not_called()
+        self.assertEqual(response.data, [{
+            'id': self.test_jsonstores[0].pk, 'name': 'name-0',
+            'is_public': False}])
+
+    def test_invalid_requests_return_400(self):
+        for params in [{}, {'ids': '1', 'names': 'a'}, {'ids': 'a'},
+                       {'ids': '1', 'fields': 'id,secret'},
+                       {'ids': '1', 'fields': ''}, {'ids': '1', 'fields': ','},
+                       {'ids': ','.join(
+                           ['1'] * (c.JSONSTORE_MULTI_GET_MAX_COUNT + 1))}]:
+            response = self.get(**params)
+            self.assertEqual(response.status_code, 400, params)
+
+    def test_empty_fields_returns_400(self):
+        response = self.get(
+            ids=str(self.test_jsonstores[0].pk), fields=',')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data[0].code, 'jsonstore_multi_get_no_fields')
+
+
+class ApiViewQueryBudgetTest(ht.QueryBudgetTestCaseMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+        cls.test_jsonstores = [
+            f.JsonStoreFactory(
+                user=cls.test_user, data={'a': {'b': [1, 2]}},
+                is_public=i % 2 == 0)
+            for i in range(5)]
+        cls.other_jsonstore = f.JsonStoreFactory(
+            data={'a': 1}, is_public=True)
+        cls.test_url = reverse('api:api_root')
+
+    def get_query_budgets(self):
+        jsonstore = self.test_jsonstores[0]
+        return {
+            reverse('api:api_root'): 0,
+            reverse('api:jsonstore-list'): 3,
+            reverse('api:jsonstore-detail', kwargs={'pk': jsonstore.pk}): 3,
+            reverse('api:jsonstore-multi-get') + '?ids=' + ','.join(
+                str(jsonstore.pk) for jsonstore in self.test_jsonstores): 3,
+            reverse('api:jsonstore-data-path', kwargs={
+                'pk': jsonstore.pk, 'data_path': 'a/b/0'}): 3,
+            reverse('api:jsonstore_detail_name', kwargs={
+                'jsonstore_name': jsonstore.name}): 3,
+            reverse('api:jsonstore_data_name', kwargs={
+                'jsonstore_name': jsonstore.name, 'data_path': 'a/b'}): 3,
+            reverse('api:jsonstore_detail_public', kwargs={
+                'jsonstore_name': self.other_jsonstore.name}): 3,
+            reverse('api:jsonstore_data_public', kwargs={
+                'jsonstore_name': self.other_jsonstore.name,
+                'data_path': 'a'}): 3,
+        }
+
+    def test_query_budget_create(self):
+        response = self.assertQueryBudget(
+            10, reverse('api:jsonstore-list'), method='post',
+            data={'name': 'new-name', 'data': {'a': 1}}, format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def test_query_budget_update(self):
+        response = self.assertQueryBudget(
+            10, reverse('api:jsonstore-detail', kwargs={
+                'pk': self.test_jsonstores[0].pk}),
+            method='patch', data={'data': {'a': 2}}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_query_budget_patch_data(self):
+        response = self.assertQueryBudget(
+            8, reverse('api:jsonstore-patch-data', kwargs={
+                'pk': self.test_jsonstores[0].pk}),
+            method='patch', data=json.dumps({'a': {'c': 3}}),
+            content_type='application/merge-patch+json')
+        self.assertEqual(response.status_code, 204)
+
+    def test_query_budget_delete(self):
+        response = self.assertQueryBudget(
+            6, reverse('api:jsonstore-detail', kwargs={
+                'pk': self.test_jsonstores[0].pk}),
+            method='delete')
+        self.assertEqual(response.status_code, 204)
+
+    def test_query_budget_bulk(self):
+        response = self.assertQueryBudget(
+            19, reverse('api:jsonstore-bulk'), method='post', data=[
+                {'op': 'create', 'name': 'new-name'},
+                {'op': 'update', 'id': self.test_jsonstores[0].pk,
+                 'data': {}},
+                {'op': 'delete', 'id': self.test_jsonstores[1].pk}],
+            format='json')
+        self.assertEqual(response.status_code, 200)
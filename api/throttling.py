@@ -0,0 +1,99 @@
+"""
+Rate limits that keep two counters per client, whatever the rate.
+
+DRF's throttles keep a list of the times of a client's requests in the
+window, and rewrite it on every request. These throttles use a sliding
+window counter instead: a request is counted in its fixed window with an
+atomic cache increment, and the client's rate is the current window's count
+plus the previous window's count, weighted by how much of the previous
+window is still within the sliding window. With a shared cache, e.g. Redis,
+the limits hold across processes.
+"""
+from rest_framework import throttling
+
+
+class SlidingWindowRateThrottle(throttling.SimpleRateThrottle):
+    """A SimpleRateThrottle that counts requests in a sliding window."""
+
+    def get_window_cache_key(self, window):
+        return f'{self.key}:{window}'
+
+    def increment(self, key):
+        """Counts a request in the window of key and returns its count."""
+        # the previous window's count is read during the next window
+        timeout = self.duration * 2
+        if self.cache.add(key, 1, timeout):
+            return 1
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # the window has expired since add()
+            self.cache.add(key, 1, timeout)
+            return 1
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, elapsed = divmod(self.now, self.duration)
+        self.elapsed = elapsed
+        key = self.get_window_cache_key(int(window))
+        self.current_count = self.increment(key)
+        self.previous_count = self.cache.get(
+            self.get_window_cache_key(int(window) - 1), 0)
+        if self.get_count(self.current_count) > self.num_requests:
+            # denied requests are not counted
+            try:
+                self.cache.decr(key)
+            except ValueError:
+                pass
+            self.current_count -= 1
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def get_count(self, current_count):
+        """Returns the number of requests in the sliding window."""
+        return self.previous_count * (1 - self.elapsed / self.duration) + \
+            current_count
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """
+        Returns the number of seconds until the sliding window has room for
+        another request.
+        """
+        # the room that the previous window's requests must leave
+        room = self.num_requests - self.current_count - 1
+        if room >= 0 and self.previous_count:
+            # the previous window's weight falls until the request fits
+            wait = (1 - room / self.previous_count) * self.duration - \
+                self.elapsed
+        else:
+            # the current window's requests are the previous window's ones
+            # in the next window
+            room = self.num_requests - 1
+            wait = self.duration - self.elapsed + \
+                (1 - room / max(self.current_count, 1)) * self.duration
+        return max(wait, 0)
+
+
+class AnonRateThrottle(
+        throttling.AnonRateThrottle, SlidingWindowRateThrottle):
+    pass
+
+
+class UserRateThrottle(
+        throttling.UserRateThrottle, SlidingWindowRateThrottle):
+    pass
+
+
+class ScopedRateThrottle(
+        throttling.ScopedRateThrottle, SlidingWindowRateThrottle):
+    """Limits the views that have a throttle_scope to their scope's rate."""
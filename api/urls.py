@@ -15,7 +15,13 @@ urlpatterns = [
     path('jsonstore/name/<str:jsonstore_name>/',
          views.JsonStoreNameDetail.as_view(),
          name='jsonstore_detail_name'),
+    path('jsonstore/name/<str:jsonstore_name>/data/<path:data_path>/',
+         views.JsonStoreNameDataDetail.as_view(),
+         name='jsonstore_data_name'),
     path('jsonstore/public/<str:jsonstore_name>/',
          views.JsonStorePublicDetail.as_view(),
          name='jsonstore_detail_public'),
+    path('jsonstore/public/<str:jsonstore_name>/data/<path:data_path>/',
+         views.JsonStorePublicDataDetail.as_view(),
+         name='jsonstore_data_public'),
 ] + router.urls
@@ -1,29 +1,366 @@
-from django.http import HttpResponseRedirect
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connection
+from django.db.models import TextField
+from django.db.models.functions import Cast
+from django.http import HttpResponseRedirect, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
-from rest_framework import generics, viewsets
+from rest_framework import generics, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ErrorDetail, NotFound, ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from uuid import uuid4
 
-from . import serializers
+from . import conditional, parsers, serializers
+from .exceptions import PreconditionFailed
+from .pagination import JsonStoreKeysetPagination
 from .permissions import HasJsonStorePermissions
+from .renderers import encode_json_text, encode_json_text_chunks
+from .responses import PrerenderedJSONResponse
+from django_jsonsaver import constants as c
+from stores import bulk, cache, patches
 from stores.models import JsonStore
 
 
+PATCH_FORMATS = {
+    parsers.JSONPatchParser.media_type: patches.JSON_PATCH,
+    parsers.MergePatchParser.media_type: patches.MERGE_PATCH,
+}
+
+
+def get_bulk_error_detail(errors):
+    """
+    Returns the errors of each operation of a batch in the form used by
+    serializers, i.e. a dict of field names to lists of errors.
+    """
+    detail = []
+    for operation_errors in errors:
+        operation_detail = {}
+        for field, error in operation_errors:
+            operation_detail.setdefault(
+                field or api_settings.NON_FIELD_ERRORS_KEY, []).append(
+                ErrorDetail(error.message, error.code))
+        detail.append(operation_detail)
+    return detail
+
+
 def api_root(request):
     return HttpResponseRedirect(reverse('api_generic:schema'))
 
 
-class JsonStoreViewSet(viewsets.ModelViewSet):
+class JsonStoreRetrieveMixin:
+    """
+    Retrieves jsonstores as JSON with ETag and Last-Modified headers.
+
+    Requests whose conditional headers match are answered without loading
+    the jsonstore's data. Otherwise, the data column is fetched as text and
+    spliced into the response verbatim, rather than being decoded and then
+    encoded again. Large responses are streamed.
+    """
+
+    def get_retrieve_queryset(self):
+        """Returns the requested jsonstore, if the user may retrieve it."""
+        raise NotImplementedError
+
+    def get_validators(self):
+        """Returns the (data_hash, updated_at) of the jsonstore, or None."""
+        try:
+            return self.get_retrieve_queryset() \
+                .values_list('data_hash', 'updated_at').first()
+        except (TypeError, ValueError):
+            return None
+
+    def get_raw_object(self, data_text=None):
+        """
+        Returns the jsonstore with its data deferred and the text of its data
+        column in data_text, or None if it cannot be retrieved. data_text may
+        be given as an expression that selects only part of the data.
+        """
+        if data_text is None:
+            data_text = Cast('data', TextField())
+        try:
+            obj = self.get_retrieve_queryset().defer('data') \
+                .annotate(data_text=data_text).first()
+        except (TypeError, ValueError):
+            return None
+        if obj is not None:
+            self.check_object_permissions(self.request, obj)
+        return obj
+
+    def get_rendered_object(self):
+        """
+        Returns the (content, data_hash, updated_at) of the jsonstore. The
+        content of large jsonstores is an iterator of bytes chunks.
+        """
+        obj = self.get_raw_object()
+        if obj is None:
+            # let get_object() raise the appropriate error
+            self.get_object()
+            raise NotFound()
+
+        # render the other fields around a placeholder for the data
+        renderer = self.request.accepted_renderer
+        data_placeholder = uuid4().hex
+        obj.data = data_placeholder
+        head, _, tail = \
+            renderer.render(self.get_serializer(obj).data).partition(
+                renderer.render(data_placeholder))
+        if obj.data_size < settings.JSONSTORE_STREAMING_MIN_DATA_SIZE:
+            return head + encode_json_text(obj.data_text) + tail, \
+                obj.data_hash, obj.updated_at
+
+        def content():
+            yield head
+            yield from encode_json_text_chunks(
+                obj.data_text, settings.JSONSTORE_STREAMING_CHUNK_SIZE)
+            yield tail
+
+        return content(), obj.data_hash, obj.updated_at
+
+    def get_rendered_data(self, tokens):
+        """
+        Returns the (content, data_hash, updated_at) of the value referenced
+        by tokens in the jsonstore's data. On Postgres, only that value is
+        fetched from the database, unless it reads the path differently.
+        """
+        if connection.vendor == 'postgresql' and \
+                patches.can_resolve_in_database(tokens):
+            obj = self.get_raw_object(patches.get_jsonb_path_text_sql(tokens))
+            if obj is not None:
+                if obj.data_text is None:
+                    raise NotFound(c.API_ERROR_JSONSTORE_DATA_PATH_NOT_FOUND)
+                return encode_json_text(obj.data_text), obj.data_hash, \
+                    obj.updated_at
+
+        # let get_object() raise the appropriate error
+        obj = self.get_object()
+        try:
+            value = patches.resolve_json_pointer(obj.data, tokens)
+        except patches.PatchError:
+            raise NotFound(c.API_ERROR_JSONSTORE_DATA_PATH_NOT_FOUND)
+        # the JSON renderers render None as an empty body
+        if value is None:
+            return b'null', obj.data_hash, obj.updated_at
+        return self.request.accepted_renderer.render(value), \
+            obj.data_hash, obj.updated_at
+
+    def get_not_modified_response(self, request):
+        """Returns a 304 or 412 response if the request's conditions match."""
+        if conditional.is_conditional_request(request):
+            validators = self.get_validators()
+            if validators:
+                return conditional.get_not_modified_response(
+                    request, *validators)
+
+    def retrieve_data(self, request, data_path):
+        """
+        Retrieves the value at data_path in the jsonstore's data. See
+        patches.parse_data_path() for the accepted path forms.
+        """
+        tokens = patches.parse_data_path(data_path)
+        if not isinstance(request.accepted_renderer, JSONRenderer):
+            try:
+                return Response(patches.resolve_json_pointer(
+                    self.get_object().data, tokens))
+            except patches.PatchError:
+                raise NotFound(c.API_ERROR_JSONSTORE_DATA_PATH_NOT_FOUND)
+
+        response = self.get_not_modified_response(request)
+        if response is not None:
+            return response
+        content, data_hash, updated_at = self.get_rendered_data(tokens)
+        response = PrerenderedJSONResponse(content)
+        conditional.set_validator_headers(response, data_hash, updated_at)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        # only JSON responses are conditional, e.g. not the browsable API
+        if not isinstance(request.accepted_renderer, JSONRenderer):
+            return super().retrieve(request, *args, **kwargs)
+
+        response = self.get_not_modified_response(request)
+        if response is not None:
+            return response
+        content, data_hash, updated_at = self.get_rendered_object()
+        if isinstance(content, bytes):
+            response = PrerenderedJSONResponse(content)
+        else:
+            response = StreamingHttpResponse(
+                content, content_type='application/json')
+        conditional.set_validator_headers(response, data_hash, updated_at)
+        return response
+
+
+class JsonStoreViewSet(JsonStoreRetrieveMixin, viewsets.ModelViewSet):
     queryset = JsonStore.objects.all()
     serializer_class = serializers.JsonStoreSerializer
     permission_classes = [IsAuthenticated, HasJsonStorePermissions]
+    pagination_class = JsonStoreKeysetPagination
+    # set by the actions that have their own rate limit
+    throttle_scope = None
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return serializers.JsonStoreListSerializer
+        return super().get_serializer_class()
 
     def list(self, request):
-        self.queryset = JsonStore.objects.filter(user__id=request.user.id)
+        self.queryset = JsonStore.objects \
+            .filter(user__id=request.user.id).defer('data')
         return super().list(request)
 
+    @action(detail=False, methods=['get'], url_path='multi')
+    def multi_get(self, request):
+        """
+        Returns the user's jsonstores whose ids, or names, are given as a
+        comma-separated list in the 'ids', or 'names', query parameter, in
+        the order given. Missing jsonstores are left out. The 'fields'
+        query parameter may limit the fields that are returned, e.g. to
+        leave out the data.
+        """
+        ids = request.query_params.get('ids')
+        names = request.query_params.get('names')
+        if (ids is None) == (names is None):
+            raise ValidationError(
+                c.API_ERROR_JSONSTORE_MULTI_GET_IDS_OR_NAMES,
+                code='jsonstore_multi_get_ids_or_names')
+        keys = [key for key in (ids or names).split(',') if key]
+        if len(keys) > c.JSONSTORE_MULTI_GET_MAX_COUNT:
+            raise ValidationError(
+                c.API_ERROR_JSONSTORE_MULTI_GET_COUNT_OVER_MAX(
+                    c.JSONSTORE_MULTI_GET_MAX_COUNT),
+                code='jsonstore_multi_get_count_over_max')
+
+        fields = serializers.JsonStoreFieldsSerializer.Meta.fields
+        if 'fields' in request.query_params:
+            fields = [field for field in
+                      request.query_params['fields'].split(',') if field]
+            if not fields:
+                raise ValidationError(
+                    c.API_ERROR_JSONSTORE_MULTI_GET_NO_FIELDS,
+                    code='jsonstore_multi_get_no_fields')
+            invalid_fields = [
+                field for field in fields
+                if field not in serializers.JsonStoreFieldsSerializer.Meta
+                .fields]
+            if invalid_fields:
+                raise ValidationError(
+                    c.API_ERROR_JSONSTORE_MULTI_GET_INVALID_FIELDS(
+                        invalid_fields),
+                    code='jsonstore_multi_get_invalid_fields')
 
-class JsonStoreNameDetail(generics.RetrieveUpdateDestroyAPIView):
+        if ids is not None:
+            try:
+                keys = [int(key) for key in keys]
+            except ValueError:
+                raise ValidationError(
+                    c.API_ERROR_JSONSTORE_MULTI_GET_INVALID_ID,
+                    code='jsonstore_multi_get_invalid_id')
+            queryset = JsonStore.objects.only(*fields).filter(pk__in=keys)
+            if not request.user.is_staff:
+                queryset = queryset.filter(user=request.user)
+            jsonstores = {jsonstore.pk: jsonstore for jsonstore in queryset}
+        else:
+            # names are only unique among a user's own jsonstores
+            queryset = JsonStore.objects.only(*fields, 'name') \
+                .filter(name__in=keys, user=request.user)
+            jsonstores = {
+                jsonstore.name: jsonstore for jsonstore in queryset}
+
+        serializer = serializers.JsonStoreFieldsSerializer(
+            [jsonstores[key] for key in dict.fromkeys(keys)
+             if key in jsonstores],
+            many=True, fields=fields)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['post'], throttle_scope='jsonstore_bulk')
+    def bulk(self, request):
+        """
+        Applies a list of create, update and delete operations to the user's
+        jsonstores. Either every operation is applied or, if any is invalid,
+        none is and the errors of each operation are returned.
+        """
+        operations = request.data
+        if isinstance(operations, list) and \
+                len(operations) > c.JSONSTORE_BULK_MAX_OPERATION_COUNT:
+            raise ValidationError(
+                c.API_ERROR_JSONSTORE_BULK_OPERATION_COUNT_OVER_MAX(
+                    c.JSONSTORE_BULK_MAX_OPERATION_COUNT),
+                code='jsonstore_bulk_operation_count_over_max')
+        serializer = serializers.JsonStoreBulkOperationSerializer(
+            data=operations, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            results = bulk.apply_bulk_operations(
+                request.user, serializer.validated_data)
+        except bulk.BulkOperationError as e:
+            raise ValidationError(get_bulk_error_detail(e.errors))
+
+        return Response([
+            {'op': operation['op'], 'id': result}
+            if operation['op'] == bulk.DELETE else
+            {'op': operation['op'], 'id': result.pk, 'name': result.name,
+             'is_public': result.is_public}
+            for operation, result in zip(serializer.validated_data, results)])
+
+    def get_retrieve_queryset(self):
+        queryset = JsonStore.objects.filter(pk=self.kwargs['pk'])
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(user=self.request.user)
+        return queryset
+
+    @action(detail=True, methods=['patch'], url_path='data',
+            parser_classes=[parsers.JSONPatchParser, parsers.MergePatchParser])
+    def patch_data(self, request, pk=None):
+        """
+        Applies a JSON Patch or JSON Merge Patch document to the jsonstore's
+        data, depending on the request's content type.
+        """
+        patch = request.data
+        patch_format = PATCH_FORMATS[
+            request.content_type.partition(';')[0].strip().lower()]
+
+        def precondition(jsonstore):
+            self.check_object_permissions(request, jsonstore)
+            if conditional.get_not_modified_response(
+                    request, jsonstore.data_hash, jsonstore.updated_at):
+                raise PreconditionFailed()
+
+        try:
+            queryset = self.get_retrieve_queryset()
+        except (TypeError, ValueError):
+            queryset = JsonStore.objects.none()
+        try:
+            jsonstore = patches.patch_jsonstore_data(
+                queryset, patch, patch_format, precondition)
+        except patches.PatchError as e:
+            raise ValidationError(str(e), code='invalid_patch')
+        except DjangoValidationError as e:
+            error = e.error_list[0]
+            raise ValidationError(error.message, code=error.code)
+        if jsonstore is None:
+            # let get_object() raise the appropriate error
+            self.get_object()
+            raise NotFound()
+
+        response = Response(status=status.HTTP_204_NO_CONTENT)
+        conditional.set_validator_headers(
+            response, jsonstore.data_hash, jsonstore.updated_at)
+        return response
+
+    @action(detail=True, methods=['get'], url_path=r'data/(?P<data_path>.+)',
+            url_name='data-path')
+    def data_path(self, request, pk=None, data_path=None):
+        return self.retrieve_data(request, data_path)
+
+
+class JsonStoreNameDetail(
+        JsonStoreRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = serializers.JsonStoreNameSerializer
     permission_classes = [HasJsonStorePermissions]
 
@@ -33,11 +370,51 @@ class JsonStoreNameDetail(generics.RetrieveUpdateDestroyAPIView):
             name=self.kwargs['jsonstore_name'],
             user__id=self.request.user.id)
 
+    def get_retrieve_queryset(self):
+        return JsonStore.objects.filter(
+            name=self.kwargs['jsonstore_name'],
+            user__id=self.request.user.id)
+
+
+class JsonStoreNameDataDetail(JsonStoreNameDetail):
+    http_method_names = ['get', 'head', 'options']
+
+    def get(self, request, *args, **kwargs):
+        return self.retrieve_data(request, kwargs['data_path'])
+
 
-class JsonStorePublicDetail(generics.RetrieveAPIView):
+class JsonStorePublicDetail(
+        JsonStoreRetrieveMixin, generics.RetrieveAPIView):
     serializer_class = serializers.JsonStorePublicSerializer
     permission_classes = [AllowAny]
+    throttle_scope = 'jsonstore_public'
 
     def get_object(self):
         return get_object_or_404(
             JsonStore, name=self.kwargs['jsonstore_name'], is_public=True)
+
+    def get_retrieve_queryset(self):
+        return JsonStore.objects.filter(
+            name=self.kwargs['jsonstore_name'], is_public=True)
+
+    def get_validators(self):
+        cached = cache.get_cached_public_jsonstore(
+            self.kwargs['jsonstore_name'])
+        if cached is not None:
+            return cached[1:]
+        return super().get_validators()
+
+    def get_rendered_object(self):
+        name = self.kwargs['jsonstore_name']
+        cached = cache.get_cached_public_jsonstore(name)
+        if cached is None:
+            cached = super().get_rendered_object()
+            # streamed content is too large to be cached
+            if isinstance(cached[0], bytes):
+                cache.set_cached_public_jsonstore(name, *cached)
+        return cached
+
+
+class JsonStorePublicDataDetail(JsonStorePublicDetail):
+    def get(self, request, *args, **kwargs):
+        return self.retrieve_data(request, kwargs['data_path'])
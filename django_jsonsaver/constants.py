@@ -2,6 +2,9 @@
 JSONSTORE_LIST_PAGINATE_BY = 25
 JSONSTORE_FORBIDDEN_NAMES = ['find']
 JSONSTORE_NAME_MAX_LENGTH = 128
+JSONSTORE_DATA_PREVIEW_LENGTH = 100
+JSONSTORE_BULK_MAX_OPERATION_COUNT = 100
+JSONSTORE_MULTI_GET_MAX_COUNT = 100
 
 
 # testing
@@ -42,6 +45,35 @@ STORES_JSONSTORE_LOOKUP_FORM_HELP_TEXT = \
 JSONSTORE_CREATE_SUCCESS_MESSAGE = "Store created successfully"
 JSONSTORE_UPDATE_SUCCESS_MESSAGE = "Store updated successfully"
 JSONSTORE_DELETE_SUCCESS_MESSAGE = "Store deleted successfully"
+API_ERROR_JSONSTORE_DATA_PATH_NOT_FOUND = \
+    "The JSON store's data has no value at this path."
+API_ERROR_JSONSTORE_BULK_NOT_FOUND = "No JSON store with this id was found."
+API_ERROR_JSONSTORE_BULK_DUPLICATE_ID = \
+    "A JSON store can only be updated or deleted once per batch."
+API_ERROR_JSONSTORE_BULK_CREATE_ID = \
+    "An id cannot be given when creating a JSON store."
+
+
+def API_ERROR_JSONSTORE_BULK_OPERATION_COUNT_OVER_MAX(max_operation_count):
+    return f"A batch can contain at most {max_operation_count} operations."
+
+
+API_ERROR_JSONSTORE_MULTI_GET_IDS_OR_NAMES = \
+    "Either 'ids' or 'names' must be given, as a comma-separated list."
+API_ERROR_JSONSTORE_MULTI_GET_INVALID_ID = "Every id must be an integer."
+
+
+def API_ERROR_JSONSTORE_MULTI_GET_COUNT_OVER_MAX(max_count):
+    return f"At most {max_count} JSON stores can be fetched at once."
+
+
+def API_ERROR_JSONSTORE_MULTI_GET_INVALID_FIELDS(fields):
+    return f"Unknown fields: {', '.join(fields)}."
+
+
+API_ERROR_JSONSTORE_MULTI_GET_NO_FIELDS = \
+    "'fields' must name at least one field, as a comma-separated list."
+
 
 # user
 USER_FORM_EMAIL_ERROR_DUPLICATE = \
@@ -120,13 +152,18 @@ def FORM_ERROR_JSONSTORE_DATA_SIZE_OVER_MAX(user, store_data_size):
         f"data is {rounded_jsonstore_data_size} KB."
 
 
-def FORM_ERROR_ALL_JSONSTORES_DATA_SIZE_OVER_MAX(user, jsonstore_data_size):
+def FORM_ERROR_ALL_JSONSTORES_DATA_SIZE_OVER_MAX(
+        user, jsonstore_data_size, obj=None, all_jsonstores_data_size=None):
     max_jsonstore_all_jsonstores_data_size_in_kb = \
         user.profile.get_max_jsonstore_all_jsonstores_data_size_in_kb()
+    if all_jsonstores_data_size is None:
+        all_jsonstores_data_size = user.profile.get_all_jsonstores_data_size()
+    other_jsonstores_data_size = \
+        all_jsonstores_data_size - (obj.data_size if obj else 0)
     rounded_jsonstore_data_size = round(jsonstore_data_size / 1024, 2)
-    jsonstore_data_size_excess = \
-        round(abs(jsonstore_data_size -
-              max_jsonstore_all_jsonstores_data_size_in_kb), 2)
+    jsonstore_data_size_excess = round(
+        (jsonstore_data_size + other_jsonstores_data_size -
+         user.profile.get_max_jsonstore_all_jsonstores_data_size()) / 1024, 2)
     return f"The maximum storage capacity for all your JSON stores is "\
         f"{max_jsonstore_all_jsonstores_data_size_in_kb} KB. The disk size "\
         f"of your entered data is {rounded_jsonstore_data_size} KB, which is "\
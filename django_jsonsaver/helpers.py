@@ -1,8 +1,8 @@
-import gc
-import sys
-
+import json
 from django.urls import reverse
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage
+from hashlib import sha256
+from json.encoder import encode_basestring
 from math import ceil as math_ceil
 
 from . import server_config
@@ -16,19 +16,102 @@ def get_next_url(request, url):
     return url
 
 
-def get_obj_size(obj):  # https://stackoverflow.com/a/53705610/
-    marked = {id(obj)}
-    obj_q = [obj]
-    sz = 0
-    while obj_q:
-        sz += sum(map(sys.getsizeof, obj_q))
-        all_refr = ((id(o), o) for o in gc.get_referents(*obj_q))
-        new_refr = {o_id: o for o_id, o in all_refr
-                    if o_id not in marked
-                    and not isinstance(o, type)}
-        obj_q = new_refr.values()
-        marked.update(new_refr.keys())
-    return sz
+def get_json_size(obj):
+    """
+    Returns the size of obj in bytes when serialized as compact UTF-8 JSON.
+    The size is counted item by item, so the JSON string is never built.
+    """
+    size = 0
+    pending = [obj]
+    while pending:
+        o = pending.pop()
+        if isinstance(o, str):
+            size += _get_json_str_size(o)
+        elif o is None or o is True:
+            size += 4
+        elif o is False:
+            size += 5
+        elif isinstance(o, int):
+            size += len(int.__repr__(o))
+        elif isinstance(o, float):
+            size += len(_get_json_float_repr(o))
+        elif isinstance(o, dict):
+            # braces, one colon per item and commas between items
+            size += 2 + len(o) + max(len(o) - 1, 0)
+            for key, value in o.items():
+                size += _get_json_key_size(key)
+                pending.append(value)
+        elif isinstance(o, (list, tuple)):
+            size += 2 + max(len(o) - 1, 0)
+            pending.extend(o)
+        else:
+            raise TypeError(
+                f"Object of type {type(o).__name__} is not JSON serializable")
+    return size
+
+
+def _get_json_str_size(s):
+    encoded = encode_basestring(s)
+    if encoded.isascii():
+        return len(encoded)
+    return len(encoded.encode('utf-8', 'surrogatepass'))
+
+
+def _get_json_float_repr(f):
+    if f != f:
+        return 'NaN'
+    if f == float('inf'):
+        return 'Infinity'
+    if f == -float('inf'):
+        return '-Infinity'
+    return float.__repr__(f)
+
+
+def _get_json_key_size(key):
+    """JSON object keys are always serialized as strings."""
+    if isinstance(key, str):
+        return _get_json_str_size(key)
+    if key is None or key is True:
+        return 6
+    if key is False:
+        return 7
+    if isinstance(key, int):
+        return len(int.__repr__(key)) + 2
+    if isinstance(key, float):
+        return len(_get_json_float_repr(key)) + 2
+    raise TypeError(
+        f"keys must be str, int, float, bool or None, "
+        f"not {type(key).__name__}")
+
+
+def get_json_hash(obj):
+    """
+    Returns the SHA-256 hex digest of obj serialized as canonical JSON, i.e.
+    with sorted keys and no whitespace, so equal objects hash equally.
+    """
+    return sha256(json.dumps(
+        obj, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        .encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def get_json_preview(obj, length):
+    """
+    Returns the first length characters of obj serialized as JSON. Only as
+    much of obj is serialized as is needed.
+    """
+    preview = ''
+    for chunk in json.JSONEncoder(ensure_ascii=False).iterencode(obj):
+        preview += chunk
+        if len(preview) >= length:
+            break
+    return preview[:length]
+
+
+def get_json_key_count(obj):
+    """Returns the number of keys of a JSON object, or items of an array."""
+    if isinstance(obj, (dict, list)):
+        return len(obj)
+    return 0
 
 
 def kb_to_bytes(kb):
@@ -46,23 +129,25 @@ def bytes_to_kb(bt):
 
 
 # email
-def send_test_email(recipient):
+# get_*_email() build the messages that send_*_email() send, and that
+# django_jsonsaver.tasks queues to be sent in batches
+def get_test_email(recipient):
     subject = "Test Message"
     body = "Test message sent successfully!"
     sender = server_config.SERVER_EMAIL
     recipient = [recipient]
-    return send_mail(subject, body, sender, recipient)
+    return EmailMessage(subject, body, sender, recipient)
 
 
-def send_contact_us_email(name, from_email, message):
+def get_contact_us_email(name, from_email, message):
     subject = f"{server_config.PROJECT_NAME} Contact Form: Submitted by {name}"
     body = f"Name: {name}\nEmail: {from_email}\n\nMessage: {message}"
     sender = server_config.SERVER_EMAIL
     recipient = [server_config.CONTACT_FORM_EMAIL_RECIPIENT]
-    return send_mail(subject, body, sender, recipient)
+    return EmailMessage(subject, body, sender, recipient)
 
 
-def send_welcome_email(recipient, activation_code):
+def get_welcome_email(recipient, activation_code):
     subject = f"{server_config.PROJECT_NAME}: Activate your account"
     body = f"Welcome to {server_config.PROJECT_NAME}!\n\n" +\
         "Please visit the following link to activate your account:\n\n" +\
@@ -71,10 +156,10 @@ def send_welcome_email(recipient, activation_code):
                 'activation_code': activation_code})
     sender = server_config.SERVER_EMAIL
     recipient = [recipient]
-    return send_mail(subject, body, sender, recipient)
+    return EmailMessage(subject, body, sender, recipient)
 
 
-def send_email_update_email(recipient, activation_code):
+def get_email_update_email(recipient, activation_code):
     subject = f"{server_config.PROJECT_NAME}: Confirm your new email address"
     body = "Please visit the following link to confirm your " +\
         "new email address:\n\n" + server_config.BACKEND_SERVER_URL + \
@@ -82,14 +167,34 @@ def send_email_update_email(recipient, activation_code):
                 kwargs={'activation_code': activation_code})
     sender = server_config.SERVER_EMAIL
     recipient = [recipient]
-    return send_mail(subject, body, sender, recipient)
+    return EmailMessage(subject, body, sender, recipient)
 
 
-def send_user_username_recover_email(email, username):
+def get_user_username_recover_email(email, username):
     subject = f"{server_config.PROJECT_NAME}: Forgot your username?"
     body = f"Your username is '{username}'.\n\n" +\
         "You may login to your account here: " +\
         server_config.BACKEND_SERVER_URL + reverse('users:login')
     sender = server_config.SERVER_EMAIL
     recipient = [email]
-    return send_mail(subject, body, sender, recipient)
+    return EmailMessage(subject, body, sender, recipient)
+
+
+def send_test_email(recipient):
+    return get_test_email(recipient).send()
+
+
+def send_contact_us_email(name, from_email, message):
+    return get_contact_us_email(name, from_email, message).send()
+
+
+def send_welcome_email(recipient, activation_code):
+    return get_welcome_email(recipient, activation_code).send()
+
+
+def send_email_update_email(recipient, activation_code):
+    return get_email_update_email(recipient, activation_code).send()
+
+
+def send_user_username_recover_email(email, username):
+    return get_user_username_recover_email(email, username).send()
@@ -1,5 +1,7 @@
 import inspect
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from html import unescape
 
 from . import constants as c
@@ -28,6 +30,44 @@ class SetUpTestCaseMixin:
             self.response = self.get_response(test_url)
 
 
+class QueryBudgetTestCaseMixin(SetUpTestCaseMixin):
+    """
+    Fails a test when a request makes more database queries than its budget,
+    so that N+1 queries are caught when they are introduced.
+
+    The GET budgets of a test case are returned by get_query_budgets(), as a
+    dict of urls to their maximum number of queries, and are checked by
+    test_query_budgets(). Other requests are checked with
+    assertQueryBudget().
+    """
+
+    def get_query_budgets(self):
+        return {}
+
+    def assertQueryBudget(self, budget, test_url=None, method='get',
+                          **kwargs):
+        """
+        Makes a request to test_url, or self.test_url, and fails if it makes
+        more than budget queries. Returns the response.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(
+                test_url or self.test_url, **kwargs)
+        if len(queries) > budget:
+            self.fail(
+                f"{method.upper()} {test_url or self.test_url} made "
+                f"{len(queries)} queries, over its budget of {budget}:\n" +
+                "\n".join(f"{i}. {query['sql']}"
+                          for i, query in enumerate(queries, start=1)))
+        return response
+
+    def test_query_budgets(self):
+        for test_url, budget in self.get_query_budgets().items():
+            with self.subTest(test_url=test_url):
+                response = self.assertQueryBudget(budget, test_url)
+                self.assertLess(response.status_code, 400)
+
+
 def get_function_args(f):
     """Returns list of args used in a given function"""
     return list(inspect.signature(f).parameters.keys())
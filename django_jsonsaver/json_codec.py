@@ -0,0 +1,85 @@
+"""
+JSON encoding and decoding with orjson, when settings.JSON_CODEC is
+'orjson', or with the json module, when it is 'stdlib'.
+
+orjson cannot encode integers larger than 64 bits, and decodes them as
+floats, so documents that contain them are handled by the json module.
+"""
+import json
+
+from django.conf import settings
+
+try:
+    import orjson
+    # datetimes are passed to default(), so they are formatted as by json
+    ORJSON_DUMPS_OPTION = \
+        orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+except ImportError:
+    orjson = None
+
+# digit runs of this length may be integers that orjson cannot decode exactly.
+# They are found by mapping every digit to 0, which is much faster than a
+# regular expression.
+LARGE_INTEGER_DIGITS = b'0' * 20
+DIGITS_TABLE = bytes(ord('0') if chr(i) in '0123456789' else ord(' ')
+                     for i in range(256))
+
+
+def use_orjson():
+    return orjson is not None and settings.JSON_CODEC == 'orjson'
+
+
+def dumps(obj, default=None):
+    """
+    Returns obj serialized as compact UTF-8 JSON bytes. default is called
+    with objects that cannot otherwise be serialized.
+    """
+    if use_orjson():
+        try:
+            return orjson.dumps(
+                obj, default=default, option=ORJSON_DUMPS_OPTION)
+        except TypeError:
+            pass
+    return json.dumps(
+        obj, default=default, ensure_ascii=False,
+        separators=(',', ':')).encode('utf-8')
+
+
+def loads(s, parse_constant=None):
+    """
+    Returns the object deserialized from the JSON str or bytes s.
+    parse_constant is called with NaN, Infinity and -Infinity, which orjson
+    does not accept.
+    """
+    if use_orjson():
+        b = s.encode('utf-8', 'surrogatepass') if isinstance(s, str) else s
+        if LARGE_INTEGER_DIGITS not in b.translate(DIGITS_TABLE):
+            try:
+                return orjson.loads(b)
+            except orjson.JSONDecodeError:
+                # e.g. NaN, which the json module accepts
+                pass
+    return json.loads(s, parse_constant=parse_constant)
+
+
+class JSONEncoder(json.JSONEncoder):
+    """A JSONEncoder for JSONField(encoder=...) that uses orjson."""
+
+    def encode(self, o):
+        if use_orjson():
+            try:
+                return orjson.dumps(
+                    o, default=self.default, option=ORJSON_DUMPS_OPTION) \
+                    .decode('utf-8')
+            except TypeError:
+                pass
+        return super().encode(o)
+
+
+class JSONDecoder(json.JSONDecoder):
+    """A JSONDecoder for JSONField(decoder=...) that uses loads()."""
+
+    def decode(self, s, *args, **kwargs):
+        if use_orjson():
+            return loads(s)
+        return super().decode(s, *args, **kwargs)
@@ -0,0 +1,155 @@
+"""
+A Redis cache backend for Django's cache framework.
+
+Usage:
+    CACHES = {'default': {
+        'BACKEND': 'django_jsonsaver.redis_cache.RedisCache',
+        'LOCATION': 'redis://localhost:6379/1'}}
+"""
+import pickle
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from redis import Redis
+
+
+# scripts that only change a key if it still has a value, e.g. so that a lock
+# is only extended or released by its holder
+TOUCH_IF_EQUAL_SCRIPT = """
+if redis.call('get', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+if ARGV[2] == '' then
+    redis.call('persist', KEYS[1])
+else
+    redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 1
+"""
+DELETE_IF_EQUAL_SCRIPT = """
+if redis.call('get', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+return redis.call('del', KEYS[1])
+"""
+
+
+class RedisCache(BaseCache):
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, server, params):
+        super().__init__(params)
+        self._client = Redis.from_url(server)
+        self._touch_if_equal = \
+            self._client.register_script(TOUCH_IF_EQUAL_SCRIPT)
+        self._delete_if_equal = \
+            self._client.register_script(DELETE_IF_EQUAL_SCRIPT)
+
+    # integers are stored unpickled so that incr() can be done by redis
+    def _encode(self, value):
+        if type(value) is int:
+            return value
+        return pickle.dumps(value, self.pickle_protocol)
+
+    def _decode(self, value):
+        try:
+            return int(value)
+        except ValueError:
+            return pickle.loads(value)
+
+    def _get_expiry(self, timeout):
+        """Returns the key lifetime in milliseconds, or None for no expiry."""
+        if timeout == DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return None
+        return max(int(timeout * 1000), 0)
+
+    def _set(self, key, value, timeout, nx=False):
+        expiry = self._get_expiry(timeout)
+        if expiry == 0:
+            # a timeout of 0 expires the key immediately
+            if nx:
+                return False
+            self._client.delete(key)
+            return True
+        return bool(self._client.set(
+            key, self._encode(value), px=expiry, nx=nx))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return self._set(key, value, timeout, nx=True)
+
+    def get(self, key, default=None, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        value = self._client.get(key)
+        if value is None:
+            return default
+        return self._decode(value)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        self._set(key, value, timeout)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        expiry = self._get_expiry(timeout)
+        if expiry is None:
+            return bool(self._client.persist(key))
+        return bool(self._client.pexpire(key, expiry))
+
+    def touch_if_equal(self, key, value, timeout=DEFAULT_TIMEOUT,
+                       version=None):
+        """Atomically touches key if it has value. Returns if it did."""
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        expiry = self._get_expiry(timeout)
+        return bool(self._touch_if_equal(
+            keys=[key],
+            args=[self._encode(value), '' if expiry is None else expiry]))
+
+    def delete_if_equal(self, key, value, version=None):
+        """Atomically deletes key if it has value. Returns if it did."""
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return bool(self._delete_if_equal(
+            keys=[key], args=[self._encode(value)]))
+
+    def delete(self, key, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return bool(self._client.delete(key))
+
+    def delete_many(self, keys, version=None):
+        keys = [self.make_key(key, version=version) for key in keys]
+        for key in keys:
+            self.validate_key(key)
+        if keys:
+            self._client.delete(*keys)
+
+    def has_key(self, key, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return bool(self._client.exists(key))
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        if not self._client.exists(key):
+            raise ValueError("Key '%s' not found" % key)
+        return self._client.incrby(key, delta)
+
+    def clear(self):
+        if self.key_prefix:
+            keys = list(self._client.scan_iter(match=f'{self.key_prefix}:*'))
+            if keys:
+                self._client.delete(*keys)
+        else:
+            self._client.flushdb()
+
+    def close(self, **kwargs):
+        # the connection pool is reused between requests
+        pass
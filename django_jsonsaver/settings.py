@@ -1,6 +1,7 @@
 """Generated by 'django-admin startproject' using Django 3.1.6."""
 import sys
 
+from importlib.util import find_spec
 from pathlib import Path
 
 from django_jsonsaver import keys, server_config
@@ -78,6 +79,42 @@ elif server_config.USE_DATABASE == 'postgres':
             'HOST': 'localhost',
             'PORT': ''}}
 
+# cache
+REDIS_CACHE_URL = getattr(server_config, 'REDIS_CACHE_URL', None)
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_jsonsaver.redis_cache.RedisCache',
+            'LOCATION': REDIS_CACHE_URL},
+        'jsonstore_public': {
+            'BACKEND': 'django_jsonsaver.redis_cache.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+            'KEY_PREFIX': 'jsonstore_public',
+            'TIMEOUT': 60 * 5}}
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'jsonstore_public': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'jsonstore_public',
+            'TIMEOUT': 60 * 5,
+            'OPTIONS': {'MAX_ENTRIES': 1000}}}
+
+# public jsonstore responses larger than this many bytes are not cached
+JSONSTORE_PUBLIC_CACHE_MAX_ENTRY_SIZE = 256 * 1024
+
+# seconds for which the first page of a public profile's jsonstores is cached
+PUBLIC_PROFILE_CACHE_TIMEOUT = 60 * 5
+
+# seconds for which an API token's user is cached
+API_TOKEN_CACHE_TIMEOUT = 60 * 5
+
+# API responses of jsonstores with at least this much data are streamed
+JSONSTORE_STREAMING_MIN_DATA_SIZE = 256 * 1024
+# characters of data per chunk of a streamed response
+JSONSTORE_STREAMING_CHUNK_SIZE = 64 * 1024
+
 PV_PREFIX = 'django.contrib.auth.password_validation'
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': f'{PV_PREFIX}.UserAttributeSimilarityValidator'},
@@ -108,6 +145,21 @@ CELERY_RESULT_BACKEND = server_config.CELERY_RESULT_BACKEND
 CELERY_ACCEPT_CONTENT = ['application/json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
+CELERY_BEAT_SCHEDULE = {
+    'reconcile_all_jsonstores_data_size': {
+        'task': 'reconcile_all_jsonstores_data_size_task',
+        'schedule': 60 * 60,
+    },
+    'reconcile_jsonstore_count': {
+        'task': 'reconcile_jsonstore_count_task',
+        'schedule': 60 * 60,
+    },
+    # sends the emails that were queued while another dispatcher was done
+    'dispatch_pending_emails': {
+        'task': 'dispatch_pending_emails_task',
+        'schedule': 60,
+    },
+}
 
 # corsheaders
 CORS_ALLOW_ALL_ORIGINS = server_config.CORS_ALLOW_ALL_ORIGINS
@@ -134,6 +186,26 @@ AWS_SES_REGION_ENDPOINT = 'email.us-east-2.amazonaws.com'
 EMAIL_HOST_USER = keys.EMAIL_HOST_USER
 EMAIL_HOST_PASSWORD = keys.EMAIL_HOST_PASSWORD
 
+# pending emails are sent in batches of EMAIL_DISPATCH_BATCH_SIZE, at up to
+# EMAIL_DISPATCH_RATE emails per second, by one dispatcher at a time. A
+# dispatcher that stops without releasing its lock holds it for
+# EMAIL_DISPATCH_LOCK_TIMEOUT seconds.
+EMAIL_DISPATCH_BATCH_SIZE = 50
+EMAIL_DISPATCH_RATE = getattr(server_config, 'EMAIL_DISPATCH_RATE', 14)
+EMAIL_DISPATCH_LOCK_TIMEOUT = 60 * 5
+
+# json codec of the API and of JsonStore.data, 'orjson' or 'stdlib'. orjson
+# is only used if it is installed.
+JSON_CODEC = getattr(server_config, 'JSON_CODEC', 'orjson')
+if JSON_CODEC == 'orjson' and not find_spec('orjson'):
+    JSON_CODEC = 'stdlib'
+if JSON_CODEC == 'orjson':
+    API_JSON_PARSER = 'api.parsers.OrjsonParser'
+    API_JSON_RENDERER = 'api.renderers.OrjsonRenderer'
+else:
+    API_JSON_PARSER = 'rest_framework.parsers.JSONParser'
+    API_JSON_RENDERER = 'rest_framework.renderers.JSONRenderer'
+
 # rest_framework
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
@@ -141,21 +213,32 @@ REST_FRAMEWORK = {
         ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.CachedTokenAuthentication',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        API_JSON_PARSER,
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        API_JSON_RENDERER,
         'rest_framework.renderers.BrowsableAPIRenderer'
     ] if server_config.BROWSABLE_API else [
-        'rest_framework.renderers.JSONRenderer'
+        API_JSON_RENDERER
     ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'api.throttling.AnonRateThrottle',
+        'api.throttling.UserRateThrottle',
+        'api.throttling.ScopedRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': server_config.THROTTLE_RATE_ANON,
         'user': server_config.THROTTLE_RATE_USER,
+        # the views' throttle_scope
+        'jsonstore_bulk': getattr(
+            server_config, 'THROTTLE_RATE_JSONSTORE_BULK', '100/minute'),
+        'jsonstore_public': getattr(
+            server_config, 'THROTTLE_RATE_JSONSTORE_PUBLIC', '1000/minute'),
     },
     'TEST_REQUEST_DEFAULT_FORMAT': 'json',
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
@@ -1,36 +1,202 @@
+from time import perf_counter, sleep
+from uuid import uuid4
+
 from celery.decorators import task
 from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import get_connection
 
 from django_jsonsaver import helpers as h
+from users.models import PendingEmail, Profile
 
 logger = get_task_logger(__name__)
 
+# held by the dispatcher that is sending the pending emails, with a token
+# that is unique to it
+EMAIL_DISPATCH_LOCK_CACHE_KEY = 'email_dispatch_lock'
+
+
+def touch_email_dispatch_lock(lock_token):
+    """
+    Extends the email dispatch lock by its timeout if lock_token holds it,
+    and returns whether it does. Caches that can, e.g. RedisCache, compare
+    and touch in one step, so that a lock that another dispatcher has taken
+    meanwhile is not extended.
+    """
+    timeout = settings.EMAIL_DISPATCH_LOCK_TIMEOUT
+    if hasattr(cache, 'touch_if_equal'):
+        return cache.touch_if_equal(
+            EMAIL_DISPATCH_LOCK_CACHE_KEY, lock_token, timeout)
+    return cache.get(EMAIL_DISPATCH_LOCK_CACHE_KEY) == lock_token and \
+        cache.touch(EMAIL_DISPATCH_LOCK_CACHE_KEY, timeout)
+
+
+def release_email_dispatch_lock(lock_token):
+    """Releases the email dispatch lock if lock_token holds it."""
+    if hasattr(cache, 'delete_if_equal'):
+        cache.delete_if_equal(EMAIL_DISPATCH_LOCK_CACHE_KEY, lock_token)
+    elif cache.get(EMAIL_DISPATCH_LOCK_CACHE_KEY) == lock_token:
+        cache.delete(EMAIL_DISPATCH_LOCK_CACHE_KEY)
+
+
+class EmailMessageBatch:
+    """
+    The messages of a batch of pending emails, which counts the messages
+    that the email backend has taken to send. Backends send the messages in
+    order and stop at the first that fails, so the messages before it have
+    been sent.
+    """
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.taken_count = 0
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __iter__(self):
+        for message in self.messages:
+            self.taken_count += 1
+            yield message
+
+
+def send_pending_emails(connection, pending_emails):
+    """
+    Sends pending emails with one send_messages() call over connection, and
+    deletes those that were sent. Returns the number sent, and the exception
+    that stopped the sending, if any, so that the caller can raise it once
+    the emails that were sent are deleted and are not sent again.
+    """
+    messages = EmailMessageBatch([
+        pending_email.get_message(connection)
+        for pending_email in pending_emails])
+    error = None
+    try:
+        connection.send_messages(messages)
+        sent_count = len(messages)
+    except Exception as e:
+        error = e
+        # the message that failed is the last that was taken
+        sent_count = max(messages.taken_count - 1, 0)
+    PendingEmail.objects.filter(pk__in=[
+        pending_email.pk for pending_email in pending_emails[:sent_count]]) \
+        .delete()
+    return sent_count, error
+
+
+def dispatch_pending_emails(batch_size=None, rate=None, sleep=sleep):
+    """
+    Sends the pending emails, oldest first, in batches of batch_size over
+    one connection, at up to rate emails per second. Only one dispatcher
+    sends at a time; the others return at once, since its next batch has
+    their emails. Returns a list with the count, seconds and emails per
+    second of each batch.
+    """
+    batch_size = batch_size or settings.EMAIL_DISPATCH_BATCH_SIZE
+    rate = rate or settings.EMAIL_DISPATCH_RATE
+    lock_token = uuid4().hex
+    if not cache.add(EMAIL_DISPATCH_LOCK_CACHE_KEY, lock_token,
+                     settings.EMAIL_DISPATCH_LOCK_TIMEOUT):
+        return []
+
+    batches = []
+    try:
+        with get_connection() as connection:
+            # the lock lasts for another timeout from each batch on. A
+            # dispatcher whose lock has expired leaves the rest to the
+            # dispatcher that has taken it.
+            while touch_email_dispatch_lock(lock_token):
+                started_at = perf_counter()
+                # the lock keeps the other dispatchers from sending the
+                # batch, so its rows are not locked while it is sent
+                pending_emails = list(
+                    PendingEmail.objects.order_by('pk')[:batch_size])
+                if not pending_emails:
+                    break
+                # the emails that are not sent are kept, and sent again by
+                # the next dispatcher
+                sent_count, error = send_pending_emails(
+                    connection, pending_emails)
+                seconds = perf_counter() - started_at
+                batch = {
+                    'count': sent_count,
+                    'seconds': seconds,
+                    'per_second': sent_count / seconds if seconds else None}
+                batches.append(batch)
+                logger.info(
+                    f"Sent a batch of {batch['count']} emails in "
+                    f"{batch['seconds']:.2f}s")
+                if error is not None:
+                    raise error
+                if len(pending_emails) < batch_size:
+                    break
+                # each batch takes as long as the rate allows
+                sleep(max(sent_count / rate - seconds, 0))
+    finally:
+        release_email_dispatch_lock(lock_token)
+    return batches
+
+
+@task(name="dispatch_pending_emails_task")
+def dispatch_pending_emails_task():
+    batches = dispatch_pending_emails()
+    logger.info(
+        f"Sent {sum(batch['count'] for batch in batches)} pending emails in "
+        f"{len(batches)} batches")
+    return batches
+
+
+def queue_email(message):
+    """
+    Queues message and has a worker dispatch the pending emails, so that the
+    task that queues it does not wait for the backlog to be sent.
+    """
+    PendingEmail.queue(message)
+    dispatch_pending_emails_task.delay()
+
 
 @task(name="send_test_email_task")
 def send_test_email_task(email):
-    logger.info(f'Sent test email to {email}')
-    return h.send_test_email(email)
+    queue_email(h.get_test_email(email))
+    logger.info(f'Queued test email to {email}')
 
 
 @task(name="send_contact_us_email_task")
 def send_contact_us_email_task(name, email, message):
-    logger.info(f'Sent contact_us email from {name}')
-    return h.send_contact_us_email(name, email, message)
+    queue_email(h.get_contact_us_email(name, email, message))
+    logger.info(f'Queued contact_us email from {name}')
 
 
 @task(name="send_welcome_email_task")
 def send_welcome_email_task(email, activation_code):
-    logger.info(f'Sent welcome email to {email}')
-    return h.send_welcome_email(email, activation_code)
+    queue_email(h.get_welcome_email(email, activation_code))
+    logger.info(f'Queued welcome email to {email}')
 
 
 @task(name="send_email_update_email_task")
 def send_email_update_email_task(email, activation_code):
-    logger.info(f'Sent email_update email to {email}')
-    return h.send_email_update_email(email, activation_code)
+    queue_email(h.get_email_update_email(email, activation_code))
+    logger.info(f'Queued email_update email to {email}')
 
 
 @task(name="send_user_username_recover_email_task")
 def send_user_username_recover_email_task(email, username):
-    logger.info(f'Sent user_username_recover email to {email}')
-    return h.send_user_username_recover_email(email, username)
+    queue_email(h.get_user_username_recover_email(email, username))
+    logger.info(f'Queued user_username_recover email to {email}')
+
+
+@task(name="reconcile_all_jsonstores_data_size_task")
+def reconcile_all_jsonstores_data_size_task():
+    reconciled_profile_count = Profile.reconcile_all_jsonstores_data_size()
+    logger.info(
+        f'Reconciled storage usage of {reconciled_profile_count} profiles')
+    return reconciled_profile_count
+
+
+@task(name="reconcile_jsonstore_count_task")
+def reconcile_jsonstore_count_task():
+    reconciled_profile_count = Profile.reconcile_jsonstore_count()
+    logger.info(
+        f'Reconciled jsonstore count of {reconciled_profile_count} profiles')
+    return reconciled_profile_count
@@ -1,3 +1,5 @@
+import json
+
 from django.core import mail
 from django.test import SimpleTestCase, TestCase
 from django.urls import reverse
@@ -53,6 +55,75 @@ class BytesToKbTest(SimpleTestCase):
         self.assertEqual(h.bytes_to_kb(0.5), 1)
 
 
+class GetJsonSizeTest(SimpleTestCase):
+    def get_expected_size(self, obj):
+        return len(json.dumps(
+            obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+
+    def test_non_serializable_value_raises_typeerror(self):
+        with self.assertRaises(TypeError):
+            h.get_json_size({'key': object()})
+
+    def test_scalars_return_serialized_size(self):
+        for obj in [None, True, False, 0, -15, 3.14, 1e100, '', 'text']:
+            self.assertEqual(h.get_json_size(obj), self.get_expected_size(obj))
+
+    def test_escaped_and_non_ascii_strings_return_utf8_size(self):
+        for obj in ['line\nbreak', 'quote"\\', '\x01', 'héllo', '✓ 😀']:
+            self.assertEqual(h.get_json_size(obj), self.get_expected_size(obj))
+
+    def test_non_string_keys_are_measured_as_strings(self):
+        obj = {1: 'a', 2.5: 'b', None: 'c', False: 'd'}
+        self.assertEqual(h.get_json_size(obj), self.get_expected_size(obj))
+
+    def test_nested_containers_return_serialized_size(self):
+        obj = {'message': c.TEST_JSONSTORE_DATA,
+               'items': [1, [], {}, [{'a': None}], 'x' * 1000],
+               'tuple': (1, 2)}
+        self.assertEqual(h.get_json_size(obj), self.get_expected_size(obj))
+
+    def test_empty_containers(self):
+        self.assertEqual(h.get_json_size({}), 2)
+        self.assertEqual(h.get_json_size([]), 2)
+
+
+class GetJsonHashTest(SimpleTestCase):
+    def test_returns_sha256_hex_digest(self):
+        self.assertRegex(h.get_json_hash({}), r'^[0-9a-f]{64}$')
+
+    def test_key_order_does_not_change_hash(self):
+        self.assertEqual(
+            h.get_json_hash({'a': 1, 'b': [1, 2]}),
+            h.get_json_hash({'b': [1, 2], 'a': 1}))
+
+    def test_different_values_return_different_hashes(self):
+        self.assertNotEqual(
+            h.get_json_hash({'a': 1}), h.get_json_hash({'a': '1'}))
+        self.assertNotEqual(
+            h.get_json_hash([1, 2]), h.get_json_hash([2, 1]))
+
+
+class GetJsonPreviewTest(SimpleTestCase):
+    def test_short_value_returns_its_json(self):
+        self.assertEqual(
+            h.get_json_preview({'a': [1, 'é']}, 100), '{"a": [1, "é"]}')
+
+    def test_long_value_is_truncated(self):
+        self.assertEqual(
+            h.get_json_preview({'a': 'x' * 1000}, 10), '{"a": "xxx')
+
+
+class GetJsonKeyCountTest(SimpleTestCase):
+    def test_returns_object_key_count(self):
+        self.assertEqual(h.get_json_key_count({'a': 1, 'b': {'c': 2}}), 2)
+
+    def test_returns_array_item_count(self):
+        self.assertEqual(h.get_json_key_count([1, [2, 3]]), 2)
+
+    def test_scalars_return_0(self):
+        self.assertEqual(h.get_json_key_count('abc'), 0)
+
+
 class SendEmailFunctionsTest(TestCase):
     def test_send_test_email(self):
         recipient = 'test@email.com'
@@ -143,3 +214,8 @@ class SendEmailFunctionsTest(TestCase):
             sc.BACKEND_SERVER_URL + reverse('users:login'))
         self.assertEqual(test_email.from_email, sc.SERVER_EMAIL)
         self.assertEqual(test_email.to, [recipient])
+
+    def test_get_email_functions_do_not_send(self):
+        test_email = h.get_test_email(c.TEST_USER_EMAIL)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(test_email.to, [c.TEST_USER_EMAIL])
@@ -1,8 +1,9 @@
 from django.contrib.auth.decorators import login_required
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
 from unittest.mock import Mock
 
-from . import helpers_testing as ht
+from . import factories as f, helpers_testing as ht
 
 
 class SetUpTestCaseMixinTest(SimpleTestCase):
@@ -72,6 +73,36 @@ class SetUpTestCaseMixinTest(SimpleTestCase):
         self.assertEqual(self.client_logged_out, 'ok')
 
 
+class QueryBudgetTestCaseMixinTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_jsonstore = f.JsonStoreFactory(is_public=True)
+        cls.test_url = reverse('stores:jsonstore_detail_public', kwargs={
+            'jsonstore_name': cls.test_jsonstore.name})
+
+    # METHODS #
+
+    # get_query_budgets()
+    def test_method_get_query_budgets(self):
+        self.assertEqual(
+            ht.QueryBudgetTestCaseMixin.get_query_budgets(self), {})
+
+    # assertQueryBudget()
+    def test_method_assertQueryBudget_within_budget(self):
+        response = ht.QueryBudgetTestCaseMixin.assertQueryBudget(self, 10)
+        self.assertEqual(response.status_code, 200)
+
+    def test_method_assertQueryBudget_over_budget(self):
+        with self.assertRaises(AssertionError) as cm:
+            ht.QueryBudgetTestCaseMixin.assertQueryBudget(
+                self, 0, self.test_url, method='get')
+        message = str(cm.exception)
+        self.assertIn(f"GET {self.test_url} made", message)
+        self.assertIn("over its budget of 0", message)
+        # the queries are listed
+        self.assertIn('1. SELECT', message)
+
+
 class GetFunctionArgsTest(SimpleTestCase):
     def test_get_function_args(self):
 
@@ -0,0 +1,79 @@
+import json
+
+from datetime import datetime
+from django.test import SimpleTestCase, override_settings
+from math import isnan
+from unittest import skipUnless
+
+from . import json_codec
+
+
+@skipUnless(json_codec.orjson, "orjson is not installed")
+@override_settings(JSON_CODEC='orjson')
+class OrjsonCodecTest(SimpleTestCase):
+    def test_use_orjson(self):
+        self.assertTrue(json_codec.use_orjson())
+        with override_settings(JSON_CODEC='stdlib'):
+            self.assertFalse(json_codec.use_orjson())
+
+    def test_dumps_returns_compact_utf8_bytes(self):
+        self.assertEqual(
+            json_codec.dumps({'a': [1, None], 1: 'é'}),
+            '{"a":[1,null],"1":"é"}'.encode())
+
+    def test_dumps_passes_datetimes_to_default(self):
+        self.assertEqual(
+            json_codec.dumps(
+                {'a': datetime(2021, 3, 1)}, default=lambda o: 'default'),
+            b'{"a":"default"}')
+
+    def test_dumps_large_integers(self):
+        self.assertEqual(json_codec.dumps([2 ** 70]), b'[%d]' % 2 ** 70)
+
+    def test_loads(self):
+        self.assertEqual(
+            json_codec.loads('{"a": [1, 1.5, "é"]}'), {'a': [1, 1.5, 'é']})
+        self.assertEqual(json_codec.loads(b'[true]'), [True])
+
+    def test_loads_large_integers_exactly(self):
+        self.assertEqual(json_codec.loads(b'[%d]' % 2 ** 70), [2 ** 70])
+
+    def test_loads_constants_with_parse_constant(self):
+        self.assertEqual(
+            json_codec.loads('[NaN]', parse_constant=lambda c: c), ['NaN'])
+
+    def test_json_encoder(self):
+        self.assertEqual(
+            json_codec.JSONEncoder().encode({'a': 1, 'b': 'é'}),
+            '{"a":1,"b":"é"}')
+
+    def test_json_encoder_large_integers(self):
+        self.assertEqual(
+            json.loads(json_codec.JSONEncoder().encode({'a': 2 ** 70})),
+            {'a': 2 ** 70})
+
+    def test_json_encoder_raises_typeerror_for_unsupported_types(self):
+        with self.assertRaises(TypeError):
+            json_codec.JSONEncoder().encode({'a': datetime(2021, 3, 1)})
+
+    def test_json_decoder(self):
+        self.assertEqual(
+            json_codec.JSONDecoder().decode('{"a": [1, "é"]}'),
+            {'a': [1, 'é']})
+
+
+@override_settings(JSON_CODEC='stdlib')
+class StdlibCodecTest(SimpleTestCase):
+    def test_dumps_returns_compact_utf8_bytes(self):
+        self.assertEqual(
+            json_codec.dumps({'a': [1, None], 1: 'é'}),
+            '{"a":[1,null],"1":"é"}'.encode())
+
+    def test_loads(self):
+        self.assertEqual(json_codec.loads('{"a": [1, "é"]}'), {'a': [1, 'é']})
+        self.assertTrue(isnan(json_codec.loads('[NaN]')[0]))
+
+    def test_json_encoder(self):
+        self.assertEqual(
+            json_codec.JSONEncoder().encode({'a': 'é'}),
+            '{"a": "\\u00e9"}')
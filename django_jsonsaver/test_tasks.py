@@ -0,0 +1,148 @@
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+
+from . import constants as c, helpers as h, tasks
+from users.models import PendingEmail
+
+
+class FailingEmailBackend(EmailBackend):
+    """
+    Sends the messages in order, as the SMTP backend does, and fails at the
+    first email to fail@email.com.
+    """
+
+    def send_messages(self, messages):
+        sent_count = 0
+        for message in messages:
+            if 'fail@email.com' in message.to:
+                raise ConnectionError('fail@email.com')
+            sent_count += super().send_messages([message])
+        return sent_count
+
+
+class DispatchPendingEmailsTest(TestCase):
+    def setUp(self):
+        cache.delete(tasks.EMAIL_DISPATCH_LOCK_CACHE_KEY)
+        self.sleeps = []
+
+    # METHODS #
+    def queue_emails(self, count):
+        for i in range(count):
+            PendingEmail.queue(h.get_test_email(f'test{i}@email.com'))
+
+    def dispatch(self, batch_size=2, rate=1):
+        return tasks.dispatch_pending_emails(
+            batch_size, rate, sleep=self.sleeps.append)
+
+    # TESTS #
+    def test_pending_emails_are_sent_in_batches_oldest_first(self):
+        self.queue_emails(5)
+        batches = self.dispatch()
+        self.assertEqual([batch['count'] for batch in batches], [2, 2, 1])
+        self.assertEqual(
+            [email.to for email in mail.outbox],
+            [[f'test{i}@email.com'] for i in range(5)])
+        self.assertFalse(PendingEmail.objects.exists())
+
+    def test_batches_are_sent_over_one_connection(self):
+        self.queue_emails(3)
+        self.dispatch()
+        self.assertEqual(
+            len({id(email.connection) for email in mail.outbox}), 1)
+
+    def test_each_batch_is_sent_with_one_call(self):
+        self.queue_emails(5)
+        with mock.patch.object(
+                EmailBackend, 'send_messages', autospec=True,
+                side_effect=EmailBackend.send_messages) as send_messages:
+            self.dispatch()
+        self.assertEqual(
+            [len(call.args[1]) for call in send_messages.call_args_list],
+            [2, 2, 1])
+
+    def test_batches_are_shaped_to_the_rate(self):
+        self.queue_emails(5)
+        batches = self.dispatch()
+        # two emails at one email per second, less the time spent sending
+        self.assertEqual(len(self.sleeps), 2)
+        for batch, seconds in zip(batches, self.sleeps):
+            self.assertAlmostEqual(batch['seconds'] + seconds, 2)
+
+    def test_batches_report_throughput(self):
+        self.queue_emails(1)
+        batch, = self.dispatch()
+        self.assertAlmostEqual(
+            batch['per_second'], batch['count'] / batch['seconds'])
+
+    def test_no_pending_emails(self):
+        self.assertEqual(self.dispatch(), [])
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_one_dispatcher_sends_at_a_time(self):
+        self.queue_emails(1)
+        cache.add(tasks.EMAIL_DISPATCH_LOCK_CACHE_KEY, True)
+        self.assertEqual(self.dispatch(), [])
+        self.assertEqual(PendingEmail.objects.count(), 1)
+
+        cache.delete(tasks.EMAIL_DISPATCH_LOCK_CACHE_KEY)
+        self.dispatch()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIsNone(cache.get(tasks.EMAIL_DISPATCH_LOCK_CACHE_KEY))
+
+    def test_lock_is_touched_atomically_where_the_cache_can(self):
+        self.queue_emails(1)
+        with mock.patch.object(tasks, 'cache') as lock_cache:
+            # e.g. RedisCache, and another dispatcher has taken the lock
+            lock_cache.touch_if_equal.return_value = False
+            self.assertEqual(self.dispatch(), [])
+        lock_cache.touch.assert_not_called()
+        lock_cache.delete_if_equal.assert_called_once_with(
+            tasks.EMAIL_DISPATCH_LOCK_CACHE_KEY, mock.ANY)
+        self.assertEqual(PendingEmail.objects.count(), 1)
+
+    @override_settings(EMAIL_DISPATCH_BATCH_SIZE=2)
+    def test_dispatch_pending_emails_task(self):
+        self.queue_emails(2)
+        batches = tasks.dispatch_pending_emails_task()
+        self.assertEqual([batch['count'] for batch in batches], [2])
+
+    @mock.patch.object(tasks.dispatch_pending_emails_task, 'delay')
+    def test_send_email_tasks_queue_and_trigger_dispatch(self, delay):
+        tasks.send_welcome_email_task(c.TEST_USER_EMAIL, 'test')
+        # the email is sent by the dispatch task, not by this one
+        self.assertEqual(len(mail.outbox), 0)
+        delay.assert_called_once_with()
+        self.assertEqual(
+            PendingEmail.objects.get().body,
+            h.get_welcome_email(c.TEST_USER_EMAIL, 'test').body)
+
+    @override_settings(
+        EMAIL_BACKEND='django_jsonsaver.test_tasks.FailingEmailBackend')
+    def test_emails_sent_before_a_failure_are_not_sent_again(self):
+        self.queue_emails(1)
+        PendingEmail.queue(h.get_test_email('fail@email.com'))
+        self.queue_emails(1)
+        with self.assertRaises(ConnectionError):
+            self.dispatch(batch_size=3)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(
+            list(PendingEmail.objects.values_list('to', flat=True)),
+            [['fail@email.com'], ['test0@email.com']])
+        self.assertIsNone(cache.get(tasks.EMAIL_DISPATCH_LOCK_CACHE_KEY))
+
+    def test_expired_lock_of_other_dispatcher_is_kept(self):
+        self.queue_emails(5)
+
+        def sleep(seconds):
+            # the lock expires and another dispatcher takes it
+            cache.set(tasks.EMAIL_DISPATCH_LOCK_CACHE_KEY, 'other')
+
+        batches = tasks.dispatch_pending_emails(2, 1, sleep=sleep)
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(PendingEmail.objects.count(), 3)
+        self.assertEqual(
+            cache.get(tasks.EMAIL_DISPATCH_LOCK_CACHE_KEY), 'other')
@@ -4,7 +4,8 @@ from django.urls import reverse
 from html import unescape
 
 from . import constants as c, factories as f, server_config as sc
-from . import views
+from . import helpers_testing as ht
+from . import tasks, views
 
 
 class ProjectRootTemplateViewTest(TestCase):
@@ -107,7 +108,9 @@ class ContactUsFormViewTest(TestCase):
         self.response = self.client.post(
             self.test_url, valid_contact_form_data)
 
-        # contact_us email has been sent
+        # contact_us email has been queued, and is sent by the dispatcher
+        self.assertEqual(len(mail.outbox), 0)
+        tasks.dispatch_pending_emails()
         self.assertEqual(len(mail.outbox), 1)
         self.assertIn(
             f"{sc.PROJECT_NAME} Contact Form", mail.outbox[0].subject)
@@ -243,3 +246,19 @@ class PrivacyPolicyTemplateViewTest(TestCase):
             username=self.test_user.username, password=c.TEST_USER_PASSWORD))
         self.assertEqual(self.response.status_code, 200)
         self.assertTemplateUsed(self.response, self.view.template_name)
+
+
+class ProjectViewQueryBudgetTest(ht.QueryBudgetTestCaseMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+        cls.test_url = reverse('project_root')
+
+    def get_query_budgets(self):
+        return {
+            reverse('project_root'): 2,
+            reverse('contact_us'): 3,
+            reverse('faq'): 2,
+            reverse('privacy_policy'): 2,
+            reverse('terms_of_use'): 2,
+        }
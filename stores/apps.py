@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class StoresConfig(AppConfig):
     name = 'stores'
+
+    def ready(self):
+        import stores.signals
@@ -0,0 +1,266 @@
+"""
+Batches of jsonstore create, update and delete operations.
+
+A batch is validated as a whole, against a single reading of the user's
+quotas, and is then applied in one transaction with one query per kind of
+operation. Either every operation is applied or none is.
+"""
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from . import cache, validation
+from .models import JsonStore
+from django_jsonsaver import constants as c, helpers as h
+from users.models import Profile
+
+CREATE = 'create'
+UPDATE = 'update'
+DELETE = 'delete'
+
+BULK_OPERATIONS = [CREATE, UPDATE, DELETE]
+
+# the fields that an update operation may change
+UPDATE_FIELDS = ['name', 'data', 'is_public']
+
+
+class BulkOperationError(Exception):
+    """
+    Raised when a batch is invalid. errors is a list with, for each
+    operation, a list of (field, error) tuples.
+    """
+
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def get_bulk_data_sizes(operations):
+    """
+    Returns a list with, for each operation, the size of the data that it
+    stores, or None if it stores none.
+    """
+    return [
+        h.get_json_size(operation.get('data', {}))
+        if operation['op'] == CREATE or
+        (operation['op'] == UPDATE and 'data' in operation) else None
+        for operation in operations]
+
+
+def get_bulk_validation_errors(user, operations, jsonstores, data_sizes):
+    """
+    Runs the jsonstore invalidators on every operation in a batch, as if the
+    batch's deletes were applied first, then its updates and then its
+    creates. jsonstores maps the pks of the user's jsonstores that are named
+    by the operations to those jsonstores, and data_sizes are the sizes
+    given by get_bulk_data_sizes(). Returns a list with, for each operation,
+    a list of (field, error) tuples.
+    """
+    errors = [[] for operation in operations]
+    profile = validation.get_jsonstore_validation_profile(user)
+
+    # the name, is_public and data size of each operation's result
+    targets = []
+    deleted_pks = set()
+    changed_pks = set()
+    for i, operation in enumerate(operations):
+        obj = jsonstores.get(operation.get('id'))
+        if operation['op'] != CREATE:
+            if obj is None:
+                errors[i].append((None, ValidationError(
+                    c.API_ERROR_JSONSTORE_BULK_NOT_FOUND,
+                    code='jsonstore_bulk_not_found')))
+            elif obj.pk in changed_pks:
+                errors[i].append((None, ValidationError(
+                    c.API_ERROR_JSONSTORE_BULK_DUPLICATE_ID,
+                    code='jsonstore_bulk_duplicate_id')))
+                obj = None
+            else:
+                changed_pks.add(obj.pk)
+            if obj is None or operation['op'] == DELETE:
+                if obj is not None:
+                    deleted_pks.add(obj.pk)
+                targets.append(None)
+                continue
+        name = operation.get('name', obj.name if obj else '') or ''
+        is_public = operation.get('is_public', obj.is_public if obj else False)
+        data_size = obj.data_size if data_sizes[i] is None \
+            else data_sizes[i]
+        targets.append((obj, name, is_public, data_size))
+
+    # the user's other jsonstores, and the other users' public jsonstores,
+    # that have the names used by the batch
+    names = {target[1] for target in targets if target and target[1]}
+    same_user_names = dict(JsonStore.objects
+                           .filter(user=user, name__in=names)
+                           .exclude(pk__in=deleted_pks)
+                           .values_list('name', 'pk'))
+    other_user_public_names = set(JsonStore.objects
+                                  .filter(name__in=names, is_public=True)
+                                  .exclude(user=user)
+                                  .values_list('name', flat=True))
+
+    # the jsonstore count and storage usage after the batch's deletes
+    user_jsonstore_count = profile.jsonstore_count - len(deleted_pks)
+    all_jsonstores_data_size = profile.get_all_jsonstores_data_size() - sum(
+        jsonstores[pk].data_size for pk in deleted_pks)
+
+    # updates are validated before creates, in the order they are applied
+    order = [i for i, target in enumerate(targets) if target and target[0]] \
+        + [i for i, target in enumerate(targets) if target and not target[0]]
+    for i in order:
+        obj, name, is_public, data_size = targets[i]
+        errors[i] += validation.get_jsonstore_name_format_errors(
+            name, is_public)
+
+        # user jsonstore count over max
+        if obj is None:
+            errors[i] += validation.get_jsonstore_count_errors(
+                user, user_jsonstore_count)
+
+        # a name is held by the jsonstore that had it, or else by the first
+        # operation in the batch that uses it
+        same_user_same_name_exists = \
+            same_user_names.get(name, obj.pk if obj else None) != \
+            (obj.pk if obj else None)
+        errors[i] += validation.get_jsonstore_duplicate_name_errors(
+            name, obj, is_public, same_user_same_name_exists,
+            name in other_user_public_names)
+
+        errors[i] += validation.get_jsonstore_data_size_errors(
+            user, obj, data_size, all_jsonstores_data_size)
+
+        if not errors[i]:
+            if name:
+                same_user_names.setdefault(
+                    name, obj.pk if obj else object())
+            if obj is None:
+                user_jsonstore_count += 1
+            all_jsonstores_data_size += \
+                data_size - (obj.data_size if obj else 0)
+
+    return errors
+
+
+def get_bulk_jsonstores(user, operations):
+    """
+    Locks and returns the user's jsonstores that are updated or deleted by
+    operations, as a dict of pks to jsonstores, without their data.
+    """
+    pks = [operation['id'] for operation in operations
+           if operation['op'] != CREATE]
+    # data is only loaded to be replaced, so it is not fetched
+    return JsonStore.objects.select_for_update() \
+        .filter(user=user, pk__in=pks).defer('data').in_bulk()
+
+
+def apply_bulk_operations(user, operations):
+    """
+    Validates and applies a batch of operations on the user's jsonstores.
+    Each operation is a dict with an 'op' of 'create', 'update' or 'delete',
+    the 'id' of the jsonstore to update or delete, and the 'name', 'data'
+    and 'is_public' to create or update it with.
+
+    Raises BulkOperationError if any operation is invalid. Returns a list
+    with, for each operation, the created or updated jsonstore, or the
+    deleted jsonstore's pk.
+    """
+    data_sizes = get_bulk_data_sizes(operations)
+    with transaction.atomic():
+        jsonstores = get_bulk_jsonstores(user, operations)
+        errors = get_bulk_validation_errors(
+            user, operations, jsonstores, data_sizes)
+        if any(errors):
+            raise BulkOperationError(errors)
+
+        # the batch's creates are counted before anything is written, and
+        # only if the count stays within the user's maximum once the batch's
+        # deletes are applied, so concurrent creates cannot go over it
+        create_count = sum(
+            operation['op'] == CREATE for operation in operations)
+        delete_count = sum(
+            operation['op'] == DELETE for operation in operations)
+        if create_count and not Profile.update_jsonstore_count(
+                user.id, create_count,
+                user.profile.get_max_jsonstore_count() + delete_count):
+            raise BulkOperationError(get_bulk_validation_errors(
+                user, operations, jsonstores, data_sizes))
+
+        try:
+            with transaction.atomic():
+                return _apply_bulk_operations(
+                    user, operations, jsonstores, data_sizes)
+        except IntegrityError:
+            # a concurrent write has taken one of the batch's names since it
+            # was validated
+            errors = get_bulk_validation_errors(
+                user, operations, get_bulk_jsonstores(user, operations),
+                data_sizes)
+            if not any(errors):
+                raise
+            raise BulkOperationError(errors)
+
+
+def _apply_bulk_operations(user, operations, jsonstores, data_sizes):
+    results = []
+    deleted_pks = []
+    new_jsonstores = []
+    # updated jsonstores, grouped by the fields that they update
+    updated_jsonstores = {}
+    cached_names = set()
+    size_delta = 0
+    now = timezone.now()
+    for operation, data_size in zip(operations, data_sizes):
+        if operation['op'] == DELETE:
+            deleted_pks.append(operation['id'])
+            results.append(operation['id'])
+            continue
+        if operation['op'] == CREATE:
+            jsonstore = JsonStore(user=user, updated_at=now, **{
+                field: operation[field]
+                for field in UPDATE_FIELDS if field in operation})
+            new_jsonstores.append(jsonstore)
+        else:
+            jsonstore = jsonstores[operation['id']]
+            cached_names.add(jsonstore.name)
+            fields = [field for field in UPDATE_FIELDS if field in operation]
+            for field in fields:
+                setattr(jsonstore, field, operation[field])
+            if 'data' in fields:
+                fields += JsonStore.data_metadata_fields
+            updated_jsonstores.setdefault(
+                tuple(fields + ['updated_at']), []).append(jsonstore)
+            jsonstore.updated_at = now
+        if data_size is not None:
+            size_delta -= jsonstore.data_size
+            jsonstore.refresh_data_metadata(data_size)
+            size_delta += jsonstore.data_size
+        cached_names.add(jsonstore.name)
+        results.append(jsonstore)
+
+    # the post_delete signal updates the storage usage counter and the cache
+    # for deleted jsonstores. Deletes come first, so that their names are
+    # free for the updates and creates.
+    if deleted_pks:
+        JsonStore.objects.filter(pk__in=deleted_pks).defer('data').delete()
+    for fields, group in updated_jsonstores.items():
+        JsonStore.objects.bulk_update(group, fields)
+    if new_jsonstores:
+        JsonStore.objects.bulk_create(new_jsonstores)
+        if not connection.features.can_return_rows_from_bulk_insert:
+            # e.g. SQLite, which serializes writes, so the user's newest rows
+            # are the ones just inserted
+            new_pks = JsonStore.objects.filter(user=user) \
+                .order_by('-pk').values_list('pk', flat=True)
+            for jsonstore, pk in zip(
+                    new_jsonstores, reversed(new_pks[:len(new_jsonstores)])):
+                jsonstore.pk = pk
+                jsonstore._state.adding = False
+
+    # QuerySet.update() and bulk_create() do not send the signals that keep
+    # these current. The creates have already been counted.
+    if size_delta:
+        Profile.update_all_jsonstores_data_size(user.id, size_delta)
+    cache.delete_cached_public_jsonstores(*cached_names)
+    cache.delete_cached_public_profiles(user.id)
+    return results
@@ -0,0 +1,71 @@
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.utils import make_template_fragment_key
+from django.db import transaction
+
+# the name of the cached fragment of public profile pages that lists the
+# user's public jsonstores, as written in users/user_detail_public.html
+PUBLIC_PROFILE_FRAGMENT_NAME = 'user_public_jsonstores'
+
+
+def get_public_jsonstore_cache():
+    return caches['jsonstore_public']
+
+
+def get_public_jsonstore_cache_key(name):
+    """Hashes the name, since names from URLs may not be valid cache keys."""
+    return md5(name.encode('utf-8')).hexdigest()
+
+
+def get_cached_public_jsonstore(name):
+    """
+    Returns the cached (content, data_hash, updated_at) of a public
+    jsonstore's response, or None.
+    """
+    return get_public_jsonstore_cache().get(
+        get_public_jsonstore_cache_key(name))
+
+
+def set_cached_public_jsonstore(name, content, data_hash, updated_at):
+    if len(content) <= settings.JSONSTORE_PUBLIC_CACHE_MAX_ENTRY_SIZE:
+        get_public_jsonstore_cache().set(
+            get_public_jsonstore_cache_key(name),
+            (content, data_hash, updated_at))
+
+
+def delete_cached_public_jsonstores(*names):
+    """
+    Removes the cached responses of the given names. They are removed again
+    once the current transaction commits, in case a concurrent request cached
+    the old row in the meantime.
+    """
+    keys = [get_public_jsonstore_cache_key(name) for name in names if name]
+    if keys:
+        get_public_jsonstore_cache().delete_many(keys)
+        transaction.on_commit(
+            lambda: get_public_jsonstore_cache().delete_many(keys))
+
+
+def get_public_profile_fragment_keys(user_id):
+    """
+    Returns the cache keys of the public jsonstore listing of a user's
+    public profile, as seen by the user and by everyone else.
+    """
+    return [make_template_fragment_key(
+        PUBLIC_PROFILE_FRAGMENT_NAME, [user_id, is_owner])
+        for is_owner in [True, False]]
+
+
+def delete_cached_public_profiles(*user_ids):
+    """
+    Removes the cached public jsonstore listings of the given users' public
+    profiles, now and once the current transaction commits.
+    """
+    keys = [key for user_id in user_ids
+            for key in get_public_profile_fragment_keys(user_id)]
+    if keys:
+        get_public_jsonstore_cache().delete_many(keys)
+        transaction.on_commit(
+            lambda: get_public_jsonstore_cache().delete_many(keys))
@@ -25,36 +25,33 @@ def jsonstore_forbidden_name_not_allowed(name):
 
 
 # user has too many jsonstores
-def jsonstore_user_jsonstore_count_over_max(user, user_max_jsonstore_count):
-    if user.jsonstore_set.count() >= user_max_jsonstore_count:
+def jsonstore_user_jsonstore_count_over_max(
+        user_jsonstore_count, user_max_jsonstore_count):
+    if user_jsonstore_count >= user_max_jsonstore_count:
         return True
 
 
 # jsonstore_name_duplicate_same_user_create
 def jsonstore_name_duplicate_same_user_create(
-        name, user, obj, stores_with_same_name):
+        name, obj, same_user_same_name_exists):
     if not obj:
-        if name and stores_with_same_name.filter(user=user).exists():
+        if name and same_user_same_name_exists:
             return True
 
 
 # jsonstore_name_duplicate_same_user_update
 def jsonstore_name_duplicate_same_user_update(
-        name, user, obj, stores_with_same_name):
+        name, obj, same_user_same_name_exists):
     if obj:
-        same_user_jsonstores_with_same_name = \
-            stores_with_same_name.filter(user=user).exclude(pk=obj.pk)
-        if name and same_user_jsonstores_with_same_name.exists():
+        if name and same_user_same_name_exists:
             return True
 
 
 # jsonstore_public_name_duplicate
 def jsonstore_public_name_duplicate(
-        name, is_public, user, stores_with_same_name):
+        is_public, other_user_public_same_name_exists):
     if is_public:
-        other_user_public_jsonstores_with_same_name = \
-            stores_with_same_name.exclude(user=user).filter(is_public=True)
-        if other_user_public_jsonstores_with_same_name.exists():
+        if other_user_public_same_name_exists:
             return True
 
 
@@ -65,8 +62,13 @@ def jsonstore_data_size_over_max(jsonstore_data, user, jsonstore_data_size):
 
 
 # jsonstore size will exceed user's total storage allowance
-def jsonstore_all_jsonstores_data_size_over_max(user, jsonstore_data_size):
-    if jsonstore_data_size + \
-            user.profile.get_all_jsonstores_data_size_in_kb() >=\
-            user.profile.get_max_jsonstore_all_jsonstores_data_size_in_kb():
+def jsonstore_all_jsonstores_data_size_over_max(
+        user, jsonstore_data_size, obj=None, all_jsonstores_data_size=None):
+    profile = user.profile
+    if all_jsonstores_data_size is None:
+        all_jsonstores_data_size = profile.get_all_jsonstores_data_size()
+    if obj:
+        jsonstore_data_size -= obj.data_size
+    if jsonstore_data_size + all_jsonstores_data_size >= \
+            profile.get_max_jsonstore_all_jsonstores_data_size():
         return True
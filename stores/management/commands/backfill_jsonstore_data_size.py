@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from django_jsonsaver import helpers as h
+from stores.models import JsonStore
+from users.models import Profile
+
+
+class Command(BaseCommand):
+    help = "Recomputes the stored data_size of every JSON store in batches, " \
+        "then the storage usage of the profiles whose JSON stores changed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Number of JSON stores to load and update per query.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_pk = 0
+        updated_count = 0
+        while True:
+            rows = list(
+                JsonStore.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', 'data', 'data_size')[:batch_size])
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+
+            # only write rows whose stored size is out of date
+            jsonstores = []
+            for pk, data, data_size in rows:
+                jsonstore_data_size = h.get_json_size(data)
+                if jsonstore_data_size != data_size:
+                    jsonstores.append(
+                        JsonStore(pk=pk, data_size=jsonstore_data_size))
+            JsonStore.objects.bulk_update(jsonstores, ['data_size'])
+            updated_count += len(jsonstores)
+
+        # bulk_update() does not send the signals that keep the profiles'
+        # storage usage current
+        reconciled_profile_count = \
+            Profile.reconcile_all_jsonstores_data_size()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Updated data_size of {updated_count} JSON store(s) and the "
+            f"storage usage of {reconciled_profile_count} profile(s)."))
@@ -0,0 +1,232 @@
+import json
+import math
+import random
+from time import perf_counter
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from django_jsonsaver import factories as f, helpers as h
+from stores.management.commands.benchmark_json_codec import \
+    get_benchmark_data
+from stores.models import JsonStore
+
+OPERATIONS = ['read', 'list', 'update', 'create', 'public_read']
+
+DEFAULT_MIX = 'read=40,list=20,update=15,create=10,public_read=15'
+
+
+def parse_mix(mix):
+    """
+    Parses a mix of operations, e.g. 'read=3,list=1', into a dict of
+    operations to their weights.
+    """
+    weights = {}
+    for item in mix.split(','):
+        operation, _, weight = item.partition('=')
+        if operation not in OPERATIONS or not weight.isdigit():
+            raise ValueError(item)
+        weights[operation] = int(weight)
+    if not any(weights.values()):
+        raise ValueError(mix)
+    return weights
+
+
+def get_benchmark_caches():
+    """
+    Returns the cache settings with a new local-memory cache in place of each
+    cache, so that the benchmark's entries, e.g. of its tokens, public JSON
+    stores and throttle counters, do not outlive its rolled back rows.
+    """
+    location = f'benchmark_api-{uuid4().hex}'
+    return {
+        alias: {
+            **config,
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': f'{location}-{alias}'}
+        for alias, config in settings.CACHES.items()}
+
+
+def get_percentile(values, percentile):
+    """Returns the nearest-rank percentile of a sorted list of values."""
+    rank = math.ceil(percentile / 100 * len(values))
+    return values[max(rank, 1) - 1]
+
+
+def get_summary(samples):
+    """
+    Returns the latency percentiles in ms, throughput and mean queries per
+    request of a list of (latency, query count, status code) samples.
+    """
+    latencies = sorted(latency for latency, _, _ in samples)
+    return {
+        'count': len(samples),
+        'errors': sum(status_code >= 400 for _, _, status_code in samples),
+        'p50_ms': get_percentile(latencies, 50) * 1000,
+        'p95_ms': get_percentile(latencies, 95) * 1000,
+        'p99_ms': get_percentile(latencies, 99) * 1000,
+        'requests_per_s': len(latencies) / sum(latencies),
+        'queries_per_request':
+            sum(query_count for _, query_count, _ in samples) / len(samples),
+    }
+
+
+class Command(BaseCommand):
+    help = "Seeds users and JSON stores with the test factories, then " \
+        "measures the latency, throughput and queries per request of a mix " \
+        "of requests to the store API. Everything runs in a transaction " \
+        "that is rolled back, with caches of its own, so the database and " \
+        "caches are left unchanged."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users', type=int, default=10,
+            help="Number of users to seed.")
+        parser.add_argument(
+            '--stores', type=int, default=5,
+            help="Number of JSON stores to seed per user.")
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[1],
+            help="JSON store data sizes, in KB. Seeded, created and updated "
+                 "JSON stores cycle through them.")
+        parser.add_argument(
+            '--requests', type=int, default=500,
+            help="Number of requests to make.")
+        parser.add_argument(
+            '--mix', default=DEFAULT_MIX,
+            help="Weights of the operations to make, as a comma-separated "
+                 f"list. Operations: {', '.join(OPERATIONS)}.")
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help="Seed of the random choice of operations and JSON stores.")
+        parser.add_argument(
+            '--output',
+            help="Path of a file to write the results to, as JSON.")
+
+    def seed(self, user_count, jsonstore_count, datas):
+        """
+        Creates the users, their tokens and their JSON stores. The first
+        JSON store of each user is public.
+        """
+        self.clients = []
+        self.jsonstores = []
+        self.public_names = []
+        for _ in range(user_count):
+            user = f.UserFactory()
+            token = f.TokenFactory(user=user, key=Token.generate_key())
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+            jsonstores = [
+                f.JsonStoreFactory(
+                    user=user, data=datas[i % len(datas)], is_public=i == 0)
+                for i in range(jsonstore_count)]
+            self.clients.append(client)
+            self.jsonstores.append([jsonstore.pk for jsonstore in jsonstores])
+            if jsonstores:
+                self.public_names.append(jsonstores[0].name)
+        self.anonymous_client = APIClient()
+
+    def request(self, operation, rng, data):
+        """Makes a request of operation and returns its response."""
+        i = rng.randrange(len(self.clients))
+        client = self.clients[i]
+        if operation == 'list':
+            return client.get(reverse('api:jsonstore-list'))
+        if operation == 'create':
+            return client.post(
+                reverse('api:jsonstore-list'), {'data': data}, format='json')
+        if operation == 'public_read':
+            return self.anonymous_client.get(reverse(
+                'api:jsonstore_detail_public',
+                kwargs={'jsonstore_name': rng.choice(self.public_names)}))
+        url = reverse('api:jsonstore-detail', kwargs={
+            'pk': rng.choice(self.jsonstores[i])})
+        if operation == 'update':
+            return client.patch(url, {'data': data}, format='json')
+        return client.get(url)
+
+    def run_benchmark(self, options, weights, datas):
+        rng = random.Random(options['seed'])
+        operations = list(weights)
+        samples = {operation: [] for operation in operations}
+        started_at = perf_counter()
+        for n in range(options['requests']):
+            operation = rng.choices(operations, list(weights.values()))[0]
+            with CaptureQueriesContext(connection) as queries:
+                start = perf_counter()
+                response = self.request(operation, rng, datas[n % len(datas)])
+                latency = perf_counter() - start
+            samples[operation].append(
+                (latency, len(queries), response.status_code))
+            if operation == 'create' and response.status_code == 201:
+                # keeps the users under their JSON store count quota
+                JsonStore.objects.filter(pk=response.data['id']).delete()
+        elapsed = perf_counter() - started_at
+        results = {
+            operation: get_summary(samples[operation])
+            for operation in operations if samples[operation]}
+        results['all'] = {
+            **get_summary([sample for operation in operations
+                           for sample in samples[operation]]),
+            # includes the time spent outside of the requests
+            'requests_per_s': options['requests'] / elapsed,
+        }
+        return results
+
+    def handle(self, *args, **options):
+        try:
+            weights = parse_mix(options['mix'])
+        except ValueError as e:
+            raise CommandError(f"Invalid --mix: {e}")
+        if options['users'] < 1 or options['stores'] < 1 or \
+                options['requests'] < 1:
+            raise CommandError(
+                "--users, --stores and --requests must be at least 1.")
+        datas = [get_benchmark_data(h.kb_to_bytes(size))
+                 for size in options['sizes']]
+
+        # the test client's host
+        with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+                CACHES=get_benchmark_caches()), \
+                transaction.atomic():
+            try:
+                self.seed(options['users'], options['stores'], datas)
+                results = self.run_benchmark(options, weights, datas)
+            finally:
+                transaction.set_rollback(True)
+                for alias in settings.CACHES:
+                    caches[alias].clear()
+
+        self.stdout.write(
+            f"{'operation':>12} {'count':>6} {'errors':>6} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'queries':>8}")
+        for operation, summary in results.items():
+            self.stdout.write(
+                f"{operation:>12} {summary['count']:>6} "
+                f"{summary['errors']:>6} {summary['p50_ms']:>8.2f} "
+                f"{summary['p95_ms']:>8.2f} {summary['p99_ms']:>8.2f} "
+                f"{summary['requests_per_s']:>8.1f} "
+                f"{summary['queries_per_request']:>8.1f}")
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump({
+                    'created_at': timezone.now().isoformat(),
+                    'database': connection.vendor,
+                    'options': {
+                        option: options[option] for option in [
+                            'users', 'stores', 'sizes', 'requests', 'mix',
+                            'seed']},
+                    'results': results,
+                }, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(
+                f"Wrote results to {options['output']}."))
@@ -0,0 +1,80 @@
+from io import BytesIO
+from timeit import Timer
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import OrjsonParser
+from api.renderers import OrjsonRenderer
+from django_jsonsaver import helpers as h, json_codec
+
+CODECS = {
+    'stdlib': (JSONParser, JSONRenderer),
+    'orjson': (OrjsonParser, OrjsonRenderer),
+}
+
+
+def get_benchmark_data(size):
+    """Returns typical JSON store data of at least size bytes."""
+    items = []
+    data = {'name': 'benchmark', 'version': 1, 'items': items}
+    data_size = h.get_json_size(data)
+    while data_size < size:
+        i = len(items)
+        item = {
+            'id': i,
+            'name': f'item-{i}',
+            'description': 'Lorem ipsum dolor sit amet, café ✓',
+            'is_active': i % 2 == 0,
+            'price': i * 1.25,
+            'tags': ['alpha', 'beta', str(i)],
+            'owner': {'id': i % 10, 'email': None}}
+        items.append(item)
+        data_size += h.get_json_size(item) + 1
+    return data
+
+
+class Command(BaseCommand):
+    help = "Measures the parse and render throughput of the API's JSON " \
+        "codecs for typical JSON store bodies."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[1, 100, 5 * 1024],
+            help="Body sizes to measure, in KB.")
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help="Number of measurements to take the best of.")
+
+    def get_throughput(self, func, size, repeat):
+        """Returns the throughput of func in MB/s."""
+        timer = Timer(func)
+        number, _ = timer.autorange()
+        best_time = min(timer.repeat(repeat, number)) / number
+        return size / best_time / 1024 ** 2
+
+    def handle(self, *args, **options):
+        codecs = [codec for codec in CODECS
+                  if codec != 'orjson' or json_codec.orjson]
+        self.stdout.write(
+            f"{'size':>10} {'codec':>8} "
+            f"{'parse MB/s':>12} {'render MB/s':>12}")
+        for size in options['sizes']:
+            data = get_benchmark_data(h.kb_to_bytes(size))
+            for codec in codecs:
+                parser_class, renderer_class = CODECS[codec]
+                with override_settings(JSON_CODEC=codec):
+                    parser = parser_class()
+                    renderer = renderer_class()
+                    body = renderer.render(data)
+                    parse_throughput = self.get_throughput(
+                        lambda: parser.parse(BytesIO(body)),
+                        len(body), options['repeat'])
+                    render_throughput = self.get_throughput(
+                        lambda: renderer.render(data),
+                        len(body), options['repeat'])
+                self.stdout.write(
+                    f"{f'{size} KB':>10} {codec:>8} "
+                    f"{parse_throughput:>12.1f} {render_throughput:>12.1f}")
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.7 on 2026-10-18 13:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jsonstore',
+            name='data_size',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.1.7 on 2026-10-18 15:02
+
+from django.db import migrations, models
+
+from django_jsonsaver import helpers as h
+
+
+def populate_data_hash(apps, schema_editor):
+    JsonStore = apps.get_model('stores', 'JsonStore')
+    jsonstores = []
+    for pk, data in JsonStore.objects.order_by('pk') \
+            .values_list('pk', 'data').iterator():
+        jsonstores.append(JsonStore(pk=pk, data_hash=h.get_json_hash(data)))
+        if len(jsonstores) >= 500:
+            JsonStore.objects.bulk_update(jsonstores, ['data_hash'])
+            jsonstores = []
+    JsonStore.objects.bulk_update(jsonstores, ['data_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0002_jsonstore_data_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jsonstore',
+            name='data_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.RunPython(populate_data_hash, migrations.RunPython.noop),
+    ]
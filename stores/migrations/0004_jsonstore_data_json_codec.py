@@ -0,0 +1,19 @@
+# Generated by Django 3.1.7 on 2026-10-18 13:38
+
+from django.db import migrations, models
+import django_jsonsaver.json_codec
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0003_jsonstore_data_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jsonstore',
+            name='data',
+            field=models.JSONField(blank=True, decoder=django_jsonsaver.json_codec.JSONDecoder, default=dict, encoder=django_jsonsaver.json_codec.JSONEncoder),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 3.1.7 on 2026-10-18 13:55
+
+from django.db import migrations, models
+
+from django_jsonsaver import helpers as h
+
+
+def populate_data_summary(apps, schema_editor):
+    JsonStore = apps.get_model('stores', 'JsonStore')
+    jsonstores = []
+    for pk, data in JsonStore.objects.order_by('pk') \
+            .values_list('pk', 'data').iterator():
+        jsonstores.append(JsonStore(
+            pk=pk, data_key_count=h.get_json_key_count(data),
+            data_preview=h.get_json_preview(data, 100)))
+        if len(jsonstores) >= 500:
+            JsonStore.objects.bulk_update(
+                jsonstores, ['data_key_count', 'data_preview'])
+            jsonstores = []
+    JsonStore.objects.bulk_update(
+        jsonstores, ['data_key_count', 'data_preview'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0004_jsonstore_data_json_codec'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jsonstore',
+            name='data_key_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jsonstore',
+            name='data_preview',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.RunPython(populate_data_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.1.7 on 2026-10-18 13:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0005_jsonstore_data_summary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jsonstore',
+            index=models.Index(fields=['user', '-updated_at', '-id'], name='jsonstore_user_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 3.1.7 on 2026-10-18 14:02
+
+from django.db import migrations, models
+
+
+def rename_duplicate_names(apps, schema_editor):
+    """
+    Renames the jsonstores whose names would break the new constraints,
+    keeping the oldest jsonstore of each name, so that they can be created.
+    """
+    JsonStore = apps.get_model('stores', 'JsonStore')
+    user_names = set()
+    public_names = set()
+
+    def is_taken(user_id, name, is_public):
+        return (user_id, name) in user_names or \
+            (is_public and name in public_names)
+
+    for pk, user_id, name, is_public in JsonStore.objects \
+            .filter(name__gt='').order_by('pk') \
+            .values_list('pk', 'user_id', 'name', 'is_public').iterator():
+        if is_taken(user_id, name, is_public):
+            # the first suffixed name may already be taken by an earlier
+            # jsonstore, e.g. one named 'foo-3'. A later jsonstore that has
+            # the new name is renamed in turn when it is reached.
+            new_name = name
+            i = 0
+            while is_taken(user_id, new_name, is_public):
+                suffix = f'-{pk}' + (f'-{i}' if i else '')
+                new_name = name[:128 - len(suffix)] + suffix
+                i += 1
+            name = new_name
+            JsonStore.objects.filter(pk=pk).update(name=name)
+        user_names.add((user_id, name))
+        if is_public:
+            public_names.add(name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0006_jsonstore_user_updated_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_duplicate_names, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='jsonstore',
+            constraint=models.UniqueConstraint(condition=models.Q(name__gt=''), fields=('user', 'name'), name='jsonstore_user_name_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='jsonstore',
+            constraint=models.UniqueConstraint(condition=models.Q(is_public=True), fields=('name',), name='jsonstore_public_name_unique'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+class JsonStoreObjectMixin:
+    """
+    Loads the view's jsonstore, with its user, once per request, however
+    many times get_object() is called, e.g. by the permission check, the
+    view and its form.
+    """
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return self.load_object(queryset)
+        if not hasattr(self, '_object'):
+            self._object = self.load_object()
+        return self._object
+
+    def get_object_queryset(self, queryset=None):
+        """Returns the queryset that the jsonstore is loaded from."""
+        if queryset is None:
+            queryset = self.get_queryset()
+        return queryset.select_related('user')
+
+    def load_object(self, queryset=None):
+        """Loads the view's jsonstore from the database."""
+        return super().get_object(self.get_object_queryset(queryset))
@@ -1,8 +1,8 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.urls import reverse
 
-from django_jsonsaver import constants as c, helpers as h
+from django_jsonsaver import constants as c, helpers as h, json_codec
 
 
 class JsonStore(models.Model):
@@ -22,22 +22,120 @@ class JsonStore(models.Model):
     name = models.CharField(
         max_length=c.JSONSTORE_NAME_MAX_LENGTH, blank=True, null=True,
         help_text=c.MODEL_JSONSTORE_NAME_HELP_TEXT)
-    data = models.JSONField(default=dict, blank=True)
+    data = models.JSONField(
+        default=dict, blank=True,
+        encoder=json_codec.JSONEncoder, decoder=json_codec.JSONDecoder)
+    data_size = models.PositiveIntegerField(
+        default=0, db_index=True, editable=False)
+    data_hash = models.CharField(max_length=64, editable=False, blank=True)
+    data_key_count = models.PositiveIntegerField(default=0, editable=False)
+    data_preview = models.CharField(
+        max_length=c.JSONSTORE_DATA_PREVIEW_LENGTH, editable=False,
+        blank=True)
     is_public = models.BooleanField(
         help_text=c.MODEL_JSONSTORE_IS_PUBLIC_HELP_TEXT,
         default=False)
 
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # keyset pagination of a user's jsonstores, see stores.pagination
+            models.Index(fields=['user', '-updated_at', '-id'],
+                         name='jsonstore_user_updated_idx'),
+        ]
+        # these also serve the lookups of jsonstores by name
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'name'], condition=models.Q(name__gt=''),
+                name='jsonstore_user_name_unique'),
+            models.UniqueConstraint(
+                fields=['name'], condition=models.Q(is_public=True),
+                name='jsonstore_public_name_unique'),
+        ]
+
     def __str__(self):
         return f"id: {self.id}, "\
             f"user: {self.user.username}, "\
             f"name: {self.name if self.name else 'N/A'}, "\
             f"is_public: {self.is_public}"
 
+    # fields that are derived from data, see refresh_data_metadata()
+    data_metadata_fields = [
+        'data_size', 'data_hash', 'data_key_count', 'data_preview']
+
+    # fields whose last saved values are remembered, see get_saved_value()
+    saved_value_fields = ['name', 'data_size']
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_values = {
+            field: instance.__dict__[field]
+            for field in cls.saved_value_fields if field in instance.__dict__}
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self._set_saved_values(fields)
+
+    def _set_saved_values(self, fields=None):
+        if not hasattr(self, '_saved_values'):
+            self._saved_values = {}
+        for field in self.saved_value_fields:
+            if fields is None or field in fields:
+                self._saved_values[field] = getattr(self, field)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'data' in update_fields:
+            self.refresh_data_metadata()
+            if update_fields is not None:
+                kwargs['update_fields'] = \
+                    {*update_fields, *self.data_metadata_fields}
+        for field in self.saved_value_fields:
+            self.get_saved_value(field)
+        # post_save receivers update the owner's storage counters, so they
+        # must be committed together with the row
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+        self._set_saved_values(kwargs.get('update_fields'))
+
+    def refresh_data_metadata(self, data_size=None):
+        """
+        Recomputes the fields that are derived from data. data_size, if
+        given, is the size of data that has already been measured.
+        """
+        self.data_size = h.get_json_size(self.data) \
+            if data_size is None else data_size
+        self.data_hash = h.get_json_hash(self.data)
+        self.data_key_count = h.get_json_key_count(self.data)
+        self.data_preview = h.get_json_preview(
+            self.data, c.JSONSTORE_DATA_PREVIEW_LENGTH)
+
+    def get_saved_value(self, field):
+        """
+        Returns the value of field when this object was last loaded from, or
+        saved to, the database. Returns None for unsaved objects.
+        """
+        if not hasattr(self, '_saved_values'):
+            self._saved_values = {}
+        if field not in self._saved_values:
+            self._saved_values[field] = None if self._state.adding else \
+                JsonStore.objects.filter(pk=self.pk) \
+                .values_list(field, flat=True).first()
+        return self._saved_values[field]
+
+    def get_data_size_delta(self):
+        """
+        Returns the change in data_size since this object was last loaded
+        from, or saved to, the database.
+        """
+        return self.data_size - (self.get_saved_value('data_size') or 0)
+
     def get_absolute_url(self):
         return reverse('stores:jsonstore_detail', kwargs={
             'jsonstore_pk': self.pk})
 
     def get_data_size(self):
-        return h.bytes_to_kb(h.get_obj_size(self.data))
+        return h.bytes_to_kb(self.data_size)
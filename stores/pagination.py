@@ -0,0 +1,93 @@
+"""
+Keyset pagination of jsonstores, newest first.
+
+Pages are ordered by (updated_at, id), and a page's cursor encodes the
+position of its last jsonstore, so every page is fetched with an index
+range scan that does not depend on how far into the list it is.
+"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+ORDERING = ['-updated_at', '-id']
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded."""
+
+
+def encode_cursor(jsonstore):
+    """Returns the cursor of the page that follows jsonstore."""
+    position = f'{jsonstore.updated_at.isoformat()},{jsonstore.pk}'
+    return urlsafe_b64encode(position.encode('ascii')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Returns the (updated_at, id) encoded in cursor."""
+    try:
+        updated_at, pk = urlsafe_b64decode(cursor.encode('ascii')) \
+            .decode('ascii').split(',')
+        updated_at = parse_datetime(updated_at)
+        pk = int(pk)
+    except (BinasciiError, UnicodeError, ValueError):
+        raise InvalidCursor(cursor)
+    if updated_at is None:
+        raise InvalidCursor(cursor)
+    return updated_at, pk
+
+
+class KeysetPage:
+    """A page of jsonstores, with the cursor of the next page, if any."""
+
+    def __init__(self, object_list, cursor, next_cursor):
+        self.object_list = object_list
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def get_page_queryset(queryset, cursor):
+    """
+    Returns queryset, ordered, from the position encoded in cursor on, or
+    from the start if cursor is None.
+    """
+    queryset = queryset.order_by(*ORDERING)
+    if cursor is not None:
+        updated_at, pk = decode_cursor(cursor)
+        # the redundant updated_at <= bound lets the index scan start at the
+        # cursor, which the OR alone would leave to a filter on every row
+        queryset = queryset.filter(updated_at__lte=updated_at).filter(
+            Q(updated_at__lt=updated_at) | Q(updated_at=updated_at, id__lt=pk))
+    return queryset
+
+
+def get_page(queryset, cursor, page_size):
+    """
+    Returns the KeysetPage of queryset that starts after cursor, or the
+    first page if cursor is None. Raises InvalidCursor if cursor cannot be
+    decoded.
+    """
+    queryset = get_page_queryset(queryset, cursor)
+    # one more row than is shown tells whether there is a next page
+    object_list = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(object_list) > page_size:
+        object_list = object_list[:page_size]
+        next_cursor = encode_cursor(object_list[-1])
+    return KeysetPage(object_list, cursor, next_cursor)
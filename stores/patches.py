@@ -0,0 +1,353 @@
+"""
+JSON Patch (RFC 6902) and JSON Merge Patch (RFC 7396) support for jsonstore
+data.
+
+Patches are applied together with the change in the data's serialized size,
+which is worked out from the patched values only, so that quotas can be
+checked without measuring the whole document again.
+"""
+import re
+from copy import deepcopy
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from . import cache, validation
+from .models import JsonStore
+from django_jsonsaver import constants as c, helpers as h
+from users.models import Profile
+
+JSON_PATCH = 'json-patch'
+MERGE_PATCH = 'merge-patch'
+
+# an array index as RFC 6901 defines it, i.e. without a sign or leading zeros
+ARRAY_INDEX_RE = re.compile(r'0|[1-9][0-9]*')
+
+JSON_PATCH_OPS = {
+    'add': ['value'],
+    'remove': [],
+    'replace': ['value'],
+    'move': ['from'],
+    'copy': ['from'],
+    'test': ['value'],
+}
+
+
+class PatchError(ValueError):
+    """Raised when a patch is malformed or cannot be applied."""
+
+
+# json pointers (RFC 6901)
+def parse_json_pointer(pointer):
+    """Returns the list of reference tokens of a JSON pointer."""
+    if not isinstance(pointer, str):
+        raise PatchError(f"JSON pointer must be a string: {pointer!r}")
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        raise PatchError(f"JSON pointer must start with '/': {pointer!r}")
+    return [token.replace('~1', '/').replace('~0', '~')
+            for token in pointer[1:].split('/')]
+
+
+def parse_data_path(path):
+    """
+    Returns the reference tokens of a path into jsonstore data. The path is
+    either a JSON pointer, e.g. '/items/0/name', the same without its
+    leading slash, e.g. 'items/0/name', or a dotted path, e.g.
+    'items.0.name'.
+    """
+    if path.startswith('/'):
+        return parse_json_pointer(path)
+    if '/' in path:
+        return parse_json_pointer('/' + path)
+    return path.split('.')
+
+
+def is_array_index(token):
+    """Returns True if token is an array index as RFC 6901 defines it."""
+    return ARRAY_INDEX_RE.fullmatch(token) is not None
+
+
+def can_resolve_in_database(tokens):
+    """
+    Returns True if jsonb's #> operator resolves tokens as
+    resolve_json_pointer() does. #> also reads tokens such as '-1' or '01'
+    as array indexes, which RFC 6901 does not allow.
+    """
+    for token in tokens:
+        if is_array_index(token):
+            continue
+        try:
+            int(token)
+        except ValueError:
+            continue
+        return False
+    return True
+
+
+def _get_array_index(array, token, pointer, allow_end=False):
+    if allow_end and token == '-':
+        return len(array)
+    if not is_array_index(token):
+        raise PatchError(f"Invalid array index in {pointer!r}: {token!r}")
+    index = int(token)
+    if index > len(array) or (index == len(array) and not allow_end):
+        raise PatchError(f"Array index out of range in {pointer!r}")
+    return index
+
+
+def resolve_json_pointer(doc, tokens, pointer=None):
+    """Returns the value of doc referenced by tokens."""
+    if pointer is None:
+        pointer = ''.join(
+            '/' + token.replace('~', '~0').replace('/', '~1')
+            for token in tokens)
+    for token in tokens:
+        if isinstance(doc, dict):
+            if token not in doc:
+                raise PatchError(f"Path does not exist: {pointer!r}")
+            doc = doc[token]
+        elif isinstance(doc, list):
+            doc = doc[_get_array_index(doc, token, pointer)]
+        else:
+            raise PatchError(f"Path does not exist: {pointer!r}")
+    return doc
+
+
+def _get_member_size(key, value):
+    """Returns the serialized size of an object member, i.e. "key":value."""
+    return h.get_json_size({key: value}) - 2
+
+
+def _json_equal(a, b):
+    """Compares JSON values as RFC 6902 'test' does, e.g. 1 == 1.0 != True."""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(
+            _json_equal(a[key], b[key]) for key in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(map(_json_equal, a, b))
+    return type(a) is type(b) and a == b
+
+
+# json patch (RFC 6902)
+def validate_json_patch(patch):
+    """Raises PatchError if patch is not a well-formed JSON Patch document."""
+    if not isinstance(patch, list):
+        raise PatchError("A JSON Patch document must be an array.")
+    for operation in patch:
+        if not isinstance(operation, dict):
+            raise PatchError("JSON Patch operations must be objects.")
+        op = operation.get('op')
+        if op not in JSON_PATCH_OPS:
+            raise PatchError(f"Invalid JSON Patch operation: {op!r}")
+        for member in ['path', *JSON_PATCH_OPS[op]]:
+            if member not in operation:
+                raise PatchError(
+                    f"JSON Patch '{op}' operation is missing '{member}'.")
+        parse_json_pointer(operation['path'])
+        if 'from' in JSON_PATCH_OPS[op]:
+            parse_json_pointer(operation['from'])
+
+
+def _add(doc, tokens, value, pointer):
+    """Returns (doc, size delta) after adding value at tokens."""
+    if not tokens:
+        return value, h.get_json_size(value) - h.get_json_size(doc)
+    parent = resolve_json_pointer(doc, tokens[:-1], pointer)
+    token = tokens[-1]
+    if isinstance(parent, dict):
+        if token in parent:
+            delta = h.get_json_size(value) - h.get_json_size(parent[token])
+        else:
+            delta = _get_member_size(token, value) + (1 if parent else 0)
+        parent[token] = value
+    elif isinstance(parent, list):
+        index = _get_array_index(parent, token, pointer, allow_end=True)
+        delta = h.get_json_size(value) + (1 if parent else 0)
+        parent.insert(index, value)
+    else:
+        raise PatchError(f"Path does not exist: {pointer!r}")
+    return doc, delta
+
+
+def _replace(doc, tokens, value, pointer):
+    """Returns (doc, size delta) after replacing the value at tokens."""
+    delta = h.get_json_size(value) - \
+        h.get_json_size(resolve_json_pointer(doc, tokens, pointer))
+    if not tokens:
+        return value, delta
+    parent = resolve_json_pointer(doc, tokens[:-1], pointer)
+    if isinstance(parent, list):
+        parent[_get_array_index(parent, tokens[-1], pointer)] = value
+    else:
+        parent[tokens[-1]] = value
+    return doc, delta
+
+
+def _remove(doc, tokens, pointer):
+    """Returns (doc, size delta, removed value) after removing tokens."""
+    if not tokens:
+        raise PatchError("The whole document cannot be removed.")
+    parent = resolve_json_pointer(doc, tokens[:-1], pointer)
+    token = tokens[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise PatchError(f"Path does not exist: {pointer!r}")
+        value = parent.pop(token)
+        delta = -_get_member_size(token, value) - (1 if parent else 0)
+    elif isinstance(parent, list):
+        value = parent.pop(_get_array_index(parent, token, pointer))
+        delta = -h.get_json_size(value) - (1 if parent else 0)
+    else:
+        raise PatchError(f"Path does not exist: {pointer!r}")
+    return doc, delta, value
+
+
+def apply_json_patch(doc, patch):
+    """
+    Applies a JSON Patch document to doc, which may be modified in place.
+    Returns (patched doc, size delta).
+    """
+    validate_json_patch(patch)
+    size_delta = 0
+    for operation in patch:
+        op = operation['op']
+        pointer = operation['path']
+        tokens = parse_json_pointer(pointer)
+
+        if op == 'add':
+            doc, delta = _add(doc, tokens, deepcopy(operation['value']),
+                              pointer)
+        elif op == 'remove':
+            doc, delta, _ = _remove(doc, tokens, pointer)
+        elif op == 'replace':
+            doc, delta = _replace(
+                doc, tokens, deepcopy(operation['value']), pointer)
+        elif op == 'move':
+            from_tokens = parse_json_pointer(operation['from'])
+            if tokens[:len(from_tokens)] == from_tokens and \
+                    tokens != from_tokens:
+                raise PatchError(
+                    "A value cannot be moved into one of its children.")
+            doc, delta, value = _remove(doc, from_tokens, operation['from'])
+            doc, add_delta = _add(doc, tokens, value, pointer)
+            delta += add_delta
+        elif op == 'copy':
+            value = resolve_json_pointer(
+                doc, parse_json_pointer(operation['from']),
+                operation['from'])
+            doc, delta = _add(doc, tokens, deepcopy(value), pointer)
+        else:
+            value = resolve_json_pointer(doc, tokens, pointer)
+            if not _json_equal(value, operation['value']):
+                raise PatchError(f"Test failed: {pointer!r}")
+            delta = 0
+        size_delta += delta
+    return doc, size_delta
+
+
+# json merge patch (RFC 7396)
+def _remove_nulls(value):
+    if not isinstance(value, dict):
+        return value
+    return {key: _remove_nulls(member) for key, member in value.items()
+            if member is not None}
+
+
+def apply_merge_patch(doc, patch):
+    """
+    Applies a JSON Merge Patch document to doc, which may be modified in
+    place. Returns (patched doc, size delta).
+    """
+    if not isinstance(patch, dict) or not isinstance(doc, dict):
+        patch = _remove_nulls(patch)
+        return patch, h.get_json_size(patch) - h.get_json_size(doc)
+
+    size_delta = 0
+    for key, value in patch.items():
+        if value is None:
+            if key in doc:
+                size_delta -= \
+                    _get_member_size(key, doc.pop(key)) + (1 if doc else 0)
+        elif key in doc:
+            doc[key], delta = apply_merge_patch(doc[key], value)
+            size_delta += delta
+        else:
+            value = _remove_nulls(value)
+            size_delta += _get_member_size(key, value) + (1 if doc else 0)
+            doc[key] = value
+    return doc, size_delta
+
+
+# jsonstores
+def get_jsonstore_patch_errors(jsonstore, size_delta):
+    """
+    Returns the (field, error) tuples of the size invalidators for a patch
+    that changes the jsonstore's data size by size_delta.
+    """
+    return validation.get_jsonstore_data_size_errors(
+        jsonstore.user, jsonstore, jsonstore.data_size + size_delta)
+
+
+def get_jsonb_path_text_sql(tokens):
+    """Returns the text of the jsonstore data value at tokens, or NULL."""
+    return RawSQL(
+        f'("{JsonStore._meta.db_table}"."data" #> %s::text[])::text',
+        (tokens,))
+
+
+def patch_jsonstore_data(queryset, patch, patch_format, precondition=None):
+    """
+    Patches the data of the jsonstore in queryset, whose row is locked for
+    the duration of the patch.
+
+    precondition, if given, is called with the jsonstore before the patch
+    is applied. Raises PatchError or ValidationError if the patch cannot be
+    applied. Returns the patched jsonstore, without its data, or None if
+    queryset is empty.
+    """
+    if patch_format == JSON_PATCH:
+        validate_json_patch(patch)
+
+    with transaction.atomic():
+        jsonstore = queryset.select_for_update(of=('self',)) \
+            .select_related('user__profile').first()
+        if jsonstore is None:
+            return None
+        if precondition:
+            precondition(jsonstore)
+
+        if patch_format == JSON_PATCH:
+            data, size_delta = apply_json_patch(jsonstore.data, patch)
+        else:
+            data, size_delta = apply_merge_patch(jsonstore.data, patch)
+
+        errors = get_jsonstore_patch_errors(jsonstore, size_delta)
+        if errors:
+            raise ValidationError([error for _, error in errors])
+
+        # rows that have not been backfilled yet have a data_size of 0
+        JsonStore.objects.filter(pk=jsonstore.pk).update(
+            data=data, data_size=Greatest(F('data_size') + size_delta, 0),
+            updated_at=timezone.now(), data_hash=h.get_json_hash(data),
+            data_key_count=h.get_json_key_count(data),
+            data_preview=h.get_json_preview(
+                data, c.JSONSTORE_DATA_PREVIEW_LENGTH))
+
+        # QuerySet.update() does not send the signals that keep these current
+        if size_delta:
+            Profile.update_all_jsonstores_data_size(
+                jsonstore.user_id, size_delta)
+        cache.delete_cached_public_jsonstores(jsonstore.name)
+        cache.delete_cached_public_profiles(jsonstore.user_id)
+
+    return JsonStore.objects.defer('data').get(pk=jsonstore.pk)
@@ -1,9 +1,11 @@
 from django.contrib.auth.mixins import UserPassesTestMixin
 
+from .mixins import JsonStoreObjectMixin
 from .models import JsonStore
 
 
-class UserHasJsonStorePermissionsMixin(UserPassesTestMixin):
+class UserHasJsonStorePermissionsMixin(
+        JsonStoreObjectMixin, UserPassesTestMixin):
     def test_func(self, obj=None):
         obj = self.get_object()
         if not isinstance(obj, JsonStore):
@@ -11,6 +13,6 @@ class UserHasJsonStorePermissionsMixin(UserPassesTestMixin):
                 "This permission can only be used with a JsonStore object.")
         if self.request.user.is_staff:
             return True
-        if obj.user == self.request.user:
+        if obj.user_id == self.request.user.id:
             return True
         return False
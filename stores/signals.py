@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache
+from .models import JsonStore
+
+
+@receiver(post_save, sender=JsonStore)
+def jsonstore_save_deletes_cached_public_jsonstore(sender, instance, **kwargs):
+    # the saved name is the name before this save, if it was renamed
+    cache.delete_cached_public_jsonstores(
+        instance.name, instance.get_saved_value('name'))
+    cache.delete_cached_public_profiles(instance.user_id)
+
+
+@receiver(post_delete, sender=JsonStore)
+def jsonstore_delete_deletes_cached_public_jsonstore(
+        sender, instance, **kwargs):
+    cache.delete_cached_public_jsonstores(instance.name)
+    cache.delete_cached_public_profiles(instance.user_id)
@@ -0,0 +1,207 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from . import bulk, cache
+from .models import JsonStore
+from django_jsonsaver import factories as f, helpers as h
+from users.models import Profile
+
+UserModel = get_user_model()
+
+
+class ApplyBulkOperationsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+
+    def setUp(self):
+        # a fresh user, so that its profile is not already cached
+        self.user = UserModel.objects.get(pk=self.test_user.pk)
+        self.test_jsonstore = f.JsonStoreFactory(
+            user=self.test_user, name='test-name', data={'a': 1})
+
+    def apply(self, operations):
+        return bulk.apply_bulk_operations(self.user, operations)
+
+    def get_error_codes(self, operations):
+        with self.assertRaises(bulk.BulkOperationError) as cm:
+            self.apply(operations)
+        return [[error.code for _, error in errors]
+                for errors in cm.exception.errors]
+
+    def assert_all_jsonstores_data_size_is_current(self):
+        self.test_user.profile.refresh_from_db()
+        self.assertEqual(
+            self.test_user.profile.get_all_jsonstores_data_size(),
+            sum(JsonStore.objects.filter(user=self.test_user)
+                .values_list('data_size', flat=True)))
+
+    def assert_jsonstore_count_is_current(self):
+        self.test_user.profile.refresh_from_db()
+        self.assertEqual(
+            self.test_user.profile.jsonstore_count,
+            JsonStore.objects.filter(user=self.test_user).count())
+
+    def test_create(self):
+        results = self.apply([
+            {'op': 'create', 'name': 'first', 'data': {'b': 2}},
+            {'op': 'create', 'is_public': False}])
+        self.assertEqual(len(results), 2)
+        for result in results:
+            jsonstore = JsonStore.objects.get(pk=result.pk)
+            self.assertEqual(jsonstore.user, self.test_user)
+            self.assertEqual(jsonstore.name, result.name)
+            self.assertEqual(jsonstore.data_hash, h.get_json_hash(result.data))
+        self.assertEqual(results[0].data_size, h.get_json_size({'b': 2}))
+        self.assert_all_jsonstores_data_size_is_current()
+        self.assert_jsonstore_count_is_current()
+
+    def test_update(self):
+        results = self.apply([
+            {'op': 'update', 'id': self.test_jsonstore.pk,
+             'name': 'new-name', 'data': {'a': 'x' * 100}}])
+        self.assertEqual(results[0].pk, self.test_jsonstore.pk)
+        jsonstore = JsonStore.objects.get(pk=self.test_jsonstore.pk)
+        self.assertEqual(jsonstore.name, 'new-name')
+        self.assertEqual(jsonstore.data, {'a': 'x' * 100})
+        self.assertEqual(jsonstore.data_size, h.get_json_size(jsonstore.data))
+        self.assertGreater(
+            jsonstore.updated_at, self.test_jsonstore.updated_at)
+        self.assert_all_jsonstores_data_size_is_current()
+
+    def test_update_of_some_fields_keeps_the_others(self):
+        self.apply([{'op': 'update', 'id': self.test_jsonstore.pk,
+                     'is_public': True}])
+        jsonstore = JsonStore.objects.get(pk=self.test_jsonstore.pk)
+        self.assertTrue(jsonstore.is_public)
+        self.assertEqual(jsonstore.name, 'test-name')
+        self.assertEqual(jsonstore.data, {'a': 1})
+
+    def test_delete(self):
+        results = self.apply(
+            [{'op': 'delete', 'id': self.test_jsonstore.pk}])
+        self.assertEqual(results, [self.test_jsonstore.pk])
+        self.assertFalse(
+            JsonStore.objects.filter(pk=self.test_jsonstore.pk).exists())
+        self.assert_all_jsonstores_data_size_is_current()
+        self.assert_jsonstore_count_is_current()
+
+    def test_deleted_name_can_be_reused(self):
+        self.apply([{'op': 'create', 'name': 'test-name'},
+                    {'op': 'delete', 'id': self.test_jsonstore.pk}])
+        self.assertTrue(JsonStore.objects.filter(name='test-name').exists())
+
+    def test_batch_uses_a_constant_number_of_queries(self):
+        other_jsonstore = f.JsonStoreFactory(user=self.test_user)
+        operations = [
+            {'op': 'create', 'name': 'first'},
+            {'op': 'create', 'name': 'second'},
+            {'op': 'update', 'id': self.test_jsonstore.pk, 'data': {}},
+            {'op': 'delete', 'id': other_jsonstore.pk}]
+        # savepoint, lock, profile, two name lookups, jsonstore counter
+        # update, savepoint, delete select and delete, two profile counter
+        # updates by the signals, update, insert, storage usage counter
+        # update, two releases, and the pks of the insert on databases that
+        # cannot return them
+        can_return_rows = connection.features.can_return_rows_from_bulk_insert
+        with self.assertNumQueries(16 if can_return_rows else 17):
+            self.apply(operations)
+
+    def test_invalid_operation_cancels_the_batch(self):
+        codes = self.get_error_codes([
+            {'op': 'create', 'name': 'first'},
+            {'op': 'create', 'name': '123'}])
+        self.assertEqual(
+            codes, [[], ['jsonstore_name_cannot_be_numbers_only']])
+        self.assertFalse(JsonStore.objects.filter(name='first').exists())
+
+    def test_other_user_jsonstore_is_not_found(self):
+        other_jsonstore = f.JsonStoreFactory()
+        codes = self.get_error_codes(
+            [{'op': 'delete', 'id': other_jsonstore.pk}])
+        self.assertEqual(codes, [['jsonstore_bulk_not_found']])
+
+    def test_jsonstore_can_only_be_changed_once(self):
+        codes = self.get_error_codes([
+            {'op': 'update', 'id': self.test_jsonstore.pk, 'data': {}},
+            {'op': 'delete', 'id': self.test_jsonstore.pk}])
+        self.assertEqual(codes, [[], ['jsonstore_bulk_duplicate_id']])
+
+    def test_duplicate_names(self):
+        codes = self.get_error_codes([
+            {'op': 'create', 'name': 'test-name'},
+            {'op': 'create', 'name': 'new-name'},
+            {'op': 'create', 'name': 'new-name'}])
+        self.assertEqual(codes, [
+            ['jsonstore_name_duplicate_same_user_create'], [],
+            ['jsonstore_name_duplicate_same_user_create']])
+
+    def test_public_name_of_other_user(self):
+        f.JsonStoreFactory(name='public-name', is_public=True)
+        codes = self.get_error_codes([
+            {'op': 'update', 'id': self.test_jsonstore.pk,
+             'name': 'public-name', 'is_public': True}])
+        self.assertEqual(codes, [['jsonstore_public_name_duplicate']])
+
+    def test_jsonstore_count_is_checked_for_the_whole_batch(self):
+        max_jsonstore_count = \
+            self.test_user.profile.get_max_jsonstore_count()
+        codes = self.get_error_codes(
+            [{'op': 'create'}] * max_jsonstore_count)
+        self.assertEqual(
+            codes, [[]] * (max_jsonstore_count - 1) +
+            [['jsonstore_user_jsonstore_count_over_max']])
+
+        # a delete in the batch frees its place
+        self.apply([{'op': 'create'}] * (max_jsonstore_count - 1))
+        self.apply([{'op': 'create'},
+                    {'op': 'delete', 'id': self.test_jsonstore.pk}])
+        self.assert_jsonstore_count_is_current()
+
+    def test_storage_allowance_is_checked_for_the_whole_batch(self):
+        max_all_jsonstores_data_size = self.test_user.profile \
+            .get_max_jsonstore_all_jsonstores_data_size()
+        data = {'a': 'x' * (max_all_jsonstores_data_size // 3)}
+        codes = self.get_error_codes(
+            [{'op': 'create', 'data': data}] * 3)
+        self.assertEqual(codes, [
+            [], [], ['jsonstore_all_jsonstores_data_size_over_max']])
+
+        self.apply([{'op': 'update', 'id': self.test_jsonstore.pk,
+                     'data': data},
+                    {'op': 'create', 'data': data}])
+        codes = self.get_error_codes([{'op': 'create', 'data': data}])
+        self.assertEqual(
+            codes, [['jsonstore_all_jsonstores_data_size_over_max']])
+
+        # a delete in the batch frees its storage
+        self.apply([{'op': 'create', 'data': data},
+                    {'op': 'delete', 'id': self.test_jsonstore.pk}])
+
+    def test_validation_keeps_the_profile_storage_usage(self):
+        all_jsonstores_data_size = Profile.objects.get(
+            user=self.test_user).get_all_jsonstores_data_size()
+        self.apply([{'op': 'create', 'data': {'b': 'x' * 100}},
+                    {'op': 'delete', 'id': self.test_jsonstore.pk}])
+        self.assertEqual(
+            self.user.profile.get_all_jsonstores_data_size(),
+            all_jsonstores_data_size)
+
+    def test_data_is_measured_once(self):
+        with mock.patch.object(
+                h, 'get_json_size', wraps=h.get_json_size) as get_json_size:
+            self.apply([
+                {'op': 'create', 'data': {'b': 2}},
+                {'op': 'update', 'id': self.test_jsonstore.pk,
+                 'data': {'a': 2}}])
+        self.assertEqual(get_json_size.call_count, 2)
+        self.assert_all_jsonstores_data_size_is_current()
+
+    def test_updates_delete_cached_public_jsonstores(self):
+        cache.set_cached_public_jsonstore('test-name', b'{}', '', None)
+        self.apply([{'op': 'update', 'id': self.test_jsonstore.pk,
+                     'name': 'new-name'}])
+        self.assertIsNone(cache.get_cached_public_jsonstore('test-name'))
@@ -0,0 +1,57 @@
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import cache
+from django_jsonsaver import constants as c
+
+
+class PublicJsonStoreCacheTest(TestCase):
+    def setUp(self):
+        cache.get_public_jsonstore_cache().clear()
+        self.test_data_hash = '0' * 64
+        self.test_updated_at = timezone.now()
+
+    def test_get_public_jsonstore_cache_key_is_valid_for_any_name(self):
+        key = cache.get_public_jsonstore_cache_key('name with spaces\n')
+        self.assertRegex(key, r'^[0-9a-f]{32}$')
+
+    def test_get_cached_public_jsonstore_returns_none_if_not_cached(self):
+        self.assertIsNone(
+            cache.get_cached_public_jsonstore(c.TEST_JSONSTORE_NAME))
+
+    def test_set_cached_public_jsonstore(self):
+        cache.set_cached_public_jsonstore(
+            c.TEST_JSONSTORE_NAME, b'{}',
+            self.test_data_hash, self.test_updated_at)
+        self.assertEqual(
+            cache.get_cached_public_jsonstore(c.TEST_JSONSTORE_NAME),
+            (b'{}', self.test_data_hash, self.test_updated_at))
+
+    @override_settings(JSONSTORE_PUBLIC_CACHE_MAX_ENTRY_SIZE=2)
+    def test_set_cached_public_jsonstore_skips_large_content(self):
+        cache.set_cached_public_jsonstore(
+            c.TEST_JSONSTORE_NAME, b'{"a":1}',
+            self.test_data_hash, self.test_updated_at)
+        self.assertIsNone(
+            cache.get_cached_public_jsonstore(c.TEST_JSONSTORE_NAME))
+
+    def test_delete_cached_public_jsonstores(self):
+        for name in ['first', 'second']:
+            cache.set_cached_public_jsonstore(
+                name, b'{}', self.test_data_hash, self.test_updated_at)
+        cache.delete_cached_public_jsonstores('first', None, 'second')
+        self.assertIsNone(cache.get_cached_public_jsonstore('first'))
+        self.assertIsNone(cache.get_cached_public_jsonstore('second'))
+
+    def test_get_public_profile_fragment_keys(self):
+        keys = cache.get_public_profile_fragment_keys(1)
+        self.assertEqual(len(set(keys)), 2)
+        self.assertNotEqual(keys, cache.get_public_profile_fragment_keys(2))
+
+    def test_delete_cached_public_profiles(self):
+        public_cache = cache.get_public_jsonstore_cache()
+        keys = cache.get_public_profile_fragment_keys(1) + \
+            cache.get_public_profile_fragment_keys(2)
+        public_cache.set_many({key: 'fragment' for key in keys})
+        cache.delete_cached_public_profiles(1, 2)
+        self.assertEqual(public_cache.get_many(keys), {})
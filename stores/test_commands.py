@@ -0,0 +1,123 @@
+import json
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from django_jsonsaver import factories as f, helpers as h, json_codec
+from stores.management.commands.benchmark_api import (
+    OPERATIONS, get_percentile, parse_mix)
+from stores.management.commands.benchmark_json_codec import (
+    CODECS, get_benchmark_data)
+from stores.models import JsonStore
+from users.models import Profile
+
+
+class BackfillJsonStoreDataSizeCommandTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_jsonstores = \
+            [f.JsonStoreFactory(data={'message': 'a' * i}) for i in range(5)]
+
+    def call_command(self, *args):
+        out = StringIO()
+        call_command('backfill_jsonstore_data_size', *args, stdout=out)
+        return out.getvalue()
+
+    def test_stale_data_sizes_are_recomputed(self):
+        JsonStore.objects.update(data_size=0)
+        output = self.call_command('--batch-size', '2')
+        for jsonstore in JsonStore.objects.all():
+            self.assertEqual(
+                jsonstore.data_size, h.get_json_size(jsonstore.data))
+        self.assertIn("Updated data_size of 5 JSON store(s)", output)
+
+    def test_storage_usage_of_profiles_is_reconciled(self):
+        JsonStore.objects.update(data_size=0)
+        Profile.objects.update(all_jsonstores_data_size=0)
+        output = self.call_command()
+        for jsonstore in self.test_jsonstores:
+            profile = Profile.objects.get(user=jsonstore.user)
+            self.assertEqual(
+                profile.all_jsonstores_data_size,
+                h.get_json_size(jsonstore.data))
+        self.assertIn("the storage usage of 5 profile(s).", output)
+
+    def test_current_data_sizes_are_not_rewritten(self):
+        output = self.call_command()
+        self.assertIn(
+            "Updated data_size of 0 JSON store(s) and the storage usage of "
+            "0 profile(s).", output)
+
+
+class BenchmarkJsonCodecCommandTest(TestCase):
+    def test_get_benchmark_data_returns_data_of_at_least_size(self):
+        for size in [0, 1024, 10 * 1024]:
+            data = get_benchmark_data(size)
+            self.assertGreaterEqual(h.get_json_size(data), size)
+            self.assertLess(h.get_json_size(data), size + 1024)
+
+    def test_throughput_is_reported_for_each_size_and_codec(self):
+        out = StringIO()
+        call_command(
+            'benchmark_json_codec', '--sizes', '1', '2', '--repeat', '1',
+            stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertIn('parse MB/s', lines[0])
+        self.assertEqual(len(lines), 1 + 2 * len(CODECS) if json_codec.orjson
+                         else 1 + 2)
+        self.assertIn('stdlib', lines[1])
+
+
+class BenchmarkApiCommandTest(TestCase):
+    def test_parse_mix(self):
+        self.assertEqual(
+            parse_mix('read=3,list=1'), {'read': 3, 'list': 1})
+        for mix in ['read', 'read=x', 'unknown=1', 'read=0']:
+            with self.assertRaises(ValueError):
+                parse_mix(mix)
+
+    def test_get_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(get_percentile(values, 50), 50)
+        self.assertEqual(get_percentile(values, 99), 99)
+        self.assertEqual(get_percentile([1], 95), 1)
+
+    def test_results_are_reported_and_rolled_back(self):
+        out = StringIO()
+        with tempfile.NamedTemporaryFile('r', suffix='.json') as output:
+            call_command(
+                'benchmark_api', '--users', '2', '--stores', '2',
+                '--requests', '50', '--output', output.name, stdout=out)
+            results = json.load(output)
+
+        lines = out.getvalue().splitlines()
+        self.assertIn('p99 ms', lines[0])
+        self.assertEqual(
+            set(results['results']), set(OPERATIONS) | {'all'})
+        self.assertEqual(results['results']['all']['count'], 50)
+        self.assertEqual(results['results']['all']['errors'], 0)
+        self.assertEqual(results['options']['requests'], 50)
+
+        # the seeded users and JSON stores are gone
+        self.assertFalse(JsonStore.objects.exists())
+
+    def test_caches_are_left_unchanged(self):
+        for alias in settings.CACHES:
+            caches[alias].clear()
+            caches[alias].set('test-key', alias)
+        call_command(
+            'benchmark_api', '--users', '2', '--stores', '2',
+            '--requests', '50', stdout=StringIO())
+
+        for alias in settings.CACHES:
+            # the local-memory caches of the tests
+            self.assertEqual(len(caches[alias]._cache), 1)
+            self.assertEqual(caches[alias].get('test-key'), alias)
+
+    def test_invalid_mix(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_api', '--mix', 'read=x')
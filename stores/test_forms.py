@@ -96,50 +96,19 @@ class JsonStoreFormTest(TestCase):
             form.has_error(
                 '__all__', 'jsonstore_user_jsonstore_count_over_max'))
 
-    def test_validation_jsonstore_name_duplicate_same_user_create(self):
-        # create other user and jsonstore
+    def test_validation_leaves_duplicate_names_to_the_database(self):
         other_jsonstore = f.JsonStoreFactory(
             user=self.test_user,
-            name='other_jsonstore_name')
-
-        # attempt to create jsonstore with duplicate name
-        self.form_data.update({'name': other_jsonstore.name})
-        form = forms.JsonStoreForm(self.form_data, **self.form_kwargs_create)
-        self.assertFalse(form.is_valid())
-        self.assertTrue(
-            form.has_error(
-                'name', 'jsonstore_name_duplicate_same_user_create'))
-
-    def test_validation_jsonstore_name_duplicate_same_user_update(self):
-        # create other user and jsonstore
-        other_jsonstore = f.JsonStoreFactory(
-            user=self.test_user,
-            name='other_jsonstore_name')
-
-        # attempt to update jsonstore with duplicate name
-        self.form_data.update({'name': other_jsonstore.name})
-        form = forms.JsonStoreForm(self.form_data, **self.form_kwargs_update)
-        self.assertFalse(form.is_valid())
-        self.assertTrue(
-            form.has_error(
-                'name', 'jsonstore_name_duplicate_same_user_update'))
-
-    def test_validation_jsonstore_public_name_duplicate(self):
-        # create other user and jsonstore
-        other_user = f.UserFactory()
-        other_jsonstore = f.JsonStoreFactory(
-            user=other_user,
             name='other_jsonstore_name',
             is_public=True)
 
-        # attempt to create jsonstore with duplicate name
-        self.form_data.update({
-            'name': other_jsonstore.name,
-            'is_public': True})
+        # duplicate names are rejected when the jsonstore is saved, see
+        # validation.save_jsonstore()
+        self.form_data.update({'name': other_jsonstore.name})
         form = forms.JsonStoreForm(self.form_data, **self.form_kwargs_create)
-        self.assertFalse(form.is_valid())
-        self.assertTrue(
-            form.has_error('name', 'jsonstore_public_name_duplicate'))
+        self.assertTrue(form.is_valid())
+        form = forms.JsonStoreForm(self.form_data, **self.form_kwargs_update)
+        self.assertTrue(form.is_valid())
 
     def test_validation_jsonstore_data_size_over_max(self):
         self.form_data.update(
@@ -153,7 +122,8 @@ class JsonStoreFormTest(TestCase):
             {'message': 'a' * (sc.MAX_JSONSTORE_DATA_SIZE_USER_FREE - 1024)}
         f.JsonStoreFactory(
             user=self.test_user,
-            data=almost_oversize_data_dict)
+            data={'message': 'a' *
+                  sc.MAX_JSONSTORE_ALL_JSONSTORES_DATA_SIZE_USER_FREE})
         self.form_data.update({'data': almost_oversize_data_dict})
         form = \
             forms.JsonStoreForm(data=self.form_data, **self.form_kwargs_create)
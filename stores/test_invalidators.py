@@ -30,56 +30,61 @@ class JsonStoreForbiddenNameNotAllowedTest(SimpleTestCase):
         self.assertTrue(iv.jsonstore_forbidden_name_not_allowed(name))
 
 
-class JsonstoreUserJsonstoreCountOverMaxTest(TestCase):
+class JsonstoreUserJsonstoreCountOverMaxTest(SimpleTestCase):
     def test_jsonstore_user_jsonstore_count_over_max(self):
-        user = f.UserFactory()
+        user_jsonstore_count = 0
         user_max_jsonstore_count = 0
 
         self.assertTrue(
             iv.jsonstore_user_jsonstore_count_over_max(
-                user, user_max_jsonstore_count))
+                user_jsonstore_count, user_max_jsonstore_count))
+
+    def test_jsonstore_user_jsonstore_count_under_max(self):
+        self.assertFalse(iv.jsonstore_user_jsonstore_count_over_max(1, 2))
 
 
-class JsonstoreNameDuplicateSameUserCreateTest(TestCase):
+class JsonstoreNameDuplicateSameUserCreateTest(SimpleTestCase):
     def test_jsonstore_name_duplicate_same_user_create(self):
         name = c.TEST_JSONSTORE_NAME
-        user = f.UserFactory()
         obj = None
-        f.JsonStoreFactory(user=user, name=name)
-        stores_with_same_name = JsonStore.objects.filter(name=name)
+        same_user_same_name_exists = True
 
         self.assertTrue(
             iv.jsonstore_name_duplicate_same_user_create(
-                name, user, obj, stores_with_same_name))
+                name, obj, same_user_same_name_exists))
+
+    def test_blank_name_is_not_a_duplicate(self):
+        self.assertFalse(
+            iv.jsonstore_name_duplicate_same_user_create('', None, True))
 
 
-class JsonstoreNameDuplicateSameUserUpdateTest(TestCase):
+class JsonstoreNameDuplicateSameUserUpdateTest(SimpleTestCase):
     def test_jsonstore_name_duplicate_same_user_update(self):
         name = c.TEST_JSONSTORE_NAME
-        user = f.UserFactory()
-        obj = f.JsonStoreFactory()
-
-        f.JsonStoreFactory(user=user, name=name)
-        stores_with_same_name = JsonStore.objects.filter(name=name)
+        obj = JsonStore(name=name)
+        same_user_same_name_exists = True
 
         self.assertTrue(
             iv.jsonstore_name_duplicate_same_user_update(
-                name, user, obj, stores_with_same_name))
+                name, obj, same_user_same_name_exists))
 
+    def test_create_is_not_checked(self):
+        self.assertFalse(
+            iv.jsonstore_name_duplicate_same_user_update(
+                c.TEST_JSONSTORE_NAME, None, True))
 
-class JsonstorePublicNameDuplicateTest(TestCase):
+
+class JsonstorePublicNameDuplicateTest(SimpleTestCase):
     def test_jsonstore_public_name_duplicate(self):
-        name = c.TEST_JSONSTORE_NAME
         is_public = True
-        user = f.UserFactory()
-
-        other_user = f.UserFactory()
-        f.JsonStoreFactory(user=other_user, name=name, is_public=True)
-        stores_with_same_name = JsonStore.objects.filter(name=name)
+        other_user_public_same_name_exists = True
 
         self.assertTrue(
             iv.jsonstore_public_name_duplicate(
-                name, is_public, user, stores_with_same_name))
+                is_public, other_user_public_same_name_exists))
+
+    def test_private_jsonstore_is_not_checked(self):
+        self.assertFalse(iv.jsonstore_public_name_duplicate(False, True))
 
 
 class JsonstoreDataSizeOverMaxTest(TestCase):
@@ -102,3 +107,35 @@ class AllJsonStoresDataSizeOvermax(TestCase):
         self.assertTrue(
             iv.jsonstore_all_jsonstores_data_size_over_max(
                 user, jsonstore_data_size))
+
+    def test_all_jsonstores_data_size_over_max_update_excludes_obj_size(self):
+        user = f.UserFactory()
+        obj = f.JsonStoreFactory(
+            user=user,
+            data='a' * (sc.MAX_JSONSTORE_ALL_JSONSTORES_DATA_SIZE_USER_FREE -
+                        1024))
+        jsonstore_data_size = obj.data_size
+        user.profile.refresh_from_db()
+
+        # replacing the data with data of the same size fits the allowance
+        self.assertFalse(
+            iv.jsonstore_all_jsonstores_data_size_over_max(
+                user, jsonstore_data_size, obj))
+
+        # creating another jsonstore of the same size does not
+        self.assertTrue(
+            iv.jsonstore_all_jsonstores_data_size_over_max(
+                user, jsonstore_data_size))
+
+    def test_all_jsonstores_data_size_over_max_given_storage_usage(self):
+        user = f.UserFactory()
+        max_all_jsonstores_data_size = \
+            sc.MAX_JSONSTORE_ALL_JSONSTORES_DATA_SIZE_USER_FREE
+
+        self.assertFalse(
+            iv.jsonstore_all_jsonstores_data_size_over_max(
+                user, 1024, all_jsonstores_data_size=0))
+        self.assertTrue(
+            iv.jsonstore_all_jsonstores_data_size_over_max(
+                user, 1024,
+                all_jsonstores_data_size=max_all_jsonstores_data_size))
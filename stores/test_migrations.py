@@ -0,0 +1,59 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+from django_jsonsaver import factories as f
+
+
+class JsonStoreNameUniqueMigrationTest(TransactionTestCase):
+    """0007 renames the duplicate names before adding its constraints."""
+    migrate_from = [('stores', '0006_jsonstore_user_updated_idx')]
+    migrate_to = [('stores', '0007_jsonstore_name_unique')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        # back to the latest migrations, for the other tests
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_duplicate_names_are_renamed_to_free_names(self):
+        user = f.UserFactory()
+        other_user = f.UserFactory()
+        apps = self.migrate(self.migrate_from)
+        JsonStore = apps.get_model('stores', 'JsonStore')
+
+        def create(user, name, is_public=False):
+            return JsonStore.objects.create(
+                user_id=user.pk, name=name, is_public=is_public, data={})
+
+        create(user, 'foo')
+        suffixed = create(user, 'suffixed')
+        duplicate = create(user, 'foo')
+        # an earlier jsonstore already has the duplicate's suffixed name
+        JsonStore.objects.filter(pk=suffixed.pk).update(
+            name=f'foo-{duplicate.pk}')
+        create(user, 'foo', is_public=True)
+        create(user, 'foo')
+        public = create(other_user, 'bar', is_public=True)
+        public_duplicate = create(user, 'bar', is_public=True)
+        create(other_user, '')
+        create(other_user, '')
+
+        apps = self.migrate(self.migrate_to)
+        JsonStore = apps.get_model('stores', 'JsonStore')
+        names = list(JsonStore.objects.filter(user_id=user.pk)
+                     .order_by('pk').values_list('name', flat=True))
+        self.assertEqual(len(set(names)), len(names))
+        self.assertEqual(
+            JsonStore.objects.get(pk=duplicate.pk).name,
+            f'foo-{duplicate.pk}-1')
+        self.assertEqual(
+            JsonStore.objects.get(pk=public.pk).name, 'bar')
+        self.assertEqual(
+            JsonStore.objects.get(pk=public_duplicate.pk).name,
+            f'bar-{public_duplicate.pk}')
@@ -0,0 +1,47 @@
+from django.test import RequestFactory, TestCase
+
+from . import views
+from .models import JsonStore
+from django_jsonsaver import factories as f
+
+
+class JsonStoreObjectMixinTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+        cls.test_jsonstore = f.JsonStoreFactory(user=cls.test_user)
+
+    def setUp(self):
+        self.view = views.JsonStoreDetailView()
+        self.view.setup(
+            RequestFactory().get('/'), jsonstore_pk=self.test_jsonstore.pk)
+
+    # METHODS #
+
+    # get_object()
+    def test_method_get_object_loads_jsonstore_once(self):
+        with self.assertNumQueries(1):
+            jsonstore = self.view.get_object()
+            self.assertIs(self.view.get_object(), jsonstore)
+        self.assertEqual(jsonstore, self.test_jsonstore)
+
+    def test_method_get_object_loads_user(self):
+        jsonstore = self.view.get_object()
+        with self.assertNumQueries(0):
+            self.assertEqual(jsonstore.user, self.test_user)
+
+    def test_method_get_object_with_queryset_is_not_memoized(self):
+        jsonstore = self.view.get_object()
+        self.assertIsNot(
+            self.view.get_object(JsonStore.objects.all()), jsonstore)
+
+    def test_method_get_object_of_name_views_filters_queryset(self):
+        request = RequestFactory().get('/')
+        request.user = self.test_user
+        for view_class in [views.JsonStoreNameDetailView,
+                           views.JsonStorePublicDetailView]:
+            view = view_class()
+            view.setup(request, jsonstore_name=self.test_jsonstore.name)
+            self.assertEqual(
+                view.get_object(JsonStore.objects.all()), self.test_jsonstore)
+            self.assertIsNone(view.get_object(JsonStore.objects.none()))
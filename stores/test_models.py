@@ -92,6 +92,56 @@ class JsonStoreModelTest(TestCase):
         blank = self.test_jsonstore._meta.get_field('data').blank
         self.assertEqual(blank, True)
 
+    # data_size
+    def test_field_data_size_verbose_name(self):
+        verbose_name = \
+            self.test_jsonstore._meta.get_field('data_size').verbose_name
+        self.assertEqual(verbose_name, 'data size')
+
+    def test_field_data_size_field_type(self):
+        field_type = self.test_jsonstore._meta.get_field(
+            'data_size').get_internal_type()
+        self.assertEqual(field_type, 'PositiveIntegerField')
+
+    def test_field_data_size_default(self):
+        default = self.test_jsonstore._meta.get_field('data_size').default
+        self.assertEqual(default, 0)
+
+    def test_field_data_size_db_index(self):
+        db_index = self.test_jsonstore._meta.get_field('data_size').db_index
+        self.assertEqual(db_index, True)
+
+    def test_field_data_size_editable(self):
+        editable = self.test_jsonstore._meta.get_field('data_size').editable
+        self.assertEqual(editable, False)
+
+    # data_hash
+    def test_field_data_hash_field_type(self):
+        field_type = self.test_jsonstore._meta.get_field(
+            'data_hash').get_internal_type()
+        self.assertEqual(field_type, 'CharField')
+
+    def test_field_data_hash_max_length(self):
+        max_length = self.test_jsonstore._meta.get_field(
+            'data_hash').max_length
+        self.assertEqual(max_length, 64)
+
+    def test_field_data_hash_editable(self):
+        editable = self.test_jsonstore._meta.get_field('data_hash').editable
+        self.assertEqual(editable, False)
+
+    # data_key_count
+    def test_field_data_key_count_editable(self):
+        editable = \
+            self.test_jsonstore._meta.get_field('data_key_count').editable
+        self.assertEqual(editable, False)
+
+    # data_preview
+    def test_field_data_preview_max_length(self):
+        max_length = self.test_jsonstore._meta.get_field(
+            'data_preview').max_length
+        self.assertEqual(max_length, c.JSONSTORE_DATA_PREVIEW_LENGTH)
+
     # is_public
     def test_field_is_public_verbose_name(self):
         verbose_name = \
@@ -146,6 +196,58 @@ class JsonStoreModelTest(TestCase):
             f"is_public: {test_jsonstore_with_empty_name.is_public}"
         self.assertEqual(str(test_jsonstore_with_empty_name), expected_string)
 
+    # save()
+    def test_method_save_sets_data_size(self):
+        self.assertEqual(
+            self.test_jsonstore.data_size,
+            h.get_json_size(self.test_jsonstore.data))
+
+    def test_method_save_updates_data_size_when_data_changes(self):
+        jsonstore = f.JsonStoreFactory(user=self.test_user)
+        jsonstore.data = {'message': 'a' * 1024}
+        jsonstore.save()
+        jsonstore.refresh_from_db()
+        self.assertEqual(
+            jsonstore.data_size, h.get_json_size({'message': 'a' * 1024}))
+
+    def test_method_save_with_update_fields_including_data(self):
+        jsonstore = f.JsonStoreFactory(user=self.test_user)
+        jsonstore.data = {'message': 'a' * 1024}
+        jsonstore.save(update_fields=['data'])
+        jsonstore.refresh_from_db()
+        self.assertEqual(
+            jsonstore.data_size, h.get_json_size({'message': 'a' * 1024}))
+
+    def test_method_save_with_update_fields_excluding_data(self):
+        jsonstore = f.JsonStoreFactory(user=self.test_user)
+        original_data_size = jsonstore.data_size
+        jsonstore.data = {'message': 'a' * 1024}
+        jsonstore.save(update_fields=['is_public'])
+        self.assertEqual(jsonstore.data_size, original_data_size)
+
+    def test_method_save_sets_data_hash(self):
+        self.assertEqual(
+            self.test_jsonstore.data_hash,
+            h.get_json_hash(self.test_jsonstore.data))
+
+    def test_method_save_with_update_fields_including_data_sets_data_hash(
+            self):
+        jsonstore = f.JsonStoreFactory(user=self.test_user)
+        jsonstore.data = {'message': 'a' * 1024}
+        jsonstore.save(update_fields=['data'])
+        jsonstore.refresh_from_db()
+        self.assertEqual(
+            jsonstore.data_hash, h.get_json_hash({'message': 'a' * 1024}))
+
+    def test_method_save_sets_data_summary(self):
+        jsonstore = f.JsonStoreFactory(user=self.test_user)
+        jsonstore.data = {'a': 'x' * 1024, 'b': 2}
+        jsonstore.save(update_fields=['data'])
+        jsonstore.refresh_from_db()
+        self.assertEqual(jsonstore.data_key_count, 2)
+        self.assertEqual(jsonstore.data_preview, h.get_json_preview(
+            jsonstore.data, c.JSONSTORE_DATA_PREVIEW_LENGTH))
+
     # get_absolute_url()
     def test_get_absolute_url(self):
         expected_url = reverse('stores:jsonstore_detail', kwargs={
@@ -155,7 +257,11 @@ class JsonStoreModelTest(TestCase):
     def test_get_data_size(self):
         self.assertEqual(
             self.test_jsonstore.get_data_size(),
-            h.bytes_to_kb(h.get_obj_size(self.test_jsonstore.data)))
+            h.bytes_to_kb(h.get_json_size(self.test_jsonstore.data)))
+
+    def test_get_data_size_uses_stored_data_size(self):
+        jsonstore = JsonStore(data={}, data_size=4096)
+        self.assertEqual(jsonstore.get_data_size(), 4)
 
     # FUNCTIONAL #
     def test_model_object_content_and_methods(self):
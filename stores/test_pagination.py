@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from . import pagination
+from .models import JsonStore
+from django_jsonsaver import factories as f
+
+
+class CursorTest(TestCase):
+    def test_decode_cursor_returns_encoded_position(self):
+        jsonstore = f.JsonStoreFactory()
+        self.assertEqual(
+            pagination.decode_cursor(pagination.encode_cursor(jsonstore)),
+            (jsonstore.updated_at, jsonstore.pk))
+
+    def test_invalid_cursors_raise_invalid_cursor(self):
+        for cursor in ['', 'invalid', 'é', 'YSxi', 'MjAyMSwx']:
+            with self.assertRaises(pagination.InvalidCursor, msg=cursor):
+                pagination.decode_cursor(cursor)
+
+
+class GetPageTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+        for i in range(5):
+            f.JsonStoreFactory(user=cls.test_user)
+        # jsonstores with the same updated_at are ordered by id
+        JsonStore.objects.filter(user=cls.test_user) \
+            .update(updated_at=timezone.now() - timedelta(days=1))
+        f.JsonStoreFactory(user=cls.test_user)
+        cls.queryset = JsonStore.objects.filter(user=cls.test_user)
+        cls.expected_pks = list(cls.queryset.order_by('-updated_at', '-id')
+                                .values_list('pk', flat=True))
+
+    def test_pages_cover_queryset_in_order(self):
+        pks = []
+        page = pagination.get_page(self.queryset, None, 2)
+        self.assertFalse(page.has_previous())
+        while True:
+            pks += [jsonstore.pk for jsonstore in page]
+            if not page.has_next():
+                break
+            page = pagination.get_page(self.queryset, page.next_cursor, 2)
+            self.assertTrue(page.has_previous())
+        self.assertEqual(pks, self.expected_pks)
+
+    def test_last_full_page_has_no_next_page(self):
+        page = pagination.get_page(self.queryset, None, 6)
+        self.assertEqual(len(page), 6)
+        self.assertFalse(page.has_next())
+        self.assertFalse(page.has_other_pages())
+
+    def test_page_uses_one_query(self):
+        cursor = pagination.get_page(self.queryset, None, 2).next_cursor
+        with self.assertNumQueries(1):
+            pagination.get_page(self.queryset, cursor, 2)
@@ -0,0 +1,317 @@
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+
+from . import cache, patches
+from .models import JsonStore
+from django_jsonsaver import factories as f, helpers as h
+
+
+class ParseJsonPointerTest(SimpleTestCase):
+    def test_root(self):
+        self.assertEqual(patches.parse_json_pointer(''), [])
+
+    def test_escaped_tokens(self):
+        self.assertEqual(
+            patches.parse_json_pointer('/a~1b/m~0n/~01/0/'),
+            ['a/b', 'm~n', '~1', '0', ''])
+
+    def test_invalid_pointers_raise_patch_error(self):
+        for pointer in ['a/b', 1, None]:
+            with self.assertRaises(patches.PatchError):
+                patches.parse_json_pointer(pointer)
+
+
+class ParseDataPathTest(SimpleTestCase):
+    def test_json_pointer(self):
+        self.assertEqual(
+            patches.parse_data_path('/items/0/a~1b'), ['items', '0', 'a/b'])
+
+    def test_json_pointer_without_leading_slash(self):
+        self.assertEqual(
+            patches.parse_data_path('items/0/a.b'), ['items', '0', 'a.b'])
+
+    def test_dotted_path(self):
+        self.assertEqual(
+            patches.parse_data_path('items.0.name'), ['items', '0', 'name'])
+        self.assertEqual(patches.parse_data_path('items'), ['items'])
+
+
+class ArrayIndexTest(SimpleTestCase):
+    def test_is_array_index(self):
+        for token in ['0', '1', '10']:
+            self.assertTrue(patches.is_array_index(token), token)
+        for token in ['', '-', '-1', '+1', '01', '00', ' 1', '1.0', '١']:
+            self.assertFalse(patches.is_array_index(token), token)
+
+    def test_can_resolve_in_database(self):
+        self.assertTrue(patches.can_resolve_in_database([]))
+        self.assertTrue(
+            patches.can_resolve_in_database(['items', '0', '-', 'a-1']))
+        for token in ['-1', '+1', '01', '00']:
+            self.assertFalse(
+                patches.can_resolve_in_database(['items', token]), token)
+
+    def test_non_canonical_array_index_does_not_resolve(self):
+        for token in ['-1', '01', '+1']:
+            with self.assertRaises(patches.PatchError):
+                patches.resolve_json_pointer({'a': [1, 2]}, ['a', token])
+        self.assertEqual(
+            patches.resolve_json_pointer({'a': {'-1': 1}}, ['a', '-1']), 1)
+
+
+class ApplyJsonPatchTest(SimpleTestCase):
+    def apply(self, doc, patch):
+        """Applies patch and checks that its size delta is exact."""
+        doc_size = h.get_json_size(doc)
+        doc, size_delta = patches.apply_json_patch(doc, patch)
+        self.assertEqual(h.get_json_size(doc), doc_size + size_delta)
+        return doc
+
+    def test_add_object_member(self):
+        self.assertEqual(
+            self.apply({'foo': 'bar'},
+                       [{'op': 'add', 'path': '/baz', 'value': 'qux'}]),
+            {'foo': 'bar', 'baz': 'qux'})
+        self.assertEqual(
+            self.apply({}, [{'op': 'add', 'path': '/a', 'value': [1]}]),
+            {'a': [1]})
+
+    def test_add_array_element(self):
+        self.assertEqual(
+            self.apply({'foo': ['bar', 'baz']},
+                       [{'op': 'add', 'path': '/foo/1', 'value': 'qux'}]),
+            {'foo': ['bar', 'qux', 'baz']})
+        self.assertEqual(
+            self.apply({'foo': []},
+                       [{'op': 'add', 'path': '/foo/-', 'value': 1}]),
+            {'foo': [1]})
+
+    def test_add_replaces_existing_member(self):
+        self.assertEqual(
+            self.apply({'foo': 1},
+                       [{'op': 'add', 'path': '/foo', 'value': 'long'}]),
+            {'foo': 'long'})
+
+    def test_remove(self):
+        self.assertEqual(
+            self.apply({'baz': 'qux', 'foo': 'bar'},
+                       [{'op': 'remove', 'path': '/baz'}]),
+            {'foo': 'bar'})
+        self.assertEqual(
+            self.apply({'foo': ['bar', 'qux', 'baz']},
+                       [{'op': 'remove', 'path': '/foo/1'}]),
+            {'foo': ['bar', 'baz']})
+        self.assertEqual(
+            self.apply({'a': [1]}, [{'op': 'remove', 'path': '/a/0'}]),
+            {'a': []})
+
+    def test_replace(self):
+        self.assertEqual(
+            self.apply({'baz': 'qux', 'foo': 'bar'},
+                       [{'op': 'replace', 'path': '/baz', 'value': 'boo'}]),
+            {'baz': 'boo', 'foo': 'bar'})
+        self.assertEqual(
+            self.apply({'a': [1, 2]},
+                       [{'op': 'replace', 'path': '/a/1', 'value': {}}]),
+            {'a': [1, {}]})
+
+    def test_replace_keeps_member_order(self):
+        doc = self.apply({'a': 1, 'b': 2},
+                         [{'op': 'replace', 'path': '/a', 'value': 3}])
+        self.assertEqual(list(doc), ['a', 'b'])
+
+    def test_replace_root(self):
+        self.assertEqual(
+            self.apply({'a': 1}, [{'op': 'replace', 'path': '', 'value': []}]),
+            [])
+
+    def test_move(self):
+        self.assertEqual(
+            self.apply(
+                {'foo': {'bar': 'baz', 'waldo': 'fred'},
+                 'qux': {'corge': 'grault'}},
+                [{'op': 'move', 'from': '/foo/waldo',
+                  'path': '/qux/thud'}]),
+            {'foo': {'bar': 'baz'},
+             'qux': {'corge': 'grault', 'thud': 'fred'}})
+        self.assertEqual(
+            self.apply({'foo': ['all', 'grass', 'cows', 'eat']},
+                       [{'op': 'move', 'from': '/foo/1', 'path': '/foo/3'}]),
+            {'foo': ['all', 'cows', 'eat', 'grass']})
+
+    def test_move_into_child_raises_patch_error(self):
+        with self.assertRaises(patches.PatchError):
+            patches.apply_json_patch(
+                {'a': {'b': {}}},
+                [{'op': 'move', 'from': '/a', 'path': '/a/b/c'}])
+
+    def test_copy_does_not_share_values(self):
+        doc = self.apply(
+            {'a': {'b': 1}}, [{'op': 'copy', 'from': '/a', 'path': '/c'}])
+        doc['c']['b'] = 2
+        self.assertEqual(doc['a'], {'b': 1})
+
+    def test_test(self):
+        doc = {'baz': 'qux', 'foo': ['a', 2, 'c'], 'n': 1.0}
+        self.assertEqual(self.apply(doc, [
+            {'op': 'test', 'path': '/baz', 'value': 'qux'},
+            {'op': 'test', 'path': '/foo/1', 'value': 2},
+            {'op': 'test', 'path': '/n', 'value': 1}]), doc)
+
+    def test_failed_test_raises_patch_error(self):
+        for value in ['bar', True, 1.5]:
+            with self.assertRaises(patches.PatchError):
+                patches.apply_json_patch(
+                    {'baz': 1},
+                    [{'op': 'test', 'path': '/baz', 'value': value}])
+
+    def test_missing_paths_raise_patch_error(self):
+        for patch in [
+                [{'op': 'add', 'path': '/baz/bat', 'value': 'qux'}],
+                [{'op': 'remove', 'path': '/missing'}],
+                [{'op': 'replace', 'path': '/list/5', 'value': 1}],
+                [{'op': 'add', 'path': '/list/01', 'value': 1}],
+                [{'op': 'copy', 'from': '/missing', 'path': '/a'}]]:
+            with self.assertRaises(patches.PatchError):
+                patches.apply_json_patch({'list': [1]}, patch)
+
+    def test_malformed_patches_raise_patch_error(self):
+        for patch in [{}, [1], [{'op': 'invalid', 'path': '/a'}],
+                      [{'op': 'add', 'path': '/a'}],
+                      [{'op': 'move', 'path': '/a'}]]:
+            with self.assertRaises(patches.PatchError):
+                patches.apply_json_patch({}, patch)
+
+
+class ApplyMergePatchTest(SimpleTestCase):
+    def apply(self, doc, patch):
+        """Applies patch and checks that its size delta is exact."""
+        doc_size = h.get_json_size(doc)
+        doc, size_delta = patches.apply_merge_patch(doc, patch)
+        self.assertEqual(h.get_json_size(doc), doc_size + size_delta)
+        return doc
+
+    def test_rfc_7396_examples(self):
+        for doc, patch, expected in [
+                ({'a': 'b'}, {'a': 'c'}, {'a': 'c'}),
+                ({'a': 'b'}, {'b': 'c'}, {'a': 'b', 'b': 'c'}),
+                ({'a': 'b'}, {'a': None}, {}),
+                ({'a': 'b', 'b': 'c'}, {'a': None}, {'b': 'c'}),
+                ({'a': ['b']}, {'a': 'c'}, {'a': 'c'}),
+                ({'a': 'c'}, {'a': ['b']}, {'a': ['b']}),
+                ({'a': {'b': 'c'}}, {'a': {'b': 'd', 'c': None}},
+                 {'a': {'b': 'd'}}),
+                ({'a': [{'b': 'c'}]}, {'a': [1]}, {'a': [1]}),
+                (['a', 'b'], ['c', 'd'], ['c', 'd']),
+                ({'a': 'b'}, ['c'], ['c']),
+                ({'a': 'foo'}, None, None),
+                ({'a': 'foo'}, 'bar', 'bar'),
+                ({'e': None}, {'a': 1}, {'e': None, 'a': 1}),
+                ([1, 2], {'a': 'b', 'c': None}, {'a': 'b'}),
+                ({}, {'a': {'bb': {'ccc': None}}}, {'a': {'bb': {}}})]:
+            self.assertEqual(self.apply(doc, patch), expected)
+
+
+class PatchJsonStoreDataTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+
+    def setUp(self):
+        self.test_jsonstore = f.JsonStoreFactory(
+            user=self.test_user, data={'a': 1, 'b': [1, 2]}, is_public=True)
+        self.queryset = JsonStore.objects.filter(pk=self.test_jsonstore.pk)
+
+    def test_json_patch_updates_data_and_derived_fields(self):
+        patches.patch_jsonstore_data(
+            self.queryset,
+            [{'op': 'replace', 'path': '/a', 'value': 'x' * 100},
+             {'op': 'remove', 'path': '/b/0'}],
+            patches.JSON_PATCH)
+        jsonstore = self.queryset.get()
+        expected_data = {'a': 'x' * 100, 'b': [2]}
+        self.assertEqual(jsonstore.data, expected_data)
+        self.assertEqual(jsonstore.data_size, h.get_json_size(expected_data))
+        self.assertEqual(jsonstore.data_hash, h.get_json_hash(expected_data))
+        self.assertEqual(jsonstore.data_key_count, 2)
+        self.assertEqual(
+            jsonstore.data_preview, h.get_json_preview(expected_data, 100))
+        self.assertGreater(
+            jsonstore.updated_at, self.test_jsonstore.updated_at)
+
+    def test_patch_derived_fields_match_save(self):
+        patches.patch_jsonstore_data(
+            self.queryset,
+            [{'op': 'replace', 'path': '/a', 'value': {'z': 1, 'y': 'é'}},
+             {'op': 'replace', 'path': '/b/1', 'value': 2.5}],
+            patches.JSON_PATCH)
+        patched_jsonstore = self.queryset.get()
+        saved_jsonstore = f.JsonStoreFactory(
+            user=self.test_user, data=patched_jsonstore.data)
+        for field in JsonStore.data_metadata_fields:
+            self.assertEqual(
+                getattr(patched_jsonstore, field),
+                getattr(saved_jsonstore, field))
+
+    def test_merge_patch_updates_data(self):
+        patches.patch_jsonstore_data(
+            self.queryset, {'a': None, 'c': True}, patches.MERGE_PATCH)
+        self.assertEqual(self.queryset.get().data, {'b': [1, 2], 'c': True})
+
+    def test_patch_updates_all_jsonstores_data_size(self):
+        patches.patch_jsonstore_data(
+            self.queryset, {'c': 'x' * 100}, patches.MERGE_PATCH)
+        self.test_user.profile.refresh_from_db()
+        self.assertEqual(
+            self.test_user.profile.get_all_jsonstores_data_size(),
+            self.queryset.get().data_size)
+
+    def test_shrinking_patch_of_jsonstore_without_data_size(self):
+        # e.g. a jsonstore that has not been backfilled yet
+        self.queryset.update(data_size=0)
+        patches.patch_jsonstore_data(
+            self.queryset, {'b': None}, patches.MERGE_PATCH)
+        jsonstore = self.queryset.get()
+        self.assertEqual(jsonstore.data, {'a': 1})
+        self.assertEqual(jsonstore.data_size, 0)
+
+    def test_patch_deletes_cached_public_jsonstore(self):
+        cache.set_cached_public_jsonstore(
+            self.test_jsonstore.name, b'{}', '', None)
+        patches.patch_jsonstore_data(
+            self.queryset, {'c': 1}, patches.MERGE_PATCH)
+        self.assertIsNone(
+            cache.get_cached_public_jsonstore(self.test_jsonstore.name))
+
+    def test_patch_over_max_data_size_raises_validation_error(self):
+        max_jsonstore_data_size = \
+            self.test_user.profile.get_max_jsonstore_data_size()
+        with self.assertRaises(ValidationError) as cm:
+            patches.patch_jsonstore_data(
+                self.queryset, {'c': 'x' * max_jsonstore_data_size},
+                patches.MERGE_PATCH)
+        self.assertEqual(
+            cm.exception.error_list[0].code, 'jsonstore_data_size_over_max')
+        self.assertEqual(self.queryset.get().data, self.test_jsonstore.data)
+
+    def test_failed_patch_does_not_update_jsonstore(self):
+        with self.assertRaises(patches.PatchError):
+            patches.patch_jsonstore_data(
+                self.queryset,
+                [{'op': 'replace', 'path': '/a', 'value': 2},
+                 {'op': 'test', 'path': '/a', 'value': 1}],
+                patches.JSON_PATCH)
+        self.assertEqual(self.queryset.get().data, self.test_jsonstore.data)
+
+    def test_precondition_is_called_with_jsonstore(self):
+        def precondition(jsonstore):
+            self.assertEqual(jsonstore, self.test_jsonstore)
+            raise patches.PatchError()
+
+        with self.assertRaises(patches.PatchError):
+            patches.patch_jsonstore_data(
+                self.queryset, {}, patches.MERGE_PATCH, precondition)
+
+    def test_empty_queryset_returns_none(self):
+        self.assertIsNone(patches.patch_jsonstore_data(
+            JsonStore.objects.none(), {}, patches.MERGE_PATCH))
@@ -0,0 +1,73 @@
+from django.db import connection
+from django.test import TestCase
+
+from . import pagination
+from .models import JsonStore
+from django_jsonsaver import factories as f
+
+
+class JsonStoreLookupQueryPlanTest(TestCase):
+    """The jsonstore lookups by name are served by their indexes."""
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+        users = [cls.test_user] + [f.UserFactory() for i in range(9)]
+        JsonStore.objects.bulk_create([
+            JsonStore(user=users[i % len(users)], name=f'name-{i}',
+                      is_public=i % 2 == 0)
+            for i in range(2000)])
+        if connection.vendor == 'postgresql':
+            # so that the planner knows how large the table has grown
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {JsonStore._meta.db_table}')
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        if connection.vendor == 'postgresql':
+            self.assertNotIn('Seq Scan', plan)
+
+    def test_user_name_lookup(self):
+        # the views' query
+        queryset = JsonStore.objects.filter(
+            name='name-10', user__id=self.test_user.id)
+        if connection.vendor == 'sqlite':
+            # SQLite only uses a partial index if the query repeats its
+            # condition, so the lookup searches the user's jsonstores
+            plan = queryset.explain()
+            self.assertIn('USING INDEX stores_jsonstore_user_id_', plan)
+            self.assertNotIn('SCAN', plan)
+        else:
+            self.assertUsesIndex(queryset, 'jsonstore_user_name_unique')
+
+    def test_public_name_lookup(self):
+        self.assertUsesIndex(
+            JsonStore.objects.filter(name='name-10', is_public=True),
+            'jsonstore_public_name_unique')
+
+    def test_other_user_public_name_lookup(self):
+        self.assertUsesIndex(
+            JsonStore.objects.filter(name='name-10', is_public=True)
+            .exclude(user=self.test_user),
+            'jsonstore_public_name_unique')
+
+    def test_user_list(self):
+        self.assertUsesIndex(
+            JsonStore.objects.filter(user=self.test_user)
+            .order_by('-updated_at', '-id')[:25],
+            'jsonstore_user_updated_idx')
+
+    def test_user_list_cursor_page(self):
+        cursor = pagination.encode_cursor(
+            JsonStore.objects.filter(user=self.test_user)
+            .order_by(*pagination.ORDERING)[100])
+        queryset = pagination.get_page_queryset(
+            JsonStore.objects.filter(user=self.test_user), cursor)[:25]
+        self.assertUsesIndex(queryset, 'jsonstore_user_updated_idx')
+        plan = queryset.explain()
+        if connection.vendor == 'sqlite':
+            # the cursor bounds the index range, rather than filtering rows
+            self.assertIn('updated_at<', plan)
+        elif connection.vendor == 'postgresql':
+            self.assertIn('Index Cond', plan)
+            self.assertIn('updated_at <=', plan)
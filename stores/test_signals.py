@@ -0,0 +1,36 @@
+from django.test import TestCase
+
+from . import cache
+from django_jsonsaver import factories as f
+
+
+class JsonStoreSignalsTest(TestCase):
+    def setUp(self):
+        cache.get_public_jsonstore_cache().clear()
+        self.test_jsonstore = f.JsonStoreFactory(is_public=True)
+        cache.set_cached_public_jsonstore(
+            self.test_jsonstore.name, b'{}', self.test_jsonstore.data_hash,
+            self.test_jsonstore.updated_at)
+
+    def test_jsonstore_save_deletes_cached_public_jsonstore(self):
+        self.test_jsonstore.data = {'message': 'updated'}
+        self.test_jsonstore.save()
+        self.assertIsNone(
+            cache.get_cached_public_jsonstore(self.test_jsonstore.name))
+
+    def test_jsonstore_rename_deletes_cached_public_jsonstore_of_old_name(
+            self):
+        old_name = self.test_jsonstore.name
+        self.test_jsonstore.name = 'new-name'
+        self.test_jsonstore.save()
+        self.assertIsNone(cache.get_cached_public_jsonstore(old_name))
+
+    def test_jsonstore_delete_deletes_cached_public_jsonstore(self):
+        self.test_jsonstore.delete()
+        self.assertIsNone(
+            cache.get_cached_public_jsonstore(self.test_jsonstore.name))
+
+    def test_other_jsonstore_save_keeps_cached_public_jsonstore(self):
+        f.JsonStoreFactory()
+        self.assertIsNotNone(
+            cache.get_cached_public_jsonstore(self.test_jsonstore.name))
@@ -47,7 +47,7 @@ class JsonStoreListTemplateTest(TestCase):
         html = response.content.decode('utf-8')
         soup = bs(html, 'html5lib')
         self.assertIsNone(soup.find(id='page-link-first'))
-        self.assertIsNone(soup.find(id='page-link-last'))
+        self.assertIsNone(soup.find(id='page-link-next'))
 
     def test_large_item_count_is_paginated(self):
         while self.test_user.jsonstore_set.count() < \
@@ -57,7 +57,15 @@ class JsonStoreListTemplateTest(TestCase):
         self.assertTrue(response.context['is_paginated'])
         html = response.content.decode('utf-8')
         soup = bs(html, 'html5lib')
-        self.assertIsNotNone(soup.find(id='page-link-last'))
+        next_link = soup.find(id='page-link-next')
+        self.assertIsNotNone(next_link)
+
+        # the next page is the last one
+        response = self.client.get(self.test_url + next_link['href'])
+        self.assertEqual(len(response.context['jsonstores']), 1)
+        soup = bs(response.content.decode('utf-8'), 'html5lib')
+        self.assertIsNotNone(soup.find(id='page-link-first'))
+        self.assertIsNone(soup.find(id='page-link-next'))
 
 
 class JsonStoreDetailTemplateTest(TestCase):
@@ -0,0 +1,241 @@
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory
+
+from . import validation
+from .forms import JsonStoreForm
+from .models import JsonStore
+from api.serializers import JsonStoreSerializer
+from django_jsonsaver import constants as c, factories as f, helpers as h
+from users.models import Profile
+
+UserModel = get_user_model()
+
+
+class GetJsonStoreValidationProfileTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+        cls.test_jsonstore = f.JsonStoreFactory(
+            user=cls.test_user, name=c.TEST_JSONSTORE_NAME)
+        f.JsonStoreFactory(user=cls.test_user)
+        cls.other_user = f.UserFactory()
+        f.JsonStoreFactory(
+            user=cls.other_user, name='other-public-name', is_public=True)
+
+    def test_jsonstore_count(self):
+        profile = validation.get_jsonstore_validation_profile(self.test_user)
+        self.assertEqual(profile.jsonstore_count, 2)
+
+    def test_jsonstore_count_with_no_jsonstores(self):
+        profile = validation.get_jsonstore_validation_profile(
+            f.UserFactory())
+        self.assertEqual(profile.jsonstore_count, 0)
+
+    def test_all_jsonstores_data_size_is_current(self):
+        profile = validation.get_jsonstore_validation_profile(self.test_user)
+        self.assertEqual(
+            profile.get_all_jsonstores_data_size(),
+            2 * h.get_json_size(c.TEST_JSONSTORE_DATA))
+
+    def test_profile_is_cached_on_user(self):
+        user = UserModel.objects.get(pk=self.test_user.pk)
+        profile = validation.get_jsonstore_validation_profile(user)
+        with self.assertNumQueries(0):
+            self.assertIs(user.profile, profile)
+
+    def test_uses_one_query(self):
+        user = UserModel.objects.get(pk=self.test_user.pk)
+        with self.assertNumQueries(1):
+            validation.get_jsonstore_validation_profile(user)
+
+
+class GetJsonStoreNameErrorsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+        cls.test_jsonstore = f.JsonStoreFactory(
+            user=cls.test_user, name=c.TEST_JSONSTORE_NAME)
+        f.JsonStoreFactory(name='other-public-name', is_public=True)
+
+    def get_error_codes(self, *args):
+        return [error.code for _, error in
+                validation.get_jsonstore_name_errors(
+                    self.test_user.id, *args)]
+
+    def test_same_user_same_name(self):
+        self.assertEqual(
+            self.get_error_codes(None, c.TEST_JSONSTORE_NAME, False),
+            ['jsonstore_name_duplicate_same_user_create'])
+        self.assertEqual(
+            self.get_error_codes(
+                f.JsonStoreFactory(user=self.test_user),
+                c.TEST_JSONSTORE_NAME, False),
+            ['jsonstore_name_duplicate_same_user_update'])
+
+    def test_same_user_same_name_excludes_obj(self):
+        self.assertEqual(
+            self.get_error_codes(
+                self.test_jsonstore, c.TEST_JSONSTORE_NAME, False), [])
+
+    def test_other_user_public_same_name(self):
+        self.assertEqual(
+            self.get_error_codes(None, 'other-public-name', True),
+            ['jsonstore_public_name_duplicate'])
+        self.assertEqual(
+            self.get_error_codes(None, 'other-public-name', False), [])
+
+    def test_blank_name_returns_no_errors(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_error_codes(None, '', False), [])
+
+
+class SaveJsonStoreTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+        f.JsonStoreFactory(user=cls.test_user, name=c.TEST_JSONSTORE_NAME)
+
+    def test_saves_jsonstore_without_checking_names(self):
+        jsonstore = JsonStore(user=self.test_user, name='new-name')
+        # savepoint, jsonstore counter update, savepoint, insert, storage
+        # usage counter update, two releases
+        with self.assertNumQueries(7):
+            validation.save_jsonstore(jsonstore)
+        self.assertIsNotNone(jsonstore.pk)
+        self.test_user.profile.refresh_from_db()
+        self.assertEqual(self.test_user.profile.jsonstore_count, 2)
+
+    def test_jsonstore_count_over_max_raises_validation_error(self):
+        max_jsonstore_count = self.test_user.profile.get_max_jsonstore_count()
+        Profile.objects.filter(user=self.test_user).update(
+            jsonstore_count=max_jsonstore_count)
+        with self.assertRaises(ValidationError) as cm:
+            validation.save_jsonstore(JsonStore(user=self.test_user))
+        self.assertEqual(
+            [error.code for error in cm.exception.error_list],
+            ['jsonstore_user_jsonstore_count_over_max'])
+        self.assertEqual(self.test_user.jsonstore_set.count(), 1)
+
+    def test_update_is_not_counted(self):
+        jsonstore = self.test_user.jsonstore_set.get()
+        jsonstore.data = {'a': 1}
+        validation.save_jsonstore(jsonstore)
+        self.test_user.profile.refresh_from_db()
+        self.assertEqual(self.test_user.profile.jsonstore_count, 1)
+
+    def test_duplicate_name_raises_validation_error(self):
+        jsonstore = JsonStore(user=self.test_user, name=c.TEST_JSONSTORE_NAME)
+        with self.assertRaises(ValidationError) as cm:
+            validation.save_jsonstore(jsonstore)
+        self.assertEqual(
+            [error.code for error in cm.exception.error_dict['name']],
+            ['jsonstore_name_duplicate_same_user_create'])
+        self.assertEqual(
+            self.test_user.jsonstore_set
+            .filter(name=c.TEST_JSONSTORE_NAME).count(), 1)
+
+        # the jsonstore is not counted either
+        self.test_user.profile.refresh_from_db()
+        self.assertEqual(self.test_user.profile.jsonstore_count, 1)
+
+    def test_blank_names_may_repeat(self):
+        for i in range(2):
+            validation.save_jsonstore(JsonStore(user=self.test_user, name=''))
+        self.assertEqual(
+            self.test_user.jsonstore_set.filter(name='').count(), 2)
+
+    def test_public_names_are_unique_across_users(self):
+        f.JsonStoreFactory(name='public-name', is_public=True)
+        jsonstore = JsonStore(
+            user=self.test_user, name='public-name', is_public=True)
+        with self.assertRaises(ValidationError) as cm:
+            validation.save_jsonstore(jsonstore)
+        self.assertEqual(
+            [error.code for error in cm.exception.error_dict['name']],
+            ['jsonstore_public_name_duplicate'])
+
+        # but not among private jsonstores
+        jsonstore.is_public = False
+        validation.save_jsonstore(jsonstore)
+
+
+class GetJsonStoreValidationErrorsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+
+    def test_valid_jsonstore_returns_no_errors(self):
+        errors = validation.get_jsonstore_validation_errors(
+            self.test_user, None, 'valid-name', True, {})
+        self.assertEqual(errors, [])
+
+    def test_errors_are_returned_in_order(self):
+        errors = validation.get_jsonstore_validation_errors(
+            self.test_user, None, '', True, 'a' * 10 ** 7)
+        self.assertEqual(
+            [(field, error.code) for field, error in errors],
+            [('name', 'jsonstore_public_name_cannot_be_blank'),
+             ('data', 'jsonstore_data_size_over_max'),
+             ('data', 'jsonstore_all_jsonstores_data_size_over_max')])
+
+    def test_jsonstore_count_is_only_checked_on_create(self):
+        jsonstore = f.JsonStoreFactory(user=self.test_user)
+        Profile.objects.filter(user=self.test_user).update(
+            jsonstore_count=self.test_user.profile.get_max_jsonstore_count())
+        errors = validation.get_jsonstore_validation_errors(
+            self.test_user, None, 'valid-name', False, {})
+        self.assertEqual(
+            [error.code for _, error in errors],
+            ['jsonstore_user_jsonstore_count_over_max'])
+        errors = validation.get_jsonstore_validation_errors(
+            self.test_user, jsonstore, 'valid-name', False, {})
+        self.assertEqual(errors, [])
+
+
+class JsonStoreWriteValidationQueryCountTest(TestCase):
+    """Validating a jsonstore write uses a single query."""
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+        cls.test_jsonstore = f.JsonStoreFactory(user=cls.test_user)
+
+    def setUp(self):
+        # a fresh user, so that its profile is not already cached
+        self.user = UserModel.objects.get(pk=self.test_user.pk)
+        self.data = {'data': c.TEST_JSONSTORE_DATA,
+                     'name': 'new-name',
+                     'is_public': True}
+
+    def test_form_create(self):
+        form = JsonStoreForm(
+            {**self.data, 'data': '{}'}, user=self.user)
+        with self.assertNumQueries(1):
+            self.assertTrue(form.is_valid())
+
+    def test_form_update(self):
+        form = JsonStoreForm(
+            {**self.data, 'data': '{}'}, instance=self.test_jsonstore,
+            user=self.user, obj=self.test_jsonstore)
+        with self.assertNumQueries(1):
+            self.assertTrue(form.is_valid())
+
+    def test_serializer_create(self):
+        request = APIRequestFactory().post(reverse('api:jsonstore-list'))
+        request.user = self.user
+        serializer = JsonStoreSerializer(
+            data=self.data, context={'request': request})
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid())
+
+    def test_serializer_update(self):
+        request = APIRequestFactory().put(reverse(
+            'api:jsonstore-detail', kwargs={'pk': self.test_jsonstore.pk}))
+        request.user = self.user
+        serializer = JsonStoreSerializer(
+            self.test_jsonstore, data=self.data,
+            context={'request': request})
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid())
@@ -4,6 +4,7 @@ from django.urls import reverse
 from unittest.mock import Mock
 
 from django_jsonsaver import constants as c, factories as f
+from django_jsonsaver import helpers_testing as ht
 from django_jsonsaver.helpers_testing import SetUpTestCaseMixin
 from . import views
 
@@ -55,15 +56,24 @@ class JsonStoreListViewTest(SetUpTestCaseMixin, TestCase):
         qs_repr = repr(self.test_user.jsonstore_set.order_by('-updated_at'))
         self.assertEqual(repr(self.view_instance.get_queryset()), qs_repr)
 
+    def test_method_get_queryset_defers_data(self):
+        self.assertEqual(
+            self.view_instance.get_queryset().query.deferred_loading,
+            ({'data'}, True))
+
     # TEMPLATE #
     def test_small_jsonstore_count_has_no_next_page(self):
-        self.assertFalse(self.context['page_obj'].paginator.page(1).has_next())
+        self.assertFalse(self.context['page_obj'].has_next())
 
     def test_large_jsonstore_count_has_next_page(self):
         for i in range(c.JSONSTORE_LIST_PAGINATE_BY + 1):
             f.JsonStoreFactory(user=self.test_user)
         self.setUp()
-        self.assertTrue(self.context['page_obj'].paginator.page(1).has_next())
+        self.assertTrue(self.context['page_obj'].has_next())
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(self.test_url, {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, 404)
 
 
 class JsonStoreCreateViewTest(SetUpTestCaseMixin, TestCase):
@@ -128,6 +138,17 @@ class JsonStoreCreateViewTest(SetUpTestCaseMixin, TestCase):
         self.view_instance.form_valid(form)  # pass dummy form into form_valid
         self.assertEqual(self.view_instance.object.user, self.test_user)
 
+    def test_method_form_valid_with_duplicate_name_shows_error(self):
+        f.JsonStoreFactory(user=self.test_user, name='duplicate-name')
+        response = self.client.post(
+            self.test_url, {'data': '{}', 'name': 'duplicate-name'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].has_error(
+            'name', 'jsonstore_name_duplicate_same_user_create'))
+        self.assertEqual(
+            self.test_user.jsonstore_set.filter(name='duplicate-name')
+            .count(), 1)
+
     # TEMPLATES #
     def test_template_shows_alert_for_user_with_max_store_count(self):
         pass
@@ -467,6 +488,26 @@ class JsonStoreUpdateViewTest(SetUpTestCaseMixin, TestCase):
         self.assertIn('obj', kwargs)
         self.assertEqual(kwargs['obj'], self.test_jsonstore)
 
+    # form_valid()
+    def test_method_form_valid_saves_jsonstore(self):
+        response = self.client.post(
+            self.test_url, {'data': '{"a": 1}', 'name': 'new-name'})
+        self.assertRedirects(
+            response, self.test_jsonstore.get_absolute_url(),
+            fetch_redirect_response=False)
+        jsonstore = self.test_user.jsonstore_set.get(
+            pk=self.test_jsonstore.pk)
+        self.assertEqual(jsonstore.data, {'a': 1})
+        self.assertEqual(jsonstore.name, 'new-name')
+
+    def test_method_form_valid_with_duplicate_name_shows_error(self):
+        f.JsonStoreFactory(user=self.test_user, name='duplicate-name')
+        response = self.client.post(
+            self.test_url, {'data': '{}', 'name': 'duplicate-name'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].has_error(
+            'name', 'jsonstore_name_duplicate_same_user_update'))
+
 
 class JsonStoreDeleteViewTest(SetUpTestCaseMixin, TestCase):
     @classmethod
@@ -533,3 +574,32 @@ class JsonStoreDeleteViewTest(SetUpTestCaseMixin, TestCase):
         # new_jsonstore_count = JsonStore.objects.count()
         # self.assertEqual(old_jsonstore_count - 1, new_jsonstore_count)
         pass
+
+
+class StoresViewQueryBudgetTest(ht.QueryBudgetTestCaseMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+        cls.test_jsonstores = [
+            f.JsonStoreFactory(user=cls.test_user, is_public=i % 2 == 0)
+            for i in range(5)]
+        cls.other_jsonstore = f.JsonStoreFactory(is_public=True)
+        cls.test_url = reverse('stores:jsonstore_list')
+
+    def get_query_budgets(self):
+        jsonstore = self.test_jsonstores[0]
+        return {
+            reverse('stores:jsonstore_list'): 4,
+            reverse('stores:jsonstore_create'): 3,
+            jsonstore.get_absolute_url(): 3,
+            reverse('stores:jsonstore_lookup'): 2,
+            reverse('stores:jsonstore_detail_name', kwargs={
+                'jsonstore_name': jsonstore.name}): 3,
+            reverse('stores:jsonstore_lookup_public'): 2,
+            reverse('stores:jsonstore_detail_public', kwargs={
+                'jsonstore_name': self.other_jsonstore.name}): 3,
+            reverse('stores:jsonstore_update', kwargs={
+                'jsonstore_pk': jsonstore.pk}): 3,
+            reverse('stores:jsonstore_delete', kwargs={
+                'jsonstore_pk': jsonstore.pk}): 3,
+        }
@@ -0,0 +1,205 @@
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from . import invalidators
+from .models import JsonStore
+from django_jsonsaver import constants as c, helpers as h
+from users.models import Profile
+
+
+def get_jsonstore_validation_profile(user):
+    """
+    Fetches the user's profile, with its jsonstore count and storage usage
+    counters, using a single query. The profile is also cached on the user
+    so that the profile methods do not query it again.
+    """
+    profile = Profile.objects.get(user=user)
+    user.profile = profile
+    return profile
+
+
+def get_jsonstore_validation_errors(
+        user, obj, name, is_public, jsonstore_data):
+    """
+    Runs every jsonstore invalidator and returns a list of (field, error)
+    tuples, in the order that the invalidators are run. A field of None
+    denotes a non-field error.
+
+    Duplicate names are not checked here. The database's unique constraints
+    reject them when the jsonstore is saved, see save_jsonstore().
+    """
+    profile = get_jsonstore_validation_profile(user)
+    errors = get_jsonstore_name_format_errors(name, is_public)
+
+    # user jsonstore count over max. Updates cannot change the count.
+    if obj is None:
+        errors += get_jsonstore_count_errors(user, profile.jsonstore_count)
+
+    errors += get_jsonstore_data_size_errors(
+        user, obj, h.get_json_size(jsonstore_data))
+    return errors
+
+
+def get_jsonstore_name_format_errors(name, is_public):
+    """
+    Runs the invalidators of a jsonstore's name on its own, and returns a
+    list of (field, error) tuples.
+    """
+    errors = []
+
+    # name cannot be numbers only
+    if invalidators.jsonstore_name_cannot_be_numbers_only(name):
+        errors.append(('name', ValidationError(
+            c.FORM_ERROR_JSONSTORE_NAME_CANNOT_BE_NUMBERS_ONLY,
+            code='jsonstore_name_cannot_be_numbers_only')))
+
+    # public jsonstore name cannot be blank
+    if invalidators.jsonstore_public_name_cannot_be_blank(name, is_public):
+        errors.append(('name', ValidationError(
+            c.FORM_ERROR_JSONSTORE_PUBLIC_NAME_BLANK,
+            code='jsonstore_public_name_cannot_be_blank')))
+
+    # forbidden jsonstore name not allowed
+    if invalidators.jsonstore_forbidden_name_not_allowed(name):
+        errors.append(('name', ValidationError(
+            c.FORM_ERROR_JSONSTORE_FORBIDDEN_NAME_NOT_ALLOWED(name),
+            code='jsonstore_forbidden_name_not_allowed')))
+
+    return errors
+
+
+def get_jsonstore_count_errors(user, user_jsonstore_count):
+    """
+    Runs the jsonstore count invalidator for a user who has
+    user_jsonstore_count jsonstores and creates one more, and returns a list
+    of (field, error) tuples. The user's profile must be current.
+    """
+    errors = []
+    user_max_jsonstore_count = user.profile.get_max_jsonstore_count()
+    if invalidators.jsonstore_user_jsonstore_count_over_max(
+            user_jsonstore_count, user_max_jsonstore_count):
+        errors.append((None, ValidationError(
+            c.FORM_ERROR_JSONSTORE_USER_JSONSTORE_COUNT_OVER_MAX(
+                user, user_max_jsonstore_count),
+            code='jsonstore_user_jsonstore_count_over_max')))
+    return errors
+
+
+def get_jsonstore_data_size_errors(
+        user, obj, jsonstore_data_size, all_jsonstores_data_size=None):
+    """
+    Runs the data size invalidators for a jsonstore whose data will be
+    jsonstore_data_size bytes, and returns a list of (field, error) tuples.
+    all_jsonstores_data_size is the user's storage usage to check against,
+    the profile's by default. The user's profile must be current.
+    """
+    errors = []
+
+    # jsonstore data size over max
+    if invalidators.jsonstore_data_size_over_max(
+            None, user, jsonstore_data_size):
+        errors.append(('data', ValidationError(
+            c.FORM_ERROR_JSONSTORE_DATA_SIZE_OVER_MAX(
+                user, jsonstore_data_size),
+            code='jsonstore_data_size_over_max')))
+
+    # jsonstore size will exceed user's total storage allowance
+    if invalidators.jsonstore_all_jsonstores_data_size_over_max(
+            user, jsonstore_data_size, obj, all_jsonstores_data_size):
+        errors.append(('data', ValidationError(
+            c.FORM_ERROR_ALL_JSONSTORES_DATA_SIZE_OVER_MAX(
+                user, jsonstore_data_size, obj, all_jsonstores_data_size),
+            code='jsonstore_all_jsonstores_data_size_over_max')))
+
+    return errors
+
+
+def get_jsonstore_name_errors(user_id, obj, name, is_public):
+    """
+    Looks up the jsonstores that have the name of a jsonstore, then runs the
+    duplicate name invalidators for it and returns a list of (field, error)
+    tuples.
+    """
+    same_user_same_name_exists = False
+    other_user_public_same_name_exists = False
+    if name:
+        same_name_jsonstores = JsonStore.objects.filter(name=name)
+        if obj:
+            same_name_jsonstores = same_name_jsonstores.exclude(pk=obj.pk)
+        same_user_same_name_exists = \
+            same_name_jsonstores.filter(user_id=user_id).exists()
+        other_user_public_same_name_exists = same_name_jsonstores \
+            .filter(is_public=True).exclude(user_id=user_id).exists()
+    return get_jsonstore_duplicate_name_errors(
+        name, obj, is_public, same_user_same_name_exists,
+        other_user_public_same_name_exists)
+
+
+def get_jsonstore_duplicate_name_errors(
+        name, obj, is_public, same_user_same_name_exists,
+        other_user_public_same_name_exists):
+    """
+    Runs the duplicate name invalidators for a jsonstore, given whether its
+    name is taken by another of the user's jsonstores and by another user's
+    public jsonstore, and returns a list of (field, error) tuples.
+    """
+    errors = []
+
+    # jsonstore_name_duplicate_same_user_create
+    if invalidators.jsonstore_name_duplicate_same_user_create(
+            name, obj, same_user_same_name_exists):
+        errors.append(('name', ValidationError(
+            c.FORM_ERROR_JSONSTORE_NAME_DUPLICATE,
+            code='jsonstore_name_duplicate_same_user_create')))
+
+    # jsonstore_name_duplicate_same_user_update
+    if invalidators.jsonstore_name_duplicate_same_user_update(
+            name, obj, same_user_same_name_exists):
+        errors.append(('name', ValidationError(
+            c.FORM_ERROR_JSONSTORE_NAME_DUPLICATE,
+            code='jsonstore_name_duplicate_same_user_update')))
+
+    # jsonstore_public_name_duplicate
+    if invalidators.jsonstore_public_name_duplicate(
+            is_public, other_user_public_same_name_exists):
+        errors.append(('name', ValidationError(
+            c.FORM_ERROR_JSONSTORE_PUBLIC_NAME_DUPLICATE,
+            code='jsonstore_public_name_duplicate')))
+
+    return errors
+
+
+def save_jsonstore(jsonstore, **kwargs):
+    """
+    Saves jsonstore. If its name is already taken, raises a ValidationError
+    with the same errors that the duplicate name invalidators give.
+
+    The names are only checked once the database has rejected the jsonstore,
+    so that valid writes do not pay for the check, and concurrent writes
+    cannot both pass it.
+
+    A new jsonstore is counted on its user's profile before it is inserted,
+    and only if the count stays within the user's maximum, so concurrent
+    creates cannot go over it either.
+    """
+    obj = None if jsonstore._state.adding else jsonstore
+    try:
+        with transaction.atomic():
+            if obj is None:
+                user = jsonstore.user
+                max_jsonstore_count = user.profile.get_max_jsonstore_count()
+                if not Profile.update_jsonstore_count(
+                        user.id, 1, max_jsonstore_count):
+                    errors = get_jsonstore_count_errors(
+                        user, max_jsonstore_count)
+                    raise ValidationError([error for _, error in errors])
+                jsonstore.is_counted = True
+            jsonstore.save(**kwargs)
+    except IntegrityError:
+        errors = get_jsonstore_name_errors(
+            jsonstore.user_id, obj, jsonstore.name, jsonstore.is_public)
+        if not errors:
+            raise
+        raise ValidationError({'name': [error for _, error in errors]})
+    finally:
+        jsonstore.is_counted = False
@@ -1,13 +1,15 @@
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
-from django.http import HttpResponseRedirect
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpResponseRedirect
 from django.urls import reverse, reverse_lazy
 from django.views.generic import CreateView, DetailView, DeleteView, FormView,\
     ListView
 from django.views.generic.edit import UpdateView
 
-from . import forms
+from . import forms, pagination, validation
+from .mixins import JsonStoreObjectMixin
 from .models import JsonStore
 from .permissions import UserHasJsonStorePermissionsMixin
 from django_jsonsaver import constants as c
@@ -19,7 +21,17 @@ class JsonStoreListView(LoginRequiredMixin, ListView):
     paginate_by = c.JSONSTORE_LIST_PAGINATE_BY
 
     def get_queryset(self):
-        return self.request.user.jsonstore_set.order_by('-updated_at')
+        return self.request.user.jsonstore_set.defer('data') \
+            .order_by('-updated_at')
+
+    def paginate_queryset(self, queryset, page_size):
+        """Paginates by keyset rather than by offset, see stores.pagination."""
+        try:
+            page = pagination.get_page(
+                queryset, self.request.GET.get('cursor'), page_size)
+        except pagination.InvalidCursor:
+            raise Http404("Invalid cursor")
+        return None, page, page.object_list, page.has_other_pages()
 
 
 class JsonStoreCreateView(LoginRequiredMixin, CreateView):
@@ -40,7 +52,11 @@ class JsonStoreCreateView(LoginRequiredMixin, CreateView):
     def form_valid(self, form):
         self.object = form.save(commit=False)
         self.object.user = self.request.user
-        self.object.save()
+        try:
+            validation.save_jsonstore(self.object)
+        except ValidationError as e:
+            form.add_error(None, e)
+            return self.form_invalid(form)
         messages.success(
             self.request, self.success_message,
             extra_tags='jsonstore-create-success')
@@ -74,14 +90,14 @@ class JsonStoreNameDetailView(
                 reverse('stores:jsonstore_lookup'))
         return super().dispatch(request, *args, **kwargs)
 
-    def get_object(self):
-        return JsonStore.objects.filter(
+    def load_object(self, queryset=None):
+        return self.get_object_queryset(queryset).filter(
             user__id=self.request.user.id,
             name=self.kwargs['jsonstore_name']
         ).first()
 
 
-class JsonStorePublicDetailView(DetailView):
+class JsonStorePublicDetailView(JsonStoreObjectMixin, DetailView):
     model = JsonStore
 
     def dispatch(self, request, *args, **kwargs):
@@ -93,8 +109,8 @@ class JsonStorePublicDetailView(DetailView):
                 reverse('stores:jsonstore_lookup_public'))
         return super().dispatch(request, *args, **kwargs)
 
-    def get_object(self):
-        return JsonStore.objects.filter(
+    def load_object(self, queryset=None):
+        return self.get_object_queryset(queryset).filter(
             name=self.kwargs['jsonstore_name']).first()
 
 
@@ -126,6 +142,17 @@ class JsonStoreUpdateView(
                        'obj': self.get_object()})
         return kwargs
 
+    def form_valid(self, form):
+        self.object = form.save(commit=False)
+        try:
+            validation.save_jsonstore(self.object)
+        except ValidationError as e:
+            form.add_error(None, e)
+            return self.form_invalid(form)
+        messages.success(
+            self.request, self.get_success_message(form.cleaned_data))
+        return HttpResponseRedirect(self.get_success_url())
+
 
 # delete
 class JsonStoreDeleteView(UserHasJsonStorePermissionsMixin, DeleteView):
@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from django_jsonsaver import helpers as h
+
+UserModel = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Reports users whose JSON stores exceed their storage quotas "\
+        "when measured by serialized JSON size."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help="Report every user with JSON stores, not only those over "
+                 "their quotas.")
+
+    def handle(self, *args, **options):
+        over_quota_count = 0
+        users = UserModel.objects.filter(jsonstore__isnull=False) \
+            .select_related('profile').distinct().order_by('pk')
+        for user in users.iterator():
+            profile = user.profile
+            max_jsonstore_data_size = profile.get_max_jsonstore_data_size()
+            oversize_jsonstore_count = 0
+            all_jsonstores_data_size = 0
+            for data in user.jsonstore_set.values_list('data', flat=True):
+                jsonstore_data_size = h.get_json_size(data)
+                all_jsonstores_data_size += jsonstore_data_size
+                if jsonstore_data_size >= max_jsonstore_data_size:
+                    oversize_jsonstore_count += 1
+            is_over_quota = oversize_jsonstore_count or \
+                all_jsonstores_data_size >= \
+                profile.get_max_jsonstore_all_jsonstores_data_size()
+            if is_over_quota:
+                over_quota_count += 1
+            if is_over_quota or options['all']:
+                max_all_jsonstores_data_size_in_kb = \
+                    profile.get_max_jsonstore_all_jsonstores_data_size_in_kb()
+                self.stdout.write(
+                    f"{user.username}: "
+                    f"{h.bytes_to_kb(all_jsonstores_data_size)} KB / "
+                    f"{max_all_jsonstores_data_size_in_kb} KB, "
+                    f"{oversize_jsonstore_count} oversize JSON store(s)")
+        self.stdout.write(self.style.SUCCESS(
+            f"{over_quota_count} user(s) over quota."))
@@ -0,0 +1,32 @@
+# Generated by Django 3.1.7 on 2026-10-18 13:41
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def populate_all_jsonstores_data_size(apps, schema_editor):
+    Profile = apps.get_model('users', 'Profile')
+    JsonStore = apps.get_model('stores', 'JsonStore')
+    Profile.objects.update(all_jsonstores_data_size=Coalesce(Subquery(
+        JsonStore.objects.filter(user=OuterRef('user'))
+        .order_by().values('user')
+        .annotate(total=Sum('data_size')).values('total')), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0002_jsonstore_data_size'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='all_jsonstores_data_size',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            populate_all_jsonstores_data_size, migrations.RunPython.noop),
+    ]
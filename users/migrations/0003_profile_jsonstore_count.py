@@ -0,0 +1,32 @@
+# Generated by Django 3.1.7 on 2026-10-18 18:02
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_jsonstore_count(apps, schema_editor):
+    Profile = apps.get_model('users', 'Profile')
+    JsonStore = apps.get_model('stores', 'JsonStore')
+    Profile.objects.update(jsonstore_count=Coalesce(Subquery(
+        JsonStore.objects.filter(user=OuterRef('user'))
+        .order_by().values('user')
+        .annotate(count=Count('pk')).values('count')), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0007_jsonstore_name_unique'),
+        ('users', '0002_profile_all_jsonstores_data_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='jsonstore_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            populate_jsonstore_count, migrations.RunPython.noop),
+    ]
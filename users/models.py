@@ -1,8 +1,12 @@
 from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage
 from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Greatest
 from rest_framework.authtoken.models import Token
 
 from django_jsonsaver import constants as c, helpers as h, server_config as sc
+from stores.models import JsonStore
 
 UserModel = get_user_model()
 
@@ -20,15 +24,73 @@ class Profile(models.Model):
         help_text=c.PROFILE_MODEL_IS_PUBLIC_HELP_TEXT,
         default=False)
     account_tier = models.CharField(max_length=128, default='free')
+    all_jsonstores_data_size = models.PositiveBigIntegerField(
+        default=0, editable=False)
+    jsonstore_count = models.PositiveIntegerField(default=0, editable=False)
+
+    @staticmethod
+    def update_all_jsonstores_data_size(user_id, delta):
+        """
+        Atomically adds delta to the user's storage usage counter. Deltas
+        are measured against the values that were loaded, so concurrent
+        writes of a jsonstore can apply overlapping ones; the counter does
+        not go below 0 and is corrected when it is reconciled.
+        """
+        return Profile.objects.filter(user_id=user_id).update(
+            all_jsonstores_data_size=Greatest(
+                F('all_jsonstores_data_size') + delta, 0))
+
+    @staticmethod
+    def reconcile_all_jsonstores_data_size():
+        """
+        Resets every drifted storage usage counter to the sum of the user's
+        stored JsonStore data sizes. Returns the number of profiles fixed.
+        """
+        actual_data_size = Coalesce(Subquery(
+            JsonStore.objects.filter(user=OuterRef('user'))
+            .order_by().values('user')
+            .annotate(total=Sum('data_size')).values('total')), 0)
+        return Profile.objects \
+            .exclude(all_jsonstores_data_size=actual_data_size) \
+            .update(all_jsonstores_data_size=actual_data_size)
+
+    @staticmethod
+    def update_jsonstore_count(user_id, delta, max_jsonstore_count=None):
+        """
+        Atomically adds delta to the user's jsonstore counter, which does not
+        go below 0, e.g. if it has drifted before it is reconciled. If
+        max_jsonstore_count is given, the counter is only updated if it stays
+        within it. Returns whether the counter was updated.
+        """
+        profiles = Profile.objects.filter(user_id=user_id)
+        if max_jsonstore_count is not None:
+            profiles = profiles.filter(
+                jsonstore_count__lte=max_jsonstore_count - delta)
+        return bool(profiles.update(
+            jsonstore_count=Greatest(F('jsonstore_count') + delta, 0)))
+
+    @staticmethod
+    def reconcile_jsonstore_count():
+        """
+        Resets every drifted jsonstore counter to the user's number of
+        jsonstores. Returns the number of profiles fixed.
+        """
+        actual_jsonstore_count = Coalesce(Subquery(
+            JsonStore.objects.filter(user=OuterRef('user'))
+            .order_by().values('user')
+            .annotate(count=Count('pk')).values('count')), 0)
+        return Profile.objects \
+            .exclude(jsonstore_count=actual_jsonstore_count) \
+            .update(jsonstore_count=actual_jsonstore_count)
 
     def get_absolute_url(self):
         return self.user.get_absolute_url()
 
+    def get_all_jsonstores_data_size(self):
+        return self.all_jsonstores_data_size
+
     def get_all_jsonstores_data_size_in_kb(self):
-        result = 0
-        for store in self.user.jsonstore_set.all():
-            result += h.bytes_to_kb(h.get_obj_size(store.data))
-        return result
+        return h.bytes_to_kb(self.get_all_jsonstores_data_size())
 
     def get_max_jsonstore_count(self):
         if self.account_tier == 'free':
@@ -50,3 +112,27 @@ class Profile(models.Model):
         if self.account_tier == 'free':
             return h.bytes_to_kb(
                 sc.MAX_JSONSTORE_ALL_JSONSTORES_DATA_SIZE_USER_FREE)
+
+
+class PendingEmail(models.Model):
+    """
+    An email that is waiting to be sent by
+    django_jsonsaver.tasks.dispatch_pending_emails().
+    """
+    subject = models.TextField()
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @staticmethod
+    def queue(message):
+        """Saves an EmailMessage to be sent with the other pending emails."""
+        return PendingEmail.objects.create(
+            subject=message.subject, body=message.body,
+            from_email=message.from_email, to=message.to)
+
+    def get_message(self, connection=None):
+        return EmailMessage(
+            self.subject, self.body, self.from_email, self.to,
+            connection=connection)
@@ -1,7 +1,11 @@
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
 
+from api import authentication
+from stores import cache
+from stores.models import JsonStore
 from users.models import Profile
 
 
@@ -9,3 +13,55 @@ from users.models import Profile
 def create_user_settings(sender, instance, created, **kwargs):
     if created:
         Profile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def user_save_deletes_cached_tokens(
+        sender, instance, created, update_fields, **kwargs):
+    # e.g. when the user is deactivated. Logins only update last_login.
+    if created or update_fields == frozenset(['last_login']):
+        return
+    authentication.delete_cached_tokens(*Token.objects.filter(
+        user_id=instance.pk).values_list('key', flat=True))
+
+
+@receiver(post_delete, sender=Token)
+def token_delete_deletes_cached_token(sender, instance, **kwargs):
+    # e.g. when the key is rotated, or the user is deleted
+    authentication.delete_cached_tokens(instance.key)
+
+
+@receiver(post_save, sender=Profile)
+def profile_save_deletes_cached_public_profile(sender, instance, **kwargs):
+    # e.g. when the profile's visibility changes
+    cache.delete_cached_public_profiles(instance.user_id)
+
+
+@receiver(post_save, sender=JsonStore)
+def jsonstore_save_updates_all_jsonstores_data_size(
+        sender, instance, **kwargs):
+    delta = instance.get_data_size_delta()
+    if delta:
+        Profile.update_all_jsonstores_data_size(instance.user_id, delta)
+
+
+@receiver(post_save, sender=JsonStore)
+def jsonstore_save_updates_jsonstore_count(
+        sender, instance, created, **kwargs):
+    # see stores.validation.save_jsonstore(), which has already counted the
+    # jsonstores that it creates
+    if created and not getattr(instance, 'is_counted', False):
+        Profile.update_jsonstore_count(instance.user_id, 1)
+
+
+@receiver(post_delete, sender=JsonStore)
+def jsonstore_delete_updates_all_jsonstores_data_size(
+        sender, instance, **kwargs):
+    if instance.data_size:
+        Profile.update_all_jsonstores_data_size(
+            instance.user_id, -instance.data_size)
+
+
+@receiver(post_delete, sender=JsonStore)
+def jsonstore_delete_updates_jsonstore_count(sender, instance, **kwargs):
+    Profile.update_jsonstore_count(instance.user_id, -1)
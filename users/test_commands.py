@@ -0,0 +1,33 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from django_jsonsaver import factories as f, server_config as sc
+
+
+class JsonStoreQuotaReportCommandTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+        cls.over_quota_user = f.UserFactory()
+        f.JsonStoreFactory(user=cls.test_user)
+        f.JsonStoreFactory(
+            user=cls.over_quota_user,
+            data='a' * sc.MAX_JSONSTORE_ALL_JSONSTORES_DATA_SIZE_USER_FREE)
+
+    def call_command(self, *args):
+        out = StringIO()
+        call_command('jsonstore_quota_report', *args, stdout=out)
+        return out.getvalue()
+
+    def test_reports_users_over_quota(self):
+        output = self.call_command()
+        self.assertIn(f"{self.over_quota_user.username}:", output)
+        self.assertNotIn(f"{self.test_user.username}:", output)
+        self.assertIn("1 user(s) over quota.", output)
+
+    def test_all_option_reports_every_user_with_jsonstores(self):
+        output = self.call_command('--all')
+        self.assertIn(f"{self.over_quota_user.username}:", output)
+        self.assertIn(f"{self.test_user.username}:", output)
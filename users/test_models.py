@@ -1,10 +1,11 @@
 from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage
 from django.db import models
 from django.test import TestCase
 
 from django_jsonsaver import \
     constants as c, factories as f, helpers as h, server_config as sc
-from .models import Profile
+from .models import PendingEmail, Profile
 
 UserModel = get_user_model()
 
@@ -16,6 +17,9 @@ class ProfileModelTest(TestCase):
         cls.test_user = f.UserFactory()
         cls.test_profile = cls.test_user.profile
 
+    def setUp(self):
+        self.test_profile.refresh_from_db()
+
     # ATTRIBUTES #
     def test_model_class_name(self):
         self.assertEqual(self.test_model.__name__, 'Profile')
@@ -124,6 +128,22 @@ class ProfileModelTest(TestCase):
         default = self.test_profile._meta.get_field('account_tier').default
         self.assertEqual(default, 'free')
 
+    # all_jsonstores_data_size
+    def test_field_all_jsonstores_data_size_field_type(self):
+        field_type = self.test_profile._meta.get_field(
+            'all_jsonstores_data_size').get_internal_type()
+        self.assertEqual(field_type, 'PositiveBigIntegerField')
+
+    def test_field_all_jsonstores_data_size_default(self):
+        default = self.test_profile._meta.get_field(
+            'all_jsonstores_data_size').default
+        self.assertEqual(default, 0)
+
+    def test_field_all_jsonstores_data_size_editable(self):
+        editable = self.test_profile._meta.get_field(
+            'all_jsonstores_data_size').editable
+        self.assertEqual(editable, False)
+
     # METHODS #
 
     # get_activation_code()
@@ -147,24 +167,144 @@ class ProfileModelTest(TestCase):
 
         # if 1 jsonstore, return value is equal to size of that jsonstore
         first_jsonstore = f.JsonStoreFactory(user=self.test_user)
-        first_jsonstore_data_size_in_kb = \
-            h.bytes_to_kb(h.get_obj_size(first_jsonstore.data))
+        first_jsonstore_data_size = h.get_json_size(first_jsonstore.data)
+        self.test_profile.refresh_from_db()
 
         self.assertEqual(
             all_jsonstores_data_size_in_kb(),
-            first_jsonstore_data_size_in_kb)
+            h.bytes_to_kb(first_jsonstore_data_size))
 
         # if 2 jsonstores, return value is equal to sum of both jsonstore sizes
         second_jsonstore = f.JsonStoreFactory(user=self.test_user)
-        second_jsonstore_data_size_in_kb = \
-            h.bytes_to_kb(h.get_obj_size(second_jsonstore.data))
-
-        both_jsonstores_data_size_in_kb = \
-            first_jsonstore_data_size_in_kb + second_jsonstore_data_size_in_kb
+        second_jsonstore_data_size = h.get_json_size(second_jsonstore.data)
+        self.test_profile.refresh_from_db()
 
         self.assertEqual(
             all_jsonstores_data_size_in_kb(),
-            both_jsonstores_data_size_in_kb)
+            h.bytes_to_kb(
+                first_jsonstore_data_size + second_jsonstore_data_size))
+
+    # get_all_jsonstores_data_size()
+    def test_method_get_all_jsonstores_data_size(self):
+        self.assertEqual(self.test_profile.get_all_jsonstores_data_size(), 0)
+
+        first_jsonstore = f.JsonStoreFactory(user=self.test_user)
+        second_jsonstore = f.JsonStoreFactory(user=self.test_user)
+        f.JsonStoreFactory()  # owned by another user
+        self.test_profile.refresh_from_db()
+
+        self.assertEqual(
+            self.test_profile.get_all_jsonstores_data_size(),
+            h.get_json_size(first_jsonstore.data) +
+            h.get_json_size(second_jsonstore.data))
+
+    def test_all_jsonstores_data_size_follows_jsonstore_update(self):
+        jsonstore = f.JsonStoreFactory(user=self.test_user)
+        jsonstore.data = {'message': 'a' * 1024}
+        jsonstore.save()
+        self.test_profile.refresh_from_db()
+        self.assertEqual(
+            self.test_profile.get_all_jsonstores_data_size(),
+            h.get_json_size(jsonstore.data))
+
+    def test_all_jsonstores_data_size_follows_jsonstore_delete(self):
+        f.JsonStoreFactory(user=self.test_user)
+        jsonstore = f.JsonStoreFactory(user=self.test_user)
+        jsonstore.delete()
+        self.test_profile.refresh_from_db()
+        self.assertEqual(
+            self.test_profile.get_all_jsonstores_data_size(),
+            h.get_json_size(c.TEST_JSONSTORE_DATA))
+
+    # update_all_jsonstores_data_size()
+    def test_method_update_all_jsonstores_data_size(self):
+        Profile.update_all_jsonstores_data_size(self.test_user.id, 100)
+        Profile.update_all_jsonstores_data_size(self.test_user.id, -40)
+        self.test_profile.refresh_from_db()
+        self.assertEqual(self.test_profile.all_jsonstores_data_size, 60)
+
+    def test_method_update_all_jsonstores_data_size_not_below_zero(self):
+        jsonstore = f.JsonStoreFactory(user=self.test_user)
+        # e.g. after concurrent saves of the jsonstore applied their deltas
+        Profile.objects.update(all_jsonstores_data_size=1)
+        jsonstore.delete()
+        self.test_profile.refresh_from_db()
+        self.assertEqual(self.test_profile.all_jsonstores_data_size, 0)
+
+    # reconcile_all_jsonstores_data_size()
+    def test_method_reconcile_all_jsonstores_data_size(self):
+        jsonstore = f.JsonStoreFactory(user=self.test_user)
+        other_user = f.UserFactory()
+        Profile.objects.update(all_jsonstores_data_size=12345)
+
+        self.assertEqual(Profile.reconcile_all_jsonstores_data_size(), 2)
+        self.test_profile.refresh_from_db()
+        other_user.profile.refresh_from_db()
+        self.assertEqual(
+            self.test_profile.all_jsonstores_data_size, jsonstore.data_size)
+        self.assertEqual(other_user.profile.all_jsonstores_data_size, 0)
+
+        # counters that are already correct are not rewritten
+        self.assertEqual(Profile.reconcile_all_jsonstores_data_size(), 0)
+
+    # jsonstore_count
+    def test_jsonstore_count_follows_jsonstore_create_and_delete(self):
+        f.JsonStoreFactory(user=self.test_user)
+        jsonstore = f.JsonStoreFactory(user=self.test_user)
+        self.test_profile.refresh_from_db()
+        self.assertEqual(self.test_profile.jsonstore_count, 2)
+
+        jsonstore.delete()
+        self.test_profile.refresh_from_db()
+        self.assertEqual(self.test_profile.jsonstore_count, 1)
+
+    def test_jsonstore_count_does_not_follow_jsonstore_update(self):
+        jsonstore = f.JsonStoreFactory(user=self.test_user)
+        jsonstore.name = 'new-name'
+        jsonstore.save()
+        self.test_profile.refresh_from_db()
+        self.assertEqual(self.test_profile.jsonstore_count, 1)
+
+    # update_jsonstore_count()
+    def test_method_update_jsonstore_count(self):
+        self.assertTrue(Profile.update_jsonstore_count(self.test_user.id, 3))
+        self.assertTrue(Profile.update_jsonstore_count(self.test_user.id, -1))
+        self.test_profile.refresh_from_db()
+        self.assertEqual(self.test_profile.jsonstore_count, 2)
+
+    def test_method_update_jsonstore_count_does_not_go_below_zero(self):
+        jsonstore = f.JsonStoreFactory(user=self.test_user)
+        # e.g. a drifted counter that has not been reconciled yet
+        Profile.objects.update(jsonstore_count=0)
+        jsonstore.delete()
+        self.test_profile.refresh_from_db()
+        self.assertEqual(self.test_profile.jsonstore_count, 0)
+
+    def test_method_update_jsonstore_count_with_max(self):
+        self.assertTrue(
+            Profile.update_jsonstore_count(self.test_user.id, 2, 3))
+        # the counter cannot go over the maximum
+        self.assertFalse(
+            Profile.update_jsonstore_count(self.test_user.id, 2, 3))
+        self.assertTrue(
+            Profile.update_jsonstore_count(self.test_user.id, 1, 3))
+        self.test_profile.refresh_from_db()
+        self.assertEqual(self.test_profile.jsonstore_count, 3)
+
+    # reconcile_jsonstore_count()
+    def test_method_reconcile_jsonstore_count(self):
+        f.JsonStoreFactory(user=self.test_user)
+        other_user = f.UserFactory()
+        Profile.objects.update(jsonstore_count=5)
+
+        self.assertEqual(Profile.reconcile_jsonstore_count(), 2)
+        self.test_profile.refresh_from_db()
+        other_user.profile.refresh_from_db()
+        self.assertEqual(self.test_profile.jsonstore_count, 1)
+        self.assertEqual(other_user.profile.jsonstore_count, 0)
+
+        # counters that are already correct are not rewritten
+        self.assertEqual(Profile.reconcile_jsonstore_count(), 0)
 
     # get_max_jsonstore_count()
     def test_method_get_max_jsonstore_count(self):
@@ -226,3 +366,23 @@ class ProfileModelTest(TestCase):
         self.assertEqual(
             profile.get_max_jsonstore_all_jsonstores_data_size_in_kb(),
             h.bytes_to_kb(sc.MAX_JSONSTORE_ALL_JSONSTORES_DATA_SIZE_USER_FREE))
+
+
+class PendingEmailModelTest(TestCase):
+    def test_method_queue(self):
+        pending_email = PendingEmail.queue(EmailMessage(
+            'Subject', 'Body', sc.SERVER_EMAIL, [c.TEST_USER_EMAIL]))
+        pending_email.refresh_from_db()
+        self.assertEqual(pending_email.subject, 'Subject')
+        self.assertEqual(pending_email.body, 'Body')
+        self.assertEqual(pending_email.from_email, sc.SERVER_EMAIL)
+        self.assertEqual(pending_email.to, [c.TEST_USER_EMAIL])
+
+    def test_method_get_message(self):
+        pending_email = PendingEmail(
+            subject='Subject', body='Body', from_email=sc.SERVER_EMAIL,
+            to=[c.TEST_USER_EMAIL])
+        message = pending_email.get_message()
+        self.assertEqual(
+            (message.subject, message.body, message.from_email, message.to),
+            ('Subject', 'Body', sc.SERVER_EMAIL, [c.TEST_USER_EMAIL]))
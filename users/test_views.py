@@ -11,6 +11,7 @@ from rest_framework.authtoken.models import Token
 from . import views
 from django_jsonsaver import \
     constants as c, factories as f, helpers_testing as ht, server_config as sc
+from stores import cache
 from stores.models import JsonStore
 
 UserModel = get_user_model()
@@ -713,6 +714,7 @@ class UserDetailPublicViewTest(TestCase):
 
     def setUp(self):
         self.view = views.UserDetailPublicView
+        cache.get_public_jsonstore_cache().clear()
 
     # ATTRIBUTES
     def test_view_name(self):
@@ -777,8 +779,9 @@ class UserDetailPublicViewTest(TestCase):
         for i in range(6):
             f.JsonStoreFactory(user=self.test_user, is_public=True)
             f.JsonStoreFactory(is_public=True if i % 2 == 0 else False)
-        expected_qs = JsonStore.objects.filter(user=self.test_user) \
-            .order_by('-updated_at')
+        expected_jsonstores = list(
+            JsonStore.objects.filter(user=self.test_user)
+            .order_by('-updated_at', '-id'))
 
         request = RequestFactory().get(self.test_url)
         request.user = AnonymousUser()
@@ -787,7 +790,73 @@ class UserDetailPublicViewTest(TestCase):
         view_instance.kwargs = {'username': self.test_user.username}
         view_instance.object = view_instance.get_object()
         context = view_instance.get_context_data()
-        self.assertEqual(repr(context['jsonstores']), repr(expected_qs))
+        self.assertEqual(list(context['jsonstores']), expected_jsonstores)
+        self.assertFalse(context['is_paginated'])
+        self.assertFalse(context['is_owner'])
+
+    def test_get_context_data_invalid_cursor_returns_404(self):
+        response = self.client.get(self.test_url, {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_jsonstores_are_paginated_and_data_is_deferred(self):
+        for i in range(c.JSONSTORE_LIST_PAGINATE_BY + 1):
+            f.JsonStoreFactory(user=self.test_user, is_public=True)
+        response = self.client.get(self.test_url)
+        jsonstores = response.context['jsonstores']
+        self.assertEqual(len(jsonstores), c.JSONSTORE_LIST_PAGINATE_BY)
+        self.assertIn('data', list(jsonstores)[0].get_deferred_fields())
+        self.assertContains(response, 'id="page-link-next"')
+
+        response = self.client.get(
+            self.test_url, {'cursor': jsonstores.next_cursor})
+        self.assertEqual(len(response.context['jsonstores']), 1)
+
+    def test_cached_page_uses_one_query(self):
+        f.JsonStoreFactory(user=self.test_user, is_public=True)
+        # the user and profile, and the jsonstores
+        with self.assertNumQueries(2):
+            self.client.get(self.test_url)
+        # the jsonstores are rendered from the cache
+        with self.assertNumQueries(1):
+            self.client.get(self.test_url)
+
+    def test_cached_jsonstores_follow_jsonstore_changes(self):
+        jsonstore = f.JsonStoreFactory(user=self.test_user, is_public=True)
+        self.assertContains(self.client.get(self.test_url), jsonstore.name)
+
+        jsonstore.name = 'new-name'
+        jsonstore.save()
+        self.assertContains(self.client.get(self.test_url), 'new-name')
+
+        jsonstore.is_public = False
+        jsonstore.save()
+        self.assertNotContains(self.client.get(self.test_url), 'new-name')
+
+        other_jsonstore = f.JsonStoreFactory(
+            user=self.test_user, is_public=True)
+        self.assertContains(
+            self.client.get(self.test_url), other_jsonstore.name)
+
+        other_jsonstore.delete()
+        self.assertNotContains(
+            self.client.get(self.test_url), other_jsonstore.name)
+
+    def test_cached_jsonstores_follow_profile_visibility(self):
+        self.client.get(self.test_url)
+        self.test_user.profile.is_public = False
+        self.test_user.profile.save()
+        self.assertEqual(self.client.get(self.test_url).status_code, 404)
+        self.assertIsNone(cache.get_public_jsonstore_cache().get(
+            cache.get_public_profile_fragment_keys(self.test_user.pk)[1]))
+
+    def test_cached_jsonstores_are_rendered_for_owner_separately(self):
+        jsonstore = f.JsonStoreFactory(user=self.test_user, is_public=True)
+        self.client.get(self.test_url)
+        self.assertTrue(self.client.login(
+            username=self.test_user.username, password=c.TEST_USER_PASSWORD))
+        # the owner's links go to the private detail page
+        self.assertContains(
+            self.client.get(self.test_url), jsonstore.get_absolute_url())
 
     # get_object()
     def test_get_object_returns_expected_object(self):
@@ -1342,3 +1411,40 @@ class UserDeleteViewTest(TestCase):
         self.assertEqual(len(messages), 1)
         self.assertEqual(
             str(messages[0]), c.USER_VIEW_DELETE_SUCCESS_MESSAGE)
+
+
+class UsersViewQueryBudgetTest(ht.QueryBudgetTestCaseMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = f.UserFactory()
+        cls.other_user = f.UserFactory()
+        cls.other_user.profile.is_public = True
+        cls.other_user.profile.save()
+        for i in range(5):
+            f.JsonStoreFactory(user=cls.test_user, is_public=True)
+            f.JsonStoreFactory(user=cls.other_user, is_public=True)
+        cls.test_url = reverse('users:user_detail_me')
+
+    def setUp(self):
+        cache.get_public_jsonstore_cache().clear()
+        super().setUp()
+
+    def get_query_budgets(self):
+        return {
+            reverse('users:users_root'): 0,
+            reverse('users:register'): 2,
+            reverse('users:user_activation_email_resend'): 2,
+            reverse('users:login'): 2,
+            reverse('users:user_username_recover'): 2,
+            reverse('users:password_reset'): 3,
+            reverse('users:user_detail_me'): 4,
+            reverse('users:user_detail_public', kwargs={
+                'username': self.other_user.username}): 4,
+            reverse('users:user_update'): 2,
+            reverse('users:user_update_account_tier'): 2,
+            reverse('users:user_update_email'): 3,
+            reverse('users:password_change'): 2,
+            reverse('users:user_update_is_public'): 3,
+            reverse('users:user_update_api_key'): 2,
+            reverse('users:user_delete'): 2,
+        }
@@ -11,12 +11,14 @@ from django.views.generic import CreateView, FormView, DeleteView, DetailView,\
 from django.views.generic.edit import UpdateView
 from django.shortcuts import get_object_or_404
 from django.urls import reverse, reverse_lazy
+from django.utils.functional import SimpleLazyObject
 from rest_framework.authtoken.models import Token
 
 from . import forms
 from .models import Profile
 from django_jsonsaver import constants as c, helpers as h
 from django_jsonsaver import tasks
+from stores import pagination
 from stores.models import JsonStore
 
 UserModel = get_user_model()
@@ -185,10 +187,11 @@ class UserDetailMeView(LoginRequiredMixin, DetailView):
 
 class UserDetailPublicView(DetailView):
     template_name = 'users/user_detail_public.html'
+    paginate_by = c.JSONSTORE_LIST_PAGINATE_BY
 
     def dispatch(self, request, *args, **kwargs):
         if not self.get_object().profile.is_public:
-            if request.user == self.get_object():
+            if request.user.pk == self.get_object().pk:
                 messages.info(
                     request, c.USER_VIEW_DETAIL_PUBLIC_SAME_USER_IS_PRIVATE)
                 return HttpResponseRedirect(
@@ -198,15 +201,38 @@ class UserDetailPublicView(DetailView):
         return super().dispatch(request, *args, **kwargs)
 
     def get_context_data(self, **kwargs):
+        """
+        The jsonstores are paginated by keyset, see stores.pagination. The
+        first page is rendered from the cache when it can be, so the page is
+        only fetched once the template needs it.
+        """
         context = super().get_context_data(**kwargs)
+        cursor = self.request.GET.get('cursor')
+        if cursor is not None:
+            try:
+                pagination.decode_cursor(cursor)
+            except pagination.InvalidCursor:
+                raise Http404("Invalid cursor")
         user_jsonstores = JsonStore.objects.filter(
-            user=self.get_object(),
-            is_public=True).order_by('-updated_at')
-        context.update({'jsonstores': user_jsonstores})
+            user=self.object, is_public=True).defer('data')
+        page = SimpleLazyObject(lambda: pagination.get_page(
+            user_jsonstores, cursor, self.paginate_by))
+        context.update({
+            'jsonstores': page,
+            'page_obj': page,
+            'is_paginated': SimpleLazyObject(
+                lambda: page.has_other_pages()),
+            'is_owner': self.object.pk == self.request.user.pk,
+            'cache_timeout': settings.PUBLIC_PROFILE_CACHE_TIMEOUT})
         return context
 
     def get_object(self):
-        return get_object_or_404(UserModel, username=self.kwargs['username'])
+        # dispatch() and get() both need it, and the profile
+        if not hasattr(self, '_object'):
+            self._object = get_object_or_404(
+                UserModel.objects.select_related('profile'),
+                username=self.kwargs['username'])
+        return self._object
 
 
 class UserUpdateTemplateView(